@@ -0,0 +1,51 @@
+"""Per-process TTL caches for hot, rarely changing reads.
+
+Every worker holds its own copy: an invalidation in one worker does not reach the others,
+so the TTL bounds how stale a value can get there. Cached values are shared between
+requests and must be treated as read-only. Hits/misses and sizes are exported on `/metrics`.
+"""
+
+import time
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from app.core import metrics
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float, maxsize: int = 256):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._hit, self._miss = metrics.cache_counters(name)
+        metrics.cache_entries.set_function(lambda: len(self._data), name)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._miss.inc()
+            return default
+        self._hit.inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]  # oldest insertion
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable = _MISSING) -> None:
+        if key is _MISSING:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await loader()
+            self.set(key, value)
+        return value
@@ -1,9 +1,23 @@
+import asyncio
+from functools import partial
+from typing import Callable
+
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.adapters import db_stats
+from app.core import metrics
 from app.core.config import settings
 
-engine = create_async_engine(str(settings.DATABASE_URL), echo=False, future=True)
+_pool_args = (
+    {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+    if str(settings.DATABASE_URL).startswith("postgres") else {}
+)
+engine = create_async_engine(str(settings.DATABASE_URL), echo=False, future=True, **_pool_args)
+db_stats.install(engine)
+db_stats.add_observer(lambda ms: metrics.db_query_latency.labels().observe(ms / 1000.0))
+metrics.bind_db_pool(engine.pool)
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -11,3 +25,44 @@ async def get_session():
     async with async_session() as session:
         async with session.begin():     # <-- автокоммит на выходе из блока
             yield session
+
+
+# session.info key: callbacks waiting for the current transaction to commit
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(session: AsyncSession, fn: Callable[[], None]) -> None:
+    """Call `fn` once the session's transaction commits, dropped on rollback. For side effects
+    outside the DB (cache invalidation) that must not run before the data is visible."""
+    session.sync_session.info.setdefault(_AFTER_COMMIT, []).append(fn)
+
+
+def commit_hook(session: AsyncSession) -> Callable[[Callable[[], None]], None]:
+    """`after_commit` bound to `session`: the `on_commit` hook handed to use cases."""
+    return partial(after_commit, session)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for fn in session.info.pop(_AFTER_COMMIT, ()):
+        fn()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def warm_pool(size: int | None = None) -> None:
+    """Open `size` pool connections up front so the first requests do not pay for connecting."""
+    size = size or settings.DB_POOL_SIZE
+    conns = await asyncio.gather(*(engine.connect() for _ in range(size)), return_exceptions=True)
+    try:
+        for c in conns:
+            if isinstance(c, BaseException):
+                raise c
+            await c.execute(text("SELECT 1"))
+    finally:
+        for c in conns:
+            if not isinstance(c, BaseException):
+                await c.close()     # back to the pool, stays open
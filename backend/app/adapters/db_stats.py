@@ -0,0 +1,121 @@
+"""Per-request SQL statement accounting.
+
+Engine events time every statement and add it to the `QueryStats` bound to the current
+context (request, test or script). `QueryStatsMiddleware` in `app.presentation.middleware`
+binds one per HTTP request, exposes it via `X-DB-*` headers outside prod and logs it.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+SLOWEST_KEPT = 3
+STATEMENT_PREVIEW = 300
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    # (elapsed_ms, statement) of the slowest statements, slowest first
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    # enclosing tracker (e.g. a test around an in-process request) also sees the statements
+    parent: "QueryStats | None" = None
+
+    def record(self, elapsed_ms: float, statement: str) -> None:
+        if self.parent is not None:
+            self.parent.record(elapsed_ms, statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if len(self.slowest) < SLOWEST_KEPT or elapsed_ms > self.slowest[-1][0]:
+            self.slowest.append((elapsed_ms, statement[:STATEMENT_PREVIEW]))
+            self.slowest.sort(key=lambda x: x[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("db_query_stats", default=None)
+
+# extra per-statement hooks (e.g. metrics), called with elapsed milliseconds
+_observers: list[Callable[[float], None]] = []
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def add_observer(fn: Callable[[float], None]) -> None:
+    _observers.append(fn)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context (and tasks/greenlets spawned from it)."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def install(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_t0", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_t0"].pop()) * 1000.0
+        stats = _current.get()
+        if stats is not None:
+            stats.record(elapsed_ms, statement)
+        for fn in _observers:
+            fn(elapsed_ms)
+        if elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+            logger.warning("slow query", extra={"db_time_ms": round(elapsed_ms, 2), "statement": statement[:STATEMENT_PREVIEW]})
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _failed(ctx):
+        # a failed statement gets no after_cursor_execute; drop its start time so the
+        # connection does not carry it back to the pool
+        started = ctx.connection.info.get("query_t0") if ctx.connection is not None else None
+        if started:
+            started.pop()
+
+
+
+async def assert_query_count_flat(
+    call: Callable[[int], Awaitable[object]],
+    page_sizes: Iterable[int] = (1, 5, 20),
+    *,
+    slack: int = 0,
+) -> list[int]:
+    """Fail when the number of statements grows with the page size (an N+1 pattern).
+
+    `call(limit)` must perform the request/use case with the given page size against a
+    dataset that holds at least max(page_sizes) items. Usable directly from pytest::
+
+        counts = await assert_query_count_flat(lambda n: client.get("/content/posts", params={"limit": n}))
+    """
+    page_sizes = list(page_sizes)
+    counts: list[int] = []
+    for size in page_sizes:
+        with track_queries() as stats:
+            await call(size)
+        counts.append(stats.count)
+    if max(counts) - min(counts) > slack:
+        sizes = ", ".join(f"{s}->{c}" for s, c in zip(page_sizes, counts))
+        raise AssertionError(f"query count grows with page size ({sizes})")
+    return counts
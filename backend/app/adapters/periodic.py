@@ -0,0 +1,46 @@
+"""Periodic background jobs inside a worker process.
+
+Each worker runs its own copy, so jobs must be safe to run concurrently (idempotent,
+small batches). Started on app startup, cancelled on shutdown.
+"""
+
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable
+
+logger = logging.getLogger("app.periodic")
+
+
+class PeriodicTask:
+    def __init__(self, name: str, interval: float, fn: Callable[[], Awaitable[object]], jitter: float = 0.1):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.jitter = jitter
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=f"periodic:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            # jitter spreads workers started together over the interval
+            await asyncio.sleep(self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+            try:
+                await self.fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("periodic task %s failed", self.name)
@@ -0,0 +1,199 @@
+"""Live update fan-out for the SSE streams (app/presentation/api/stream_endpoints.py).
+
+Repositories call `publish` while they write; nothing goes out unless the transaction commits.
+On PostgreSQL the event is a `pg_notify` in that transaction: the server delivers it at commit
+to every worker's LISTEN connection (this one included) and each worker hands it to its own
+subscribers, so a client sees writes made through any worker. On other backends (SQLite, one
+process) events wait on the session and are delivered locally after commit.
+
+Events are hints ("a post appeared in community X"), not a replicated log: there is no replay,
+a client that reconnects refetches what it shows. Each subscriber has a bounded queue; one that
+falls SSE_QUEUE_SIZE events behind is dropped with an `overflow` event instead of buffering
+without limit.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.pubsub")
+
+PG_CHANNEL = "wc_live"
+_PENDING = "live_events"
+
+
+@dataclass(frozen=True)
+class LiveEvent:
+    type: str
+    channels: tuple[str, ...]
+    data: dict
+
+    def dumps(self) -> str:
+        return json.dumps({"type": self.type, "channels": self.channels, "data": self.data}, separators=(",", ":"), default=str)
+
+    @classmethod
+    def loads(cls, payload: str) -> "LiveEvent":
+        d = json.loads(payload)
+        return cls(d["type"], tuple(d["channels"]), d["data"])
+
+
+# queued for a subscriber that fell behind or when the broker stops; ends the stream
+OVERFLOW = LiveEvent("overflow", (), {})
+CLOSED = LiveEvent("closed", (), {})
+
+
+class Subscription:
+    def __init__(self, broker: "Broker", channels: Iterable[str], maxsize: int):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.queue: asyncio.Queue[LiveEvent] = asyncio.Queue(maxsize + 1)     # +1: room for the final event
+        self.maxsize = maxsize
+        self.done = False
+
+    def offer(self, ev: LiveEvent) -> None:
+        if self.done:
+            return
+        if ev is CLOSED or self.queue.qsize() >= self.maxsize:
+            # the slow client gets one last event and resyncs on reconnect
+            self.done = True
+            if ev is not CLOSED:
+                ev = OVERFLOW
+                metrics.live_dropped.inc()
+            self.broker.unsubscribe(self)
+        self.queue.put_nowait(ev)
+
+    async def get(self, timeout: float) -> LiveEvent | None:
+        """Next event, or None when nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.done = True
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    def __init__(self):
+        self._subs: dict[str, set[Subscription]] = defaultdict(set)
+        self._all: set[Subscription] = set()
+        self._listener: asyncio.Task | None = None
+        metrics.live_streams.set_function(lambda: len(self._all))
+
+    @property
+    def connections(self) -> int:
+        return len(self._all)
+
+    def subscribe(self, channels: Iterable[str], maxsize: int | None = None) -> Subscription:
+        sub = Subscription(self, channels, settings.SSE_QUEUE_SIZE if maxsize is None else maxsize)
+        self._all.add(sub)
+        for ch in sub.channels:
+            self._subs[ch].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._all.discard(sub)
+        for ch in sub.channels:
+            subs = self._subs.get(ch)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[ch]
+
+    def dispatch(self, ev: LiveEvent) -> None:
+        # a subscriber on several of the event's channels gets it once
+        targets = set()
+        for ch in ev.channels:
+            targets.update(self._subs.get(ch, ()))
+        for sub in targets:
+            sub.offer(ev)
+
+    def start(self, engine: AsyncEngine) -> None:
+        if engine.dialect.name.startswith("postgres") and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(engine), name="pubsub:listen")
+
+    async def stop(self) -> None:
+        """End the streams still open and stop listening. uvicorn only gets here after its graceful
+        timeout, which open streams always use up: clients reconnect to another worker."""
+        for sub in list(self._all):
+            sub.offer(CLOSED)
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        """Hold one pool connection LISTENing on PG_CHANNEL; reconnect when it drops."""
+        def on_notify(_conn, _pid, _channel, payload: str) -> None:
+            try:
+                self.dispatch(LiveEvent.loads(payload))
+            except Exception:
+                logger.exception("pubsub: bad payload %r", payload[:200])
+
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    await raw.add_listener(PG_CHANNEL, on_notify)
+                    try:
+                        while not raw.is_closed():
+                            await asyncio.sleep(5)
+                    finally:
+                        if not raw.is_closed():
+                            await raw.remove_listener(PG_CHANNEL, on_notify)
+                logger.warning("pubsub: LISTEN connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("pubsub: LISTEN failed, retrying")
+            # events committed while disconnected are lost: clients resync on their next reconnect
+            await asyncio.sleep(1)
+
+
+broker = Broker()
+
+
+async def publish(session: AsyncSession, channels: Iterable[str], type: str, data: dict) -> None:
+    """Send `type`/`data` to the subscribers of `channels` once the session's transaction commits."""
+    ev = LiveEvent(type, tuple(channels), data)
+    if session.bind.dialect.name.startswith("postgres"):
+        # NOTIFY is transactional: delivered at commit, dropped on rollback (payload limit 8000 bytes)
+        await session.execute(select(func.pg_notify(PG_CHANNEL, ev.dumps())))
+    else:
+        session.sync_session.info.setdefault(_PENDING, []).append(ev)
+
+
+async def publish_many(session: AsyncSession, events: Iterable[tuple[Iterable[str], str, dict]]) -> None:
+    """`publish` for a batch of (channels, type, data): one statement however many events."""
+    evs = [LiveEvent(type, tuple(channels), data) for channels, type, data in events]
+    if not evs:
+        return
+    if session.bind.dialect.name.startswith("postgres"):
+        await session.execute(
+            text("SELECT pg_notify(:ch, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+            {"ch": PG_CHANNEL, "payloads": [ev.dumps() for ev in evs]},
+        )
+    else:
+        session.sync_session.info.setdefault(_PENDING, []).extend(evs)
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver(session: Session) -> None:
+    for ev in session.info.pop(_PENDING, ()):
+        broker.dispatch(ev)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
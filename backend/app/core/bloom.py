@@ -0,0 +1,31 @@
+"""Fixed-size Bloom filter for set membership over millions of string keys.
+
+`key in f` is never False for an added key; it is True for a key never added with
+probability about `error_rate` (at `capacity` keys). Memory is ~1.2 bytes per key at 1%.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # double hashing (Kirsch-Mitzenmacher): k positions from one 128-bit digest
+        d = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
@@ -8,8 +8,112 @@ class Settings(BaseSettings):
     JWT_ALG: str = os.getenv("JWT_ALG", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
     OTP_TTL_SECONDS: int = int(os.getenv("OTP_TTL_SECONDS", "300"))
+    # OTP sliding-window limits per phone and per client IP for /auth/otp/* and /auth/company/otp/*
+    # (0 disables a limit); expired/consumed codes are purged every OTP_PURGE_INTERVAL_SECONDS (0 = never)
+    OTP_RATE_WINDOW_SECONDS: int = int(os.getenv("OTP_RATE_WINDOW_SECONDS", "600"))
+    OTP_REQUEST_PER_PHONE: int = int(os.getenv("OTP_REQUEST_PER_PHONE", "5"))
+    OTP_REQUEST_PER_IP: int = int(os.getenv("OTP_REQUEST_PER_IP", "20"))
+    OTP_VERIFY_PER_PHONE: int = int(os.getenv("OTP_VERIFY_PER_PHONE", "10"))
+    OTP_VERIFY_PER_IP: int = int(os.getenv("OTP_VERIFY_PER_IP", "50"))
+    OTP_PURGE_INTERVAL_SECONDS: int = int(os.getenv("OTP_PURGE_INTERVAL_SECONDS", "600"))
+    OTP_PURGE_BATCH_SIZE: int = int(os.getenv("OTP_PURGE_BATCH_SIZE", "1000"))
+    # bcrypt cost (2^rounds) and the dedicated thread pool running it: threads, max calls waiting
+    # for a thread before admin signup/login answer 503
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+    # stories disappear STORY_TTL_HOURS after publishing; expired stories and stale seen markers
+    # are deleted every STORY_PURGE_INTERVAL_SECONDS (0 = never)
+    STORY_TTL_HOURS: int = int(os.getenv("STORY_TTL_HOURS", "24"))
+    STORY_PURGE_INTERVAL_SECONDS: int = int(os.getenv("STORY_PURGE_INTERVAL_SECONDS", "900"))
+    # seen-state tracking: max content ids per POST /content/me/seen, bitmap bits kept per user and
+    # community above the watermark (older out-of-order gaps beyond it count as seen)
+    FEED_SEEN_BATCH_MAX: int = int(os.getenv("FEED_SEEN_BATCH_MAX", "500"))
+    FEED_SEEN_MAX_BITS: int = int(os.getenv("FEED_SEEN_MAX_BITS", "4096"))
+    # offline recommender (app.scripts.build_recommendations): stored recommendations per user; users
+    # are scored in blocks of at most RECOMMENDATIONS_BLOCK_CELLS dense (user, community) scores
+    RECOMMENDATIONS_TOP_K: int = int(os.getenv("RECOMMENDATIONS_TOP_K", "50"))
+    RECOMMENDATIONS_BLOCK_CELLS: int = int(os.getenv("RECOMMENDATIONS_BLOCK_CELLS", "8000000"))
+    # event reminders (app/usecases/reminders.py): minutes before a joined event, delivery check interval and
+    # batch size; NOTIFIER is the delivery backend (app/infrastructure/services/notifier.py)
+    EVENT_REMINDER_OFFSETS_MINUTES: str = os.getenv("EVENT_REMINDER_OFFSETS_MINUTES", "1440,60")
+    EVENT_REMINDER_POLL_SECONDS: float = float(os.getenv("EVENT_REMINDER_POLL_SECONDS", "60"))
+    EVENT_REMINDER_BATCH_SIZE: int = int(os.getenv("EVENT_REMINDER_BATCH_SIZE", "500"))
+    NOTIFIER: str = os.getenv("NOTIFIER", "log")
+    # uploaded files (LocalFileStorage); app.scripts.media_gc cleans up what nothing references
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "/data/media")
+    # job queue (app/usecases/jobs.py): jobs run at once per process, idle poll interval, lease renewed
+    # while a job runs, retries with exponential backoff (base..max seconds), finished jobs kept for
+    # JOB_RETENTION_HOURS (failed ones until retried or cancelled), purged every JOB_PURGE_INTERVAL_SECONDS
+    JOB_RUNNER_ENABLED: bool = os.getenv("JOB_RUNNER_ENABLED", "1").lower() in ("1", "true", "yes")
+    JOB_CONCURRENCY: int = int(os.getenv("JOB_CONCURRENCY", "4"))
+    JOB_POLL_SECONDS: float = float(os.getenv("JOB_POLL_SECONDS", "1"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE_SECONDS: float = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+    JOB_RETRY_MAX_SECONDS: float = float(os.getenv("JOB_RETRY_MAX_SECONDS", "3600"))
+    JOB_RETENTION_HOURS: float = float(os.getenv("JOB_RETENTION_HOURS", "72"))
+    JOB_PURGE_INTERVAL_SECONDS: float = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "3600"))
+    # video pipeline (app/usecases/video.py): uploaded videos get a poster, duration and HLS renditions
+    # ("height:video kbps" list) from ffmpeg; workers without ffmpeg/ffprobe skip it. VIDEO_WORKERS
+    # transcodes run at once per API worker
+    VIDEO_PIPELINE_ENABLED: bool = os.getenv("VIDEO_PIPELINE_ENABLED", "1").lower() in ("1", "true", "yes")
+    FFMPEG_BIN: str = os.getenv("FFMPEG_BIN", "ffmpeg")
+    FFPROBE_BIN: str = os.getenv("FFPROBE_BIN", "ffprobe")
+    VIDEO_WORKERS: int = int(os.getenv("VIDEO_WORKERS", "1"))
+    VIDEO_RENDITIONS: str = os.getenv("VIDEO_RENDITIONS", "360:800,720:2500,1080:5000")
+    VIDEO_SEGMENT_SECONDS: int = int(os.getenv("VIDEO_SEGMENT_SECONDS", "4"))
+    VIDEO_JOB_MAX_ATTEMPTS: int = int(os.getenv("VIDEO_JOB_MAX_ATTEMPTS", "3"))
+    VIDEO_JOB_TIMEOUT_SECONDS: float = float(os.getenv("VIDEO_JOB_TIMEOUT_SECONDS", "1800"))
     ENV: str = os.getenv("ENV", "dev")
     ADMIN_SIGNUP_TOKEN: str | None = os.getenv("ADMIN_SIGNUP_TOKEN", "admin-secret")
+    # max items accepted by bulk create endpoints (/content/posts/bulk, /events/bulk)
+    BULK_CREATE_MAX_ITEMS: int = int(os.getenv("BULK_CREATE_MAX_ITEMS", "100"))
+    # per-request SQL stats (app/adapters/db_stats.py): slow statement threshold, "heavy request" statement count,
+    # X-DB-Queries/X-DB-Time-Ms response headers (off in prod by default)
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+    DB_QUERY_WARN_COUNT: int = int(os.getenv("DB_QUERY_WARN_COUNT", "30"))
+    DB_STATS_HEADERS: bool = os.getenv("DB_STATS_HEADERS", "0" if os.getenv("ENV", "dev") == "prod" else "1").lower() in ("1", "true", "yes")
+    # Prometheus-style GET /metrics and per-route request metrics (app/core/metrics.py)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+    # DB pool per worker process (Postgres); warmed up on startup
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # production launcher (app/serve.py): workers (0 = one per available CPU), bind address,
+    # seconds to drain in-flight requests on SIGTERM; workers skip migrations the launcher already ran
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    GRACEFUL_TIMEOUT: int = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+    # comma-separated proxy addresses whose X-Forwarded-For/-Proto are trusted (the client IP feeds the
+    # OTP per-IP limits); "*" only when nothing but the proxy can reach the port
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    MIGRATE_ON_STARTUP: bool = os.getenv("MIGRATE_ON_STARTUP", "1").lower() in ("1", "true", "yes")
+    # startup warm-up before /ready reports ready (app/presentation/warmup.py);
+    # per-process cache TTLs (seconds) for reference data and the public upcoming events list
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "1").lower() in ("1", "true", "yes")
+    REFERENCE_CACHE_TTL: float = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+    UPCOMING_EVENTS_CACHE_TTL: float = float(os.getenv("UPCOMING_EVENTS_CACHE_TTL", "30"))
+    # company pages (GET /companies/{id}, /companies/me): dropped on company, company media and
+    # community changes; member counts can lag by up to the TTL
+    COMPANY_DETAIL_CACHE_TTL: float = float(os.getenv("COMPANY_DETAIL_CACHE_TTL", "60"))
+    # live updates over SSE (/stream/..., app/adapters/pubsub.py): heartbeat comment interval,
+    # open streams per worker (beyond: 503), events buffered per slow client before it is dropped,
+    # reconnect delay suggested to browsers
+    SSE_HEARTBEAT_SECONDS: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    SSE_MAX_CONNECTIONS: int = int(os.getenv("SSE_MAX_CONNECTIONS", "1000"))
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    SSE_RETRY_MS: int = int(os.getenv("SSE_RETRY_MS", "3000"))
+    # POST /batch: sub-requests per batch (beyond: 413), run at once (each holds a DB connection),
+    # seconds one may take before it is answered with 504
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "4"))
+    BATCH_TIMEOUT_SECONDS: float = float(os.getenv("BATCH_TIMEOUT_SECONDS", "10"))
+    # delta sync (GET /sync, app/usecases/sync.py): max changes per response; how long deletes are
+    # remembered (clients offline for longer get a full resync) and how often expired ones are purged
+    SYNC_PAGE_SIZE: int = int(os.getenv("SYNC_PAGE_SIZE", "1000"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: float = float(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+    SYNC_PURGE_INTERVAL_SECONDS: float = float(os.getenv("SYNC_PURGE_INTERVAL_SECONDS", "3600"))
 
     # опционально: автоматически подхватывать .env, игнорить лишние ключи
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
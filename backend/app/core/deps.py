@@ -1,5 +1,5 @@
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.adapters.db import get_session
@@ -9,13 +9,20 @@ from app.infrastructure.repos.company_repo import CompanyRepo
 
 bearer = HTTPBearer(auto_error=False)
 
+# scope key: (token, user) resolved once by POST /batch for all of its sub-requests
+BATCH_PRINCIPAL = "wc.batch_principal"
+
 
 async def get_current_user(
         creds: HTTPAuthorizationCredentials | None = Depends(bearer),
         session=Depends(get_session),
+        request: Request = None,
 ):
     if not creds:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    shared = request.scope.get(BATCH_PRINCIPAL) if request is not None else None
+    if shared is not None and shared[0] == creds.credentials:
+        return shared[1]
     try:
         payload = jwt.decode(creds.credentials, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
         uid: str = payload.get("sub")
@@ -30,6 +37,17 @@ async def get_current_user(
     return user
 
 
+async def get_optional_user(
+        creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+        session=Depends(get_session),
+        request: Request = None,
+):
+    """The authenticated user, or None for anonymous requests (a bad token is still a 401)."""
+    if not creds:
+        return None
+    return await get_current_user(creds, session, request)
+
+
 def role_required(*roles: str):
     async def _checker(user=Depends(get_current_user)):
         if user.role not in roles:
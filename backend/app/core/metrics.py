@@ -0,0 +1,233 @@
+"""In-process metrics with Prometheus text exposition.
+
+Kept deliberately small: counters, gauges and histograms with labels. Children are
+pre-bound per label set (`metric.labels(...)` is cached), so the hot path is a dict lookup
+plus integer/float increments. Updates come from the event loop thread, so no locks are
+taken; a racing increment from a worker thread may at worst be lost, never corrupt state.
+"""
+
+import bisect
+import math
+from typing import Callable, Iterable, Sequence
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.doc}\n# TYPE {self.name} {self.kind}\n"
+        return head + "".join(line + "\n" for line in self._samples())
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for values, child in self._children.items():
+            yield f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_value(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, doc, labelnames)
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def _new_child(self):
+        return _Value()
+
+    def set_function(self, fn: Callable[[], float], *values: str) -> None:
+        """Read the value lazily at scrape time (pool sizes, queue lengths)."""
+        self._functions[values] = fn
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self):
+        for values, child in self._children.items():
+            yield f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_value(child.value)}"
+        for values, fn in self._functions.items():
+            try:
+                v = float(fn())
+            except Exception:
+                continue
+            yield f"{self.name}{_fmt_labels(self.labelnames, values)} {_fmt_value(v)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        for values, child in self._children.items():
+            acc = 0
+            for bound, n in zip(self.bounds + (math.inf,), child.counts):
+                acc += n
+                le = f'le="{_fmt_value(bound)}"'
+                yield f"{self.name}_bucket{_fmt_labels(self.labelnames, values, le)} {acc}"
+            yield f"{self.name}_sum{_fmt_labels(self.labelnames, values)} {_fmt_value(child.sum)}"
+            yield f"{self.name}_count{_fmt_labels(self.labelnames, values)} {acc}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            return self._metrics[metric.name]
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, doc, labelnames))
+
+    def gauge(self, name: str, doc: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, doc, labelnames))
+
+    def histogram(self, name: str, doc: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, doc, labelnames, buckets))
+
+    def render(self) -> str:
+        return "".join(m.render() for m in self._metrics.values())
+
+
+registry = Registry()
+
+# --- HTTP ---
+http_requests = registry.counter("http_requests_total", "HTTP requests by route, method and status", ("method", "route", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+http_db_time = registry.histogram(
+    "http_request_db_seconds", "DB time spent per HTTP request", ("method", "route"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+http_db_queries = registry.histogram(
+    "http_request_db_queries", "SQL statements per HTTP request", ("method", "route"),
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+
+# --- DB ---
+db_query_latency = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+db_pool = registry.gauge("db_pool_connections", "DB pool connections by state", ("state",))
+
+# --- caches ---
+cache_requests = registry.counter("cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+cache_entries = registry.gauge("cache_entries", "Entries held by each cache", ("cache",))
+
+# --- password hashing (app/core/security.py) ---
+password_hash_latency = registry.histogram(
+    "password_hash_duration_seconds", "bcrypt time per call, excluding queueing", ("op",),
+    buckets=(0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+password_hash_queue = registry.gauge("password_hash_queue_length", "Password hashing calls waiting for a worker thread")
+
+# --- live updates (app/adapters/pubsub.py) ---
+live_streams = registry.gauge("live_streams", "Open server-sent event streams in this worker")
+live_dropped = registry.counter("live_streams_dropped_total", "Streams closed because the client fell behind")
+
+
+def cache_counters(cache: str):
+    """Pre-bound (hit, miss) counters for a named cache."""
+    return cache_requests.labels(cache, "hit"), cache_requests.labels(cache, "miss")
+
+
+def bind_db_pool(pool) -> None:
+    """Expose pool state gauges; sampled at scrape time, nothing on the hot path."""
+    for state, attr in (("size", "size"), ("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow")):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            db_pool.set_function(fn, state)
@@ -0,0 +1,69 @@
+"""In-memory sliding-window rate limiting.
+
+Exact sliding log per key (at most `limit` timestamps are kept per key). State lives in
+the worker process, so with N workers a client can get up to N x limit through in the
+worst case; put a shared limiter in front (gateway) if that matters.
+"""
+
+import time
+from collections import deque
+
+
+class SlidingWindowLimiter:
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000):
+        self.limit = limit
+        self.window = window_seconds
+        self.max_keys = max_keys
+        self._hits: dict[str, deque[float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    def retry_after(self, key: str, now: float | None = None) -> float:
+        """Seconds until `key` may hit again; 0 when allowed now. Does not record a hit."""
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        hits = self._hits.get(key)
+        if not hits:
+            return 0.0
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if len(hits) < self.limit:
+            return 0.0
+        return hits[0] + self.window - now
+
+    def add(self, key: str, now: float | None = None) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic() if now is None else now
+        hits = self._hits.get(key)
+        if hits is None:
+            if len(self._hits) >= self.max_keys:
+                self._sweep(now)
+            hits = self._hits[key] = deque(maxlen=self.limit)
+        hits.append(now)
+
+    def _sweep(self, now: float) -> None:
+        stale = [k for k, h in self._hits.items() if not h or h[-1] <= now - self.window]
+        for k in stale:
+            del self._hits[k]
+        if len(self._hits) >= self.max_keys:
+            # still full of active keys: drop the oldest ones rather than grow without bound
+            for k in list(self._hits)[: len(self._hits) // 10 or 1]:
+                del self._hits[k]
+
+
+def check_and_add(*pairs: tuple[SlidingWindowLimiter, str]) -> float:
+    """Check all (limiter, key) pairs; record a hit in each only if every one allows it.
+
+    Returns 0 when allowed, otherwise the longest retry-after in seconds.
+    """
+    now = time.monotonic()
+    wait = max((lim.retry_after(key, now) for lim, key in pairs), default=0.0)
+    if wait > 0:
+        return wait
+    for lim, key in pairs:
+        lim.add(key, now)
+    return 0.0
@@ -1,12 +1,28 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import jwt
 from passlib.context import CryptContext
 
+from app.core import metrics
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# hashes with fewer/more rounds still verify; admin_login re-hashes them to the configured cost
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is CPU-bound for ~100-300 ms per call and releases the GIL: run it on a few dedicated
+# threads so the event loop keeps serving other requests; the thread count caps CPU spent on it
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+_hash_pending = 0
+_hash_seconds = {op: metrics.password_hash_latency.labels(op) for op in ("hash", "verify")}
+metrics.password_hash_queue.set_function(lambda: max(0, _hash_pending - settings.PASSWORD_HASH_WORKERS))
+
+
+class PasswordHasherBusy(Exception):
+    """More password hashing work queued than PASSWORD_HASH_MAX_QUEUE; shed load instead of waiting."""
 
 
 class TokenType:
@@ -29,3 +45,38 @@ def verify_password(plain: str, hashed: str) -> bool:
 
 def hash_password(plain: str) -> str:
     return pwd_context.hash(plain)
+
+
+def _timed(fn: Callable, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _release_hasher() -> None:
+    global _hash_pending
+    _hash_pending -= 1
+
+
+async def _run_hasher(op: str, fn: Callable, *args):
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise PasswordHasherBusy()
+    loop = asyncio.get_running_loop()
+    future = _hash_executor.submit(_timed, fn, *args)
+    _hash_pending += 1
+    # released when the hash is done, not when the caller stops waiting: a cancelled request
+    # leaves its hash running on the thread (a hash that has not started yet is dropped)
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(_release_hasher))
+    result, elapsed = await asyncio.wrap_future(future)
+    _hash_seconds[op].observe(elapsed)
+    return result
+
+
+async def hash_password_async(plain: str) -> str:
+    return await _run_hasher("hash", pwd_context.hash, plain)
+
+
+async def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+    """(valid, new_hash): new_hash is set when the stored hash uses other rounds than BCRYPT_ROUNDS."""
+    return await _run_hasher("verify", pwd_context.verify_and_update, plain, hashed)
@@ -0,0 +1,59 @@
+"""Compact set of seen sequence numbers: a high-water mark plus a bitmap above it.
+
+Every seq <= `watermark` is seen; bit i of `bits` means seq `watermark + 1 + i` is seen.
+Feeds are read roughly in order, so the watermark absorbs most of the set and the bitmap
+only holds the few items seen out of order. Stored as (integer, little-endian bytes).
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class SeenSet:
+    watermark: int = 0
+    bits: int = 0
+
+    @classmethod
+    def decode(cls, watermark: int | None, bitmap: bytes | None) -> "SeenSet":
+        return cls(watermark or 0, int.from_bytes(bitmap, "little") if bitmap else 0)
+
+    def encode(self) -> bytes:
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    def __contains__(self, seq: int) -> bool:
+        if seq <= self.watermark:
+            return True
+        return bool(self.bits >> (seq - self.watermark - 1) & 1)
+
+    def __len__(self) -> int:
+        """Seen items above the watermark."""
+        return self.bits.bit_count()
+
+    def add(self, seq: int) -> None:
+        if seq > self.watermark:
+            self.bits |= 1 << (seq - self.watermark - 1)
+
+    def advance(self, watermark: int) -> None:
+        """Move the watermark up to `watermark`, marking everything below it seen."""
+        if watermark > self.watermark:
+            self.bits >>= watermark - self.watermark
+            self.watermark = watermark
+
+    def compact(self, max_bits: int) -> None:
+        """Absorb the contiguous seen run above the watermark; cap the bitmap at `max_bits`.
+
+        When capped, the oldest unseen items fall below the watermark and count as seen.
+        """
+        run = (~self.bits & (self.bits + 1)).bit_length() - 1  # trailing one bits
+        if run > 0:
+            self.advance(self.watermark + run)
+        if self.bits.bit_length() > max_bits:
+            self.advance(self.watermark + self.bits.bit_length() - max_bits)
+            self.compact(max_bits)
+
+    def first_unseen_above(self, seqs) -> int | None:
+        """First seq of ascending `seqs` not in the set."""
+        for seq in seqs:
+            if seq not in self:
+                return seq
+        return None
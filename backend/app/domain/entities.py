@@ -112,6 +112,22 @@ class Story:
     title: str
     media_url: str
     created_at: datetime
+    media_id: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+
+@dataclass
+class StoryRing:
+    """Live stories of one followed company, as shown in the stories bar."""
+    company_id: str
+    company_name: str
+    company_logo_media_id: Optional[str]
+    latest_at: datetime
+    story_count: int
+    unseen_count: int
+    # stories with created_at <= seen_until were viewed by the user
+    seen_until: Optional[datetime] = None
+    stories: list[Story] = field(default_factory=list)
 
 
 @dataclass
@@ -133,6 +149,16 @@ class Event:
     participant_payout: Optional[int] = None
 
 
+@dataclass
+class EventReminder:
+    user_id: str
+    event_id: str
+    offset_minutes: int  # before the event
+    fire_at: datetime
+    event_title: Optional[str] = None
+    event_date: Optional[datetime] = None
+
+
 @dataclass
 class EventParticipant:
     id: str
@@ -164,6 +190,10 @@ class Media:
     size: int
     url: str  # публичная ссылка /media/{id}
     created_at: datetime
+    # videos after processing: poster frame, HLS master playlist, seconds
+    poster_url: Optional[str] = None
+    stream_url: Optional[str] = None
+    duration: Optional[float] = None
 
 
 @dataclass
@@ -174,3 +204,37 @@ class Case:
     description: Optional[str]
     date: datetime
     solutions_count: int
+
+
+@dataclass
+class CompanyDetail:
+    """Read model of a company page: the company with everything `GET /companies/{id}` shows."""
+    company: Company
+    skills: list[Skill] = field(default_factory=list)
+    media: list[Media] = field(default_factory=list)
+    # non-archived communities with their member counts
+    communities: list[tuple[Community, int]] = field(default_factory=list)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: dict
+    status: str  # pending | running | done | failed | cancelled
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    key: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+@dataclass
+class SyncTombstone:
+    version: int
+    entity: str      # community, company, sphere, skill, status, follow, company_follow
+    entity_id: str
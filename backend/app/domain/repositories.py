@@ -1,4 +1,5 @@
-from typing import Protocol, Sequence, Optional
+from datetime import datetime
+from typing import Callable, Protocol, Sequence, Optional
 
 from app.domain.entities import (
     User,
@@ -8,14 +9,21 @@ from app.domain.entities import (
     Membership,
     Post,
     Story,
+    StoryRing,
     Event,
     Follow,
     CompanyFollow,
     OTP,
     Media,
     EventParticipant,
+    EventReminder,
+    Job,
+    SyncTombstone,
 )
 
+# registers a callback to run once the caller's transaction commits (dropped on rollback)
+OnCommit = Callable[[Callable[[], None]], None]
+
 
 class IUserRepo(Protocol):
     async def get_by_id(self, user_id: str) -> Optional[User]: ...
@@ -32,6 +40,8 @@ class IUserRepo(Protocol):
 
     async def create_admin(self, email: str, password_hash: str) -> User: ...
 
+    async def set_password_hash(self, user_id: str, password_hash: str) -> None: ...
+
     async def list_all(self) -> Sequence[User]: ...
 
 
@@ -40,6 +50,8 @@ class IOTPRepo(Protocol):
 
     async def verify(self, phone: str, code: str) -> bool: ...
 
+    async def purge(self, expired_before: datetime, batch_size: int = 1000) -> int: ...
+
 
 class IProfileRepo(Protocol):
     async def create(self, user_id: str, **data) -> Profile: ...
@@ -66,6 +78,8 @@ class ICommunityRepo(Protocol):
 
     async def list_for_company(self, company_id: str) -> Sequence[Community]: ...
 
+    async def list_for_company_with_counts(self, company_id: str) -> Sequence[tuple[Community, int]]: ...
+
     async def list_all(self) -> Sequence[Community]: ...
 
     async def list_joinable(self, user_id: str, *, offset: int = 0, limit: int = 20) -> Sequence[Community]: ...
@@ -73,6 +87,14 @@ class ICommunityRepo(Protocol):
     async def list_by_ids(self, ids: Sequence[str]) -> Sequence[Community]: ...
 
 
+class IRecommendationRepo(Protocol):
+    async def replace_for_users(self, user_ids: Sequence[str], rows: list[dict]) -> None: ...
+
+    async def delete_computed_before(self, ts: datetime) -> int: ...
+
+    async def replace_popularity(self, rows: list[dict]) -> None: ...
+
+
 class IMembershipRepo(Protocol):
     async def join(self, user_id: str, community_id: str) -> Membership: ...
 
@@ -99,7 +121,7 @@ class IPostRepo(Protocol):
     async def list_featured_for_user(self, user_id: str, limit: int = 20) -> Sequence[Post]: ...
     async def list_latest_for_user(self, user_id: str, limit: int = 20) -> Sequence[Post]: ...
     async def search(self, query: str, limit: int = 20) -> Sequence[Post]: ...
-    async def list_for_followed_communities(self, user_id: str, limit: int = 20) -> Sequence[Post]: ...
+    async def list_for_followed_communities(self, user_id: str, limit: int = 20, unseen_only: bool = False) -> Sequence[Post]: ...
     async def list_for_communities(self, community_ids: Sequence[str], limit: int = 20) -> Sequence[Post]: ...
     async def list_for_community(self, community_id: str, *, offset: int = 0, limit: int = 20) -> Sequence[Post]: ...
 
@@ -109,8 +131,20 @@ class IStoryRepo(Protocol):
     async def list(self, limit: int = 20) -> Sequence[Story]: ...
     async def get(self, story_id: str) -> Optional[Story]: ...
     async def list_for_companies(self, company_ids: Sequence[str], limit: int = 20) -> Sequence[Story]: ...
+    async def list_for_follower(self, user_id: str, limit: int = 20) -> Sequence[Story]: ...
+    async def list_rings(self, user_id: str, limit: int = 20, per_ring: int = 20) -> Sequence[StoryRing]: ...
+    async def mark_seen(self, user_id: str, story_id: str) -> bool: ...
+    async def purge_expired(self, expired_before: datetime, batch_size: int = 1000) -> int: ...
+    async def purge_seen(self, seen_before: datetime, batch_size: int = 1000) -> int: ...
+
+class ISeenRepo(Protocol):
+    async def record(self, user_id: str, content_ids: Sequence[str], max_bits: int) -> int: ...
+    async def mark_all_read(self, user_id: str, community_id: str) -> bool: ...
+    async def unread_counts(self, user_id: str) -> list[tuple[str, int]]: ...
 
 class IEventRepo(Protocol):
+    async def get(self, event_id: str) -> Optional[Event]: ...
+    async def update(self, event_id: str, **data) -> Optional[Event]: ...
     async def list_for_user(self, user_id: str, limit: int = 20) -> Sequence[Event]: ...
     async def list_joined_for_user(self, user_id: str, limit: int = 20) -> Sequence[Event]: ...
     async def list_all_upcoming(self, limit: int = 20) -> Sequence[Event]: ...
@@ -135,6 +169,18 @@ class IEventRepo(Protocol):
     ) -> Event: ...
 
 
+class IReminderRepo(Protocol):
+    async def schedule_for_user(self, user_id: str, event_id: str, times: Sequence[tuple[int, datetime]]) -> None: ...
+
+    async def cancel_for_user(self, user_id: str, event_id: str) -> None: ...
+
+    async def reschedule_event(self, event_id: str, times: Sequence[tuple[int, datetime]]) -> int: ...
+
+    async def due(self, now: datetime, limit: int) -> list[EventReminder]: ...
+
+    async def delete(self, reminders: Sequence[EventReminder]) -> None: ...
+
+
 class ICompanyRepo(Protocol):
     async def get(self, company_id: str) -> Optional[Company]: ...
 
@@ -165,6 +211,60 @@ class IMediaRepo(Protocol):
 
     async def replace_for_company(self, company_id: str, media_ids: list[str]) -> None: ...
 
+    async def set_video_assets(self, media_id: str, *, poster_url: str | None, stream_url: str | None,
+                               duration: float | None) -> None: ...
+
+    # Garbage collection
+    async def count(self) -> int: ...
+
+    async def list_ids_after(self, after: str, limit: int) -> list[tuple[str, datetime]]: ...
+
+    async def referenced_between(self, lo: str, hi: str) -> set[str]: ...
+
+    async def existing(self, ids: Sequence[str]) -> set[str]: ...
+
+    async def delete_unreferenced(self, ids: Sequence[str]) -> list[tuple[str, str | None]]: ...
+
+
+class IVideoJobRepo(Protocol):
+    async def enqueue(self, media_id: str) -> None: ...
+
+    async def start(self, media_id: str) -> None: ...
+
+    async def complete(self, media_id: str) -> None: ...
+
+    async def fail(self, media_id: str, error: str, *, retry: bool) -> None: ...
+
+    async def enqueue_unprocessed(self) -> list[str]: ...
+
+
+class IJobRepo(Protocol):
+    async def enqueue(self, kind: str, payload: dict, *, priority: int = 0, run_at: datetime | None = None,
+                      key: str | None = None, max_attempts: int | None = None) -> str | None: ...
+
+    async def claim(self, kinds: Sequence[str], limit: int, lease_until: datetime) -> list[Job]: ...
+
+    async def extend(self, job_ids: Sequence[str], lease_until: datetime) -> None: ...
+
+    async def complete(self, job_id: str) -> None: ...
+
+    async def fail(self, job_id: str, error: str, *, retry_at: datetime | None) -> None: ...
+
+    async def release(self, job_id: str) -> None: ...
+
+    async def get(self, job_id: str) -> Optional[Job]: ...
+
+    async def list_recent(self, *, status: str | None = None, kind: str | None = None, offset: int = 0,
+                          limit: int = 50) -> list[Job]: ...
+
+    async def counts(self) -> dict[str, int]: ...
+
+    async def retry(self, job_id: str) -> bool: ...
+
+    async def cancel(self, job_id: str) -> bool: ...
+
+    async def purge_finished(self, finished_before: datetime, batch_size: int = 1000) -> int: ...
+
 
 class ICompanyFollowRepo(Protocol):
     async def follow(self, user_id: str, company_id: str) -> CompanyFollow: ...
@@ -174,3 +274,14 @@ class ICompanyFollowRepo(Protocol):
     async def list_company_ids_for_user(self, user_id: str) -> Sequence[str]: ...
 
     async def list_companies_for_user(self, user_id: str) -> Sequence[Company]: ...
+
+
+class ISyncRepo(Protocol):
+    async def clock(self) -> tuple[int, int]: ...
+
+    async def changed(self, entity: str, since: int, upto: int, limit: int,
+                      user_id: str | None = None) -> list[tuple[int, object]]: ...
+
+    async def tombstones(self, since: int, upto: int, user_id: str | None, limit: int) -> list[SyncTombstone]: ...
+
+    async def purge_tombstones(self, deleted_before: datetime) -> int: ...
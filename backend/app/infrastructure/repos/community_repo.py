@@ -1,11 +1,11 @@
 from typing import Optional, Sequence
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities import Community
 from app.domain.repositories import ICommunityRepo
-from .sql_models import CommunityModel, MembershipModel
+from .sql_models import CommunityModel, CommunityPopularityModel, CommunityRecommendationModel, MembershipModel
 
 
 def _from_row(m: CommunityModel) -> Community:
@@ -66,22 +66,56 @@ class CommunityRepo(ICommunityRepo):
         )
         return [_from_row(r) for r in res.scalars().all()]
 
+    async def list_for_company_with_counts(self, company_id: str) -> Sequence[tuple[Community, int]]:
+        """Non-archived communities of a company with their member counts, in one query."""
+        stmt = (
+            select(CommunityModel, func.count(MembershipModel.id))
+            .outerjoin(MembershipModel, MembershipModel.community_id == CommunityModel.id)
+            .where(CommunityModel.company_id == company_id, CommunityModel.is_archived == False)
+            .group_by(CommunityModel.id)
+        )
+        res = await self.s.execute(stmt)
+        return [(_from_row(m), int(n)) for m, n in res.all()]
+
     async def list_all(self) -> Sequence[Community]:
         res = await self.s.execute(select(CommunityModel).where(CommunityModel.is_archived == False))
         return [_from_row(r) for r in res.scalars().all()]
 
     async def list_joinable(self, user_id: str, *, offset: int = 0, limit: int = 20) -> Sequence[Community]:
-        # communities not archived and where user is not a member
+        """Not archived, user not a member: precomputed recommendations first (by rank), then the rest
+        by popularity. Recommendations are rebuilt offline (`app.scripts.build_recommendations`);
+        users without any (new, no signal) get the popularity order alone."""
         sub_memberships = select(MembershipModel.community_id).where(MembershipModel.user_id == user_id)
-        stmt = (
-            select(CommunityModel)
-            .where(CommunityModel.is_archived == False, ~CommunityModel.id.in_(sub_memberships))
-            .order_by(CommunityModel.name.asc())
-            .offset(offset)
-            .limit(limit)
+        res = await self.s.execute(
+            select(CommunityRecommendationModel.community_id)
+            .join(CommunityModel, CommunityModel.id == CommunityRecommendationModel.community_id)
+            .where(
+                CommunityRecommendationModel.user_id == user_id,
+                CommunityModel.is_archived == False,
+                ~CommunityModel.id.in_(sub_memberships),
+            )
+            .order_by(CommunityRecommendationModel.rank.asc())
         )
-        res = await self.s.execute(stmt)
-        return [_from_row(r) for r in res.scalars().all()]
+        rec_ids = list(res.scalars().all())
+        ids = rec_ids[offset:offset + limit]
+        if len(ids) < limit:
+            stmt = (
+                select(CommunityModel.id)
+                .outerjoin(CommunityPopularityModel, CommunityPopularityModel.community_id == CommunityModel.id)
+                .where(CommunityModel.is_archived == False, ~CommunityModel.id.in_(sub_memberships))
+                # communities created after the last build have no rank yet: after the ranked ones
+                .order_by(func.coalesce(CommunityPopularityModel.rank, 2**31 - 1).asc(), CommunityModel.name.asc())
+                .offset(max(0, offset - len(rec_ids)))
+                .limit(limit - len(ids))
+            )
+            if rec_ids:
+                stmt = stmt.where(CommunityModel.id.not_in(rec_ids))
+            ids += (await self.s.execute(stmt)).scalars().all()
+        if not ids:
+            return []
+        res = await self.s.execute(select(CommunityModel).where(CommunityModel.id.in_(ids)))
+        by_id = {m.id: m for m in res.scalars().all()}
+        return [_from_row(by_id[i]) for i in ids if i in by_id]
 
     async def list_by_ids(self, ids: Sequence[str]) -> Sequence[Community]:
         if not ids:
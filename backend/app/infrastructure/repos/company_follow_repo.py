@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities import CompanyFollow, Company
 from app.domain.repositories import ICompanyFollowRepo
+from .company_repo import _from_row as _company_from_row
 from .sql_models import CompanyFollowModel, CompanyModel
 
 
@@ -43,5 +44,5 @@ class CompanyFollowRepo(ICompanyFollowRepo):
             .where(CompanyFollowModel.user_id == user_id)
         )
         res = await self.s.execute(stmt)
-        return [Company(id=r.id, name=r.name, description=r.description) for r in res.scalars().all()]
+        return [_company_from_row(r) for r in res.scalars().all()]
 
@@ -0,0 +1,67 @@
+"""Per-community content sequence numbers.
+
+`content.seq` numbers the items of a community 1, 2, 3, ... in insert order and is what
+seen-state tracking (`content_seen`) is keyed on. The counter lives in
+`communities.last_seq`; a trigger takes the next value for every row inserted without a
+seq, so all write paths (repos, bulk inserts, seed scripts) are covered. Rows inserted
+with an explicit seq (the load data generator) must call `sync_last_seq` afterwards.
+Gaps (deleted content) are fine: seen tracking skips seqs that no longer exist.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+_PG_TRIGGER = (
+    """
+    CREATE OR REPLACE FUNCTION content_assign_seq() RETURNS trigger AS $$
+    BEGIN
+        UPDATE communities SET last_seq = last_seq + 1 WHERE id = NEW.community_id
+        RETURNING last_seq INTO NEW.seq;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS content_assign_seq ON content",
+    """
+    CREATE TRIGGER content_assign_seq BEFORE INSERT ON content
+    FOR EACH ROW WHEN (NEW.seq IS NULL) EXECUTE FUNCTION content_assign_seq()
+    """,
+)
+
+# SQLite cannot modify NEW; number the row right after it is inserted
+_SQLITE_TRIGGER = (
+    """
+    CREATE TRIGGER IF NOT EXISTS content_assign_seq AFTER INSERT ON content
+    FOR EACH ROW WHEN NEW.seq IS NULL
+    BEGIN
+        UPDATE communities SET last_seq = last_seq + 1 WHERE id = NEW.community_id;
+        UPDATE content SET seq = (SELECT last_seq FROM communities WHERE id = NEW.community_id) WHERE id = NEW.id;
+    END
+    """,
+)
+
+
+async def install_trigger(conn: AsyncConnection) -> None:
+    pg = conn.dialect.name.startswith("postgres")
+    for stmt in _PG_TRIGGER if pg else _SQLITE_TRIGGER:
+        await conn.execute(text(stmt))
+
+
+async def number_missing(conn: AsyncConnection) -> None:
+    """Give rows without a seq the next numbers of their community, oldest first."""
+    await conn.execute(text(
+        "UPDATE content SET seq = n.seq FROM ("
+        " SELECT c.id, cm.last_seq + ROW_NUMBER() OVER (PARTITION BY c.community_id ORDER BY c.created_at, c.id) AS seq"
+        " FROM content c JOIN communities cm ON cm.id = c.community_id WHERE c.seq IS NULL"
+        ") n WHERE content.id = n.id"
+    ))
+    await sync_last_seq(conn)
+
+
+async def sync_last_seq(conn: AsyncConnection) -> None:
+    """Raise each community's counter to its highest seq in use."""
+    await conn.execute(text(
+        "UPDATE communities SET last_seq = m.max_seq FROM ("
+        " SELECT community_id, MAX(seq) AS max_seq FROM content GROUP BY community_id"
+        ") m WHERE m.community_id = communities.id AND m.max_seq > communities.last_seq"
+    ))
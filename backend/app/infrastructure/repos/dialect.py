@@ -0,0 +1,8 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert_insert(session: AsyncSession):
+    """`insert` construct with `on_conflict_do_*` support for the session's backend (PostgreSQL or SQLite)."""
+    return pg_insert if session.bind.dialect.name.startswith("postgres") else sqlite_insert
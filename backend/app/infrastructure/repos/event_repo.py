@@ -1,9 +1,10 @@
 from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.adapters.pubsub import publish
 from app.domain.entities import Event, EventParticipant
 from app.domain.repositories import IEventRepo
 from .sql_models import ContentModel, MembershipModel, FollowModel, EventParticipantModel, ContentSkillModel, SkillModel
@@ -28,10 +29,41 @@ def _from_row(m: ContentModel) -> Event:
     )
 
 
+def _live(e: Event) -> dict:
+    """Live update payload (app/adapters/pubsub.py): enough to show a toast, clients refetch the rest."""
+    event_date = e.event_date.isoformat() if e.event_date else None
+    return {"id": e.id, "community_id": e.community_id, "title": e.title, "event_date": event_date, "city": e.city}
+
+
 class EventRepo(IEventRepo):
     def __init__(self, s: AsyncSession):
         self.s = s
 
+    async def get(self, event_id: str) -> Event | None:
+        res = await self.s.execute(
+            select(ContentModel).where(ContentModel.id == event_id, ContentModel.type == "event")
+        )
+        row = res.scalar_one_or_none()
+        return _from_row(row) if row else None
+
+    async def update(self, event_id: str, **data) -> Event | None:
+        skill_ids = data.pop("skill_ids", None)
+        if "tags" in data and isinstance(data["tags"], list):
+            data["tags"] = ",".join(data["tags"]) if data["tags"] else None
+        if data:
+            await self.s.execute(
+                update(ContentModel).where(ContentModel.id == event_id, ContentModel.type == "event").values(**data)
+            )
+        if skill_ids is not None:
+            await self.s.execute(delete(ContentSkillModel).where(ContentSkillModel.content_id == event_id))
+            for sid in skill_ids:
+                self.s.add(ContentSkillModel(content_id=event_id, skill_id=sid))
+            await self.s.flush()
+        event = await self.get(event_id)
+        if event is not None:
+            await publish(self.s, (f"community:{event.community_id}", "feed"), "event.updated", _live(event))
+        return event
+
     async def list_for_user(self, user_id: str, limit: int = 20) -> Sequence[Event]:
         now = datetime.utcnow()
         # события в сообществах, где пользователь состоит или за которыми следует
@@ -115,7 +147,9 @@ class EventRepo(IEventRepo):
                 self.s.add(ContentSkillModel(content_id=m.id, skill_id=sid))
             await self.s.flush()
 
-        return _from_row(m)
+        event = _from_row(m)
+        await publish(self.s, (f"community:{community_id}", "feed"), "event.created", _live(event))
+        return event
 
     async def join(self, user_id: str, event_id: str) -> EventParticipant:
         # idempotent join: return existing if already joined
@@ -131,11 +165,14 @@ class EventRepo(IEventRepo):
         m = EventParticipantModel(user_id=user_id, content_id=event_id)
         self.s.add(m)
         await self.s.flush()
+        await publish(self.s, (f"user:{user_id}",), "event.joined", {"event_id": event_id})
         return EventParticipant(id=m.id, user_id=m.user_id, event_id=m.content_id)
 
     async def unjoin(self, user_id: str, event_id: str) -> None:
-        await self.s.execute(
+        res = await self.s.execute(
             delete(EventParticipantModel).where(
                 EventParticipantModel.user_id == user_id, EventParticipantModel.content_id == event_id
             )
         )
+        if res.rowcount:
+            await publish(self.s, (f"user:{user_id}",), "event.left", {"event_id": event_id})
@@ -0,0 +1,163 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.domain.entities import Job
+from app.domain.repositories import IJobRepo
+from .dialect import upsert_insert
+from .sql_models import JobModel, uid
+
+FINISHED = ("done", "cancelled")
+
+
+def _from_row(j: JobModel) -> Job:
+    return Job(
+        id=j.id, kind=j.kind, payload=j.payload or {}, status=j.status, priority=j.priority, attempts=j.attempts,
+        max_attempts=j.max_attempts, run_at=j.run_at, key=j.key, error=j.error, created_at=j.created_at,
+        started_at=j.started_at, finished_at=j.finished_at,
+    )
+
+
+class JobRepo(IJobRepo):
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def enqueue(self, kind: str, payload: dict, *, priority: int = 0, run_at: datetime | None = None,
+                      key: str | None = None, max_attempts: int | None = None) -> str | None:
+        """Add a job (visible to workers once the caller commits); None if an unfinished job has `key`."""
+        stmt = upsert_insert(self.s)(JobModel).values(
+            id=uid(), kind=kind, payload=payload, key=key, priority=priority,
+            run_at=run_at or datetime.utcnow(), max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        )
+        if key is not None:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["key"])
+        res = await self.s.execute(stmt.returning(JobModel.id))
+        return res.scalar_one_or_none()
+
+    async def claim(self, kinds: Sequence[str], limit: int, lease_until: datetime) -> list[Job]:
+        """Mark up to `limit` due jobs of `kinds` running (highest priority, then oldest first).
+
+        A running job whose lease expired lost its worker (crash, OOM, hang) without `fail()`
+        being called: it is claimed again if it has attempts left, otherwise it is failed here.
+        """
+        now = datetime.utcnow()
+        expired = and_(JobModel.status == "running", JobModel.locked_until < now)
+        await self.s.execute(
+            update(JobModel)
+            .where(JobModel.kind.in_(kinds), expired, JobModel.attempts >= JobModel.max_attempts)
+            .values(status="failed", key=None, locked_until=None, finished_at=now,
+                    error="lease expired on the last attempt (worker lost)")
+            .execution_options(synchronize_session=False)
+        )
+        due = (
+            select(JobModel.id)
+            .where(
+                JobModel.kind.in_(kinds),
+                JobModel.run_at <= now,
+                or_(
+                    JobModel.status == "pending",
+                    and_(expired, JobModel.attempts < JobModel.max_attempts),
+                ),
+            )
+            .order_by(JobModel.priority.desc(), JobModel.run_at)
+            .limit(limit)
+            # PostgreSQL: concurrent workers skip each other's rows instead of waiting on them.
+            # SQLite renders no lock clause; its writes are serialized, so the single UPDATE is atomic anyway
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.s.execute(
+            update(JobModel)
+            .where(JobModel.id.in_(due.scalar_subquery()))
+            .values(status="running", attempts=JobModel.attempts + 1, started_at=now, locked_until=lease_until)
+            .returning(JobModel)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = [_from_row(j) for j in res.scalars().all()]
+        return sorted(jobs, key=lambda j: (-j.priority, j.run_at))
+
+    async def extend(self, job_ids: Sequence[str], lease_until: datetime) -> None:
+        if job_ids:
+            await self.s.execute(
+                update(JobModel)
+                .where(JobModel.id.in_(job_ids), JobModel.status == "running")
+                .values(locked_until=lease_until)
+            )
+
+    async def complete(self, job_id: str) -> None:
+        await self.s.execute(
+            update(JobModel).where(JobModel.id == job_id).values(
+                status="done", key=None, error=None, locked_until=None, finished_at=datetime.utcnow()
+            )
+        )
+
+    async def fail(self, job_id: str, error: str, *, retry_at: datetime | None) -> None:
+        """Back to pending until `retry_at`, or failed for good (`retry_at` None)."""
+        values = dict(error=error[-2000:], locked_until=None)
+        if retry_at is not None:
+            values.update(status="pending", run_at=retry_at)
+        else:
+            # the key is released: the same work can be enqueued again
+            values.update(status="failed", key=None, finished_at=datetime.utcnow())
+        await self.s.execute(update(JobModel).where(JobModel.id == job_id).values(**values))
+
+    async def release(self, job_id: str) -> None:
+        """Hand a job that was interrupted (worker shutdown) back without counting the attempt."""
+        await self.s.execute(
+            update(JobModel).where(JobModel.id == job_id, JobModel.status == "running").values(
+                status="pending", attempts=JobModel.attempts - 1, locked_until=None
+            )
+        )
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        j = await self.s.get(JobModel, job_id)
+        return _from_row(j) if j else None
+
+    async def list_recent(self, *, status: str | None = None, kind: str | None = None, offset: int = 0,
+                          limit: int = 50) -> list[Job]:
+        stmt = select(JobModel).order_by(JobModel.created_at.desc()).offset(offset).limit(limit)
+        if status:
+            stmt = stmt.where(JobModel.status == status)
+        if kind:
+            stmt = stmt.where(JobModel.kind == kind)
+        return [_from_row(j) for j in (await self.s.execute(stmt)).scalars().all()]
+
+    async def created_since(self, kind: str, since: datetime) -> bool:
+        """Whether a job of `kind` was queued at or after `since`, whatever its status."""
+        stmt = select(JobModel.id).where(JobModel.kind == kind, JobModel.created_at >= since).limit(1)
+        return (await self.s.execute(stmt)).first() is not None
+
+    async def counts(self) -> dict[str, int]:
+        res = await self.s.execute(select(JobModel.status, func.count()).group_by(JobModel.status))
+        return {status: n for status, n in res.all()}
+
+    async def retry(self, job_id: str) -> bool:
+        """Run a failed job again from scratch."""
+        res = await self.s.execute(
+            update(JobModel).where(JobModel.id == job_id, JobModel.status == "failed").values(
+                status="pending", attempts=0, run_at=datetime.utcnow(), finished_at=None
+            )
+        )
+        return res.rowcount > 0
+
+    async def cancel(self, job_id: str) -> bool:
+        """Drop a job that has not started (or is waiting for a retry)."""
+        res = await self.s.execute(
+            update(JobModel).where(JobModel.id == job_id, JobModel.status.in_(("pending", "failed"))).values(
+                status="cancelled", key=None, locked_until=None, finished_at=datetime.utcnow()
+            )
+        )
+        return res.rowcount > 0
+
+    async def purge_finished(self, finished_before: datetime, batch_size: int = 1000) -> int:
+        """Delete one batch of done/cancelled jobs; returns the number of rows removed."""
+        ids = (await self.s.execute(
+            select(JobModel.id)
+            .where(JobModel.status.in_(FINISHED), JobModel.finished_at < finished_before)
+            .limit(batch_size)
+        )).scalars().all()
+        if ids:
+            await self.s.execute(delete(JobModel).where(JobModel.id.in_(ids)))
+        return len(ids)
@@ -1,11 +1,44 @@
+from datetime import datetime
 from typing import Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, exists, func, select, union, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities import Media, MediaType
 from app.domain.repositories import IMediaRepo
-from .sql_models import MediaModel, ContentMediaModel, CompanyMediaModel
+from .sql_models import (
+    CommunityModel,
+    CompanyMediaModel,
+    CompanyModel,
+    ContentMediaModel,
+    ContentModel,
+    MediaModel,
+    StoryModel,
+    UserModel,
+)
+
+# every column pointing at media.id; a media row referenced by none of them is garbage
+MEDIA_REFERENCES = (
+    ContentMediaModel.media_id,
+    CompanyMediaModel.media_id,
+    UserModel.avatar_media_id,
+    CompanyModel.logo_media_id,
+    CommunityModel.logo_media_id,
+    ContentModel.media_id,
+    StoryModel.media_id,
+)
+
+
+def _from_row(m: MediaModel) -> Media:
+    return Media(id=m.id, kind=MediaType(m.kind), mime=m.mime, ext=m.ext, size=m.size, url=m.url,
+                 created_at=m.created_at, poster_url=m.poster_url, stream_url=m.stream_url, duration=m.duration)
+
+
+def _unreferenced():
+    conds = [~exists(select(1).where(col == MediaModel.id)) for col in MEDIA_REFERENCES]
+    # legacy stories may point at media by public url only
+    conds.append(~exists(select(1).where(StoryModel.media_url == MediaModel.url)))
+    return conds
 
 
 class MediaRepo(IMediaRepo):
@@ -16,15 +49,13 @@ class MediaRepo(IMediaRepo):
         m = MediaModel(id=uid, kind=kind, mime=mime, ext=ext, size=size, url=url)
         self.s.add(m)
         await self.s.flush()
-        return Media(id=m.id, kind=MediaType(m.kind), mime=m.mime, ext=m.ext, size=m.size, url=m.url,
-                     created_at=m.created_at)
+        return _from_row(m)
 
     async def get(self, media_id: str) -> Optional[Media]:
         res = await self.s.execute(select(MediaModel).where(MediaModel.id == media_id))
         m = res.scalar_one_or_none()
         if not m: return None
-        return Media(id=m.id, kind=MediaType(m.kind), mime=m.mime, ext=m.ext, size=m.size, url=m.url,
-                     created_at=m.created_at)
+        return _from_row(m)
 
     async def attach_to_content(self, content_id: str, media_ids: list[str]) -> None:
         # порядковые индексы по очереди
@@ -42,11 +73,7 @@ class MediaRepo(IMediaRepo):
         )
         res = await self.s.execute(stmt)
         rows = res.scalars().all()
-        return [
-            Media(id=m.id, kind=MediaType(m.kind), mime=m.mime, ext=m.ext, size=m.size, url=m.url,
-                  created_at=m.created_at)
-            for m in rows
-        ]
+        return [_from_row(m) for m in rows]
 
     async def list_for_company(self, company_id: str) -> Sequence[Media]:
         stmt = (
@@ -57,11 +84,7 @@ class MediaRepo(IMediaRepo):
         )
         res = await self.s.execute(stmt)
         rows = res.scalars().all()
-        return [
-            Media(id=m.id, kind=MediaType(m.kind), mime=m.mime, ext=m.ext, size=m.size, url=m.url,
-                  created_at=m.created_at)
-            for m in rows
-        ]
+        return [_from_row(m) for m in rows]
 
     async def replace_for_company(self, company_id: str, media_ids: list[str]) -> None:
         # Remove existing and insert in order
@@ -72,3 +95,47 @@ class MediaRepo(IMediaRepo):
         for idx, mid in enumerate(media_ids):
             self.s.add(CompanyMediaModel(company_id=company_id, media_id=mid, order_index=idx))
         await self.s.flush()
+
+    async def set_video_assets(self, media_id: str, *, poster_url: str | None, stream_url: str | None,
+                               duration: float | None) -> None:
+        await self.s.execute(
+            update(MediaModel).where(MediaModel.id == media_id)
+            .values(poster_url=poster_url, stream_url=stream_url, duration=duration)
+        )
+
+    # --- garbage collection (app.scripts.media_gc) ---
+    async def count(self) -> int:
+        res = await self.s.execute(select(func.count()).select_from(MediaModel))
+        return int(res.scalar() or 0)
+
+    async def list_ids_after(self, after: str, limit: int) -> list[tuple[str, datetime]]:
+        """(id, created_at) in id order, keyset-paginated."""
+        res = await self.s.execute(
+            select(MediaModel.id, MediaModel.created_at).where(MediaModel.id > after).order_by(MediaModel.id).limit(limit)
+        )
+        return [(i, c) for i, c in res.all()]
+
+    async def referenced_between(self, lo: str, hi: str) -> set[str]:
+        """Ids in (lo, hi] referenced from anywhere; each branch is a range scan on an indexed column."""
+        branches = [select(col.label("id")).where(col > lo, col <= hi) for col in MEDIA_REFERENCES]
+        branches.append(
+            select(MediaModel.id).join(StoryModel, StoryModel.media_url == MediaModel.url)
+            .where(MediaModel.id > lo, MediaModel.id <= hi)
+        )
+        res = await self.s.execute(union(*branches))
+        return {i for i, in res.all()}
+
+    async def existing(self, ids: Sequence[str]) -> set[str]:
+        if not ids:
+            return set()
+        res = await self.s.execute(select(MediaModel.id).where(MediaModel.id.in_(ids)))
+        return {i for i, in res.all()}
+
+    async def delete_unreferenced(self, ids: Sequence[str]) -> list[tuple[str, str | None]]:
+        """Delete those of `ids` still unreferenced (re-checked in the same statement); returns their (id, ext)."""
+        if not ids:
+            return []
+        res = await self.s.execute(
+            delete(MediaModel).where(MediaModel.id.in_(ids), *_unreferenced()).returning(MediaModel.id, MediaModel.ext)
+        )
+        return [(i, ext) for i, ext in res.all()]
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.repositories import IOTPRepo
@@ -18,18 +18,39 @@ class OTPRepo(IOTPRepo):
         return m
 
     async def verify(self, phone: str, code: str) -> bool:
-        # Validate against the latest unconsumed OTP for this phone
+        # Validate against the latest live OTP for this phone: one seek on
+        # ix_otps_phone_consumed_expires, independent of how many codes were issued before
+        now = datetime.utcnow()
         res = await self.s.execute(
-            select(OTPModel)
-            .where(OTPModel.phone == phone, OTPModel.consumed == False)
+            select(OTPModel.code, OTPModel.expires_at)
+            .where(OTPModel.phone == phone, OTPModel.consumed == False, OTPModel.expires_at >= now)
             .order_by(OTPModel.expires_at.desc())
+            .limit(1)
         )
-        row = res.scalars().first()
-        if not row:
+        row = res.first()
+        if not row or row.code != code:
             return False
-        # Check expiry and code match for the latest issued
-        if row.expires_at < datetime.utcnow() or row.code != code:
-            return False
-        row.consumed = True
-        await self.s.flush()
-        return True
+        # consume this code and any older ones still outstanding; a concurrent verify of the
+        # same code finds nothing left to update and fails
+        upd = await self.s.execute(
+            update(OTPModel)
+            .where(OTPModel.phone == phone, OTPModel.consumed == False, OTPModel.expires_at <= row.expires_at)
+            .values(consumed=True)
+        )
+        return upd.rowcount > 0
+
+    async def purge(self, expired_before: datetime, batch_size: int = 1000) -> int:
+        """Delete one batch of expired codes; returns the number of rows removed.
+
+        Consumed codes go too once they expire (within OTP_TTL_SECONDS): filtering on expiry alone
+        keeps each batch a range scan of ix_otps_expires_at.
+        """
+        ids = (await self.s.execute(
+            select(OTPModel.id)
+            .where(OTPModel.expires_at < expired_before)
+            .limit(batch_size)
+        )).scalars().all()
+        if not ids:
+            return 0
+        await self.s.execute(delete(OTPModel).where(OTPModel.id.in_(ids)))
+        return len(ids)
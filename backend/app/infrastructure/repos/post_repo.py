@@ -4,8 +4,10 @@ from typing import Sequence
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.adapters.pubsub import publish
 from app.domain.entities import Post, Skill
 from app.domain.repositories import IPostRepo
+from app.infrastructure.repos.seen_repo import SeenRepo
 from app.infrastructure.repos.sql_models import ContentModel, ContentMediaModel, FollowModel, ContentSkillModel, SkillModel, SphereModel
 
 
@@ -67,6 +69,9 @@ class PostRepo(IPostRepo):
                 self.s.add(ContentSkillModel(content_id=m.id, skill_id=sid))
             await self.s.flush()
 
+        await publish(self.s, (f"community:{community_id}", "feed"), "post.created", {
+            "id": m.id, "community_id": community_id, "title": title, "created_at": m.created_at.isoformat(),
+        })
         return _to_domain_post(m)
 
     async def update(self, post_id: str, **kwargs) -> Post | None:
@@ -133,15 +138,18 @@ class PostRepo(IPostRepo):
         )
         return [_to_domain_post(r) for r in res.scalars().all()]
 
-    async def list_for_followed_communities(self, user_id: str, limit: int = 20) -> Sequence[Post]:
-        res = await self.s.execute(
+    async def list_for_followed_communities(self, user_id: str, limit: int = 20, unseen_only: bool = False) -> Sequence[Post]:
+        stmt = (
             select(ContentModel)
             .join(FollowModel, FollowModel.community_id == ContentModel.community_id)
             .where(FollowModel.user_id == user_id, ContentModel.type == "post")
             .order_by(ContentModel.created_at.desc())
-            .limit(limit)
         )
-        return [_to_domain_post(r) for r in res.scalars().all()]
+        if unseen_only:
+            rows = await SeenRepo(self.s).select_unseen(stmt, user_id, limit=limit)
+        else:
+            rows = (await self.s.execute(stmt.limit(limit))).scalars().all()
+        return [_to_domain_post(r) for r in rows]
 
     async def list_for_communities(self, community_ids: Sequence[str], limit: int = 20) -> Sequence[Post]:
         if not community_ids:
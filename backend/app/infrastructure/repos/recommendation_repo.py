@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories import IRecommendationRepo
+from .sql_models import (
+    CommunityModel,
+    CommunityPopularityModel,
+    CommunityRecommendationModel,
+    CompanyModel,
+    ContentModel,
+    ContentSkillModel,
+    MembershipModel,
+    ProfileModel,
+    ProfileSkillModel,
+)
+
+
+class RecommendationRepo(IRecommendationRepo):
+    """Inputs and output tables of the offline community recommender."""
+
+    def __init__(self, s: AsyncSession, partition_size: int = 50_000):
+        self.s = s
+        self.partition_size = partition_size
+
+    async def _stream(self, stmt) -> AsyncIterator[Sequence]:
+        # server-side cursor on PostgreSQL: millions of pairs never sit in memory as row objects at once
+        res = await self.s.stream(stmt.execution_options(yield_per=self.partition_size))
+        async for part in res.partitions():
+            yield part
+
+    # --- inputs ---
+    def communities(self) -> AsyncIterator[Sequence]:
+        """(community_id, community tags, company tags) of non-archived communities."""
+        return self._stream(
+            select(CommunityModel.id, CommunityModel.tags, CompanyModel.tags)
+            .outerjoin(CompanyModel, CompanyModel.id == CommunityModel.company_id)
+            .where(CommunityModel.is_archived == False)
+        )
+
+    def memberships(self) -> AsyncIterator[Sequence]:
+        return self._stream(select(MembershipModel.user_id, MembershipModel.community_id))
+
+    def profile_skills(self) -> AsyncIterator[Sequence]:
+        return self._stream(
+            select(ProfileModel.user_id, ProfileSkillModel.skill_id)
+            .join(ProfileModel, ProfileModel.id == ProfileSkillModel.profile_id)
+        )
+
+    def profile_interests(self) -> AsyncIterator[Sequence]:
+        return self._stream(
+            select(ProfileModel.user_id, ProfileModel.interests).where(ProfileModel.interests.is_not(None))
+        )
+
+    def community_skills(self) -> AsyncIterator[Sequence]:
+        """(community_id, skill_id, number of the community's posts/events with that skill)."""
+        return self._stream(
+            select(ContentModel.community_id, ContentSkillModel.skill_id, func.count())
+            .join(ContentModel, ContentModel.id == ContentSkillModel.content_id)
+            .group_by(ContentModel.community_id, ContentSkillModel.skill_id)
+        )
+
+    # --- outputs ---
+    async def replace_for_users(self, user_ids: Sequence[str], rows: list[dict]) -> None:
+        """Swap the stored top-k of `user_ids` for `rows` (user_id, rank, community_id, score, computed_at)."""
+        await self.s.execute(delete(CommunityRecommendationModel).where(CommunityRecommendationModel.user_id.in_(user_ids)))
+        if rows:
+            await self.s.execute(insert(CommunityRecommendationModel), rows)
+
+    async def delete_computed_before(self, ts: datetime) -> int:
+        """Drop recommendations of users that were not scored by the run started at `ts`."""
+        res = await self.s.execute(delete(CommunityRecommendationModel).where(CommunityRecommendationModel.computed_at < ts))
+        return res.rowcount
+
+    async def replace_popularity(self, rows: list[dict]) -> None:
+        await self.s.execute(delete(CommunityPopularityModel))
+        if rows:
+            await self.s.execute(insert(CommunityPopularityModel), rows)
@@ -41,6 +41,17 @@ class ReferenceRepo:
             spheres_map = {sp.id: _sphere_from_row(sp) for sp in sp_res.scalars().all()}
         return [_skill_from_row(m, spheres_map.get(m.sphere_id)) for m in skill_models]
 
+    async def skills_by_ids(self, skill_ids: Sequence[str]) -> dict[str, Skill]:
+        """Skills (with spheres) for any number of ids in one query; unknown ids are left out."""
+        if not skill_ids:
+            return {}
+        res = await self.s.execute(
+            select(SkillModel, SphereModel)
+            .outerjoin(SphereModel, SphereModel.id == SkillModel.sphere_id)
+            .where(SkillModel.id.in_(set(skill_ids)))
+        )
+        return {m.id: _skill_from_row(m, _sphere_from_row(sp) if sp else None) for m, sp in res.all()}
+
     async def list_statuses(self) -> Sequence[Status]:
         res = await self.s.execute(select(StatusModel))
         return [_status_from_row(m) for m in res.scalars().all()]
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import delete, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import EventReminder
+from app.domain.repositories import IReminderRepo
+from .dialect import upsert_insert
+from .sql_models import ContentModel, EventParticipantModel, EventReminderModel
+
+
+class ReminderRepo(IReminderRepo):
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def schedule_for_user(self, user_id: str, event_id: str, times: Sequence[tuple[int, datetime]]) -> None:
+        """One reminder per (offset minutes, fire_at); joining twice keeps the existing rows."""
+        if not times:
+            return
+        stmt = upsert_insert(self.s)(EventReminderModel).values([
+            dict(user_id=user_id, event_id=event_id, offset_minutes=offset, fire_at=fire_at) for offset, fire_at in times
+        ])
+        await self.s.execute(stmt.on_conflict_do_nothing())
+
+    async def cancel_for_user(self, user_id: str, event_id: str) -> None:
+        await self.s.execute(
+            delete(EventReminderModel).where(EventReminderModel.user_id == user_id, EventReminderModel.event_id == event_id)
+        )
+
+    async def reschedule_event(self, event_id: str, times: Sequence[tuple[int, datetime]]) -> int:
+        """Replace the event's pending reminders with `times` for every participant; returns rows written."""
+        await self.s.execute(delete(EventReminderModel).where(EventReminderModel.event_id == event_id))
+        total = 0
+        for offset, fire_at in times:
+            # INSERT ... SELECT: participants never travel through Python
+            res = await self.s.execute(
+                insert(EventReminderModel).from_select(
+                    ["user_id", "event_id", "offset_minutes", "fire_at"],
+                    select(
+                        EventParticipantModel.user_id,
+                        EventParticipantModel.content_id,
+                        literal(offset),
+                        literal(fire_at, EventReminderModel.fire_at.type),
+                    ).where(EventParticipantModel.content_id == event_id),
+                )
+            )
+            total += max(res.rowcount, 0)
+        return total
+
+    async def due(self, now: datetime, limit: int) -> list[EventReminder]:
+        """Oldest reminders with fire_at <= now, locked for delivery (skipped by concurrent dispatchers)."""
+        res = await self.s.execute(
+            select(EventReminderModel, ContentModel.title, ContentModel.event_date)
+            .join(ContentModel, ContentModel.id == EventReminderModel.event_id)
+            .where(EventReminderModel.fire_at <= now)
+            .order_by(EventReminderModel.fire_at)
+            .limit(limit)
+            .with_for_update(of=EventReminderModel, skip_locked=True)
+        )
+        return [
+            EventReminder(
+                user_id=r.user_id, event_id=r.event_id, offset_minutes=r.offset_minutes, fire_at=r.fire_at,
+                event_title=title, event_date=event_date,
+            )
+            for r, title, event_date in res.all()
+        ]
+
+    async def delete(self, reminders: Sequence[EventReminder]) -> None:
+        if reminders:
+            keys = [(r.user_id, r.event_id, r.offset_minutes) for r in reminders]
+            await self.s.execute(
+                delete(EventReminderModel).where(
+                    tuple_(EventReminderModel.user_id, EventReminderModel.event_id, EventReminderModel.offset_minutes).in_(keys)
+                )
+            )
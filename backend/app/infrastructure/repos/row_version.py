@@ -0,0 +1,50 @@
+"""Per-row update counters for ETags (app/presentation/conditional.py).
+
+`users`, `profiles`, `content`, `media` and `cases` have a `version` column that a trigger
+increments on every update of the row, whatever the write path. The synced catalog tables carry
+the delta sync version instead (sync_version.py), which changes just as reliably. An entity
+endpoint can then tell whether anything it would return changed by reading (id, version) of
+the rows involved, without loading them. The counter moves under the row lock, so it never
+goes back.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+VERSIONED = ("users", "profiles", "content", "media", "cases")
+
+_PG_FUNCTION = """
+    CREATE OR REPLACE FUNCTION row_version_bump() RETURNS trigger AS $$
+    BEGIN
+        NEW.version := OLD.version + 1;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _pg_trigger(table: str) -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS {table}_row_version ON {table}",
+        f"CREATE TRIGGER {table}_row_version BEFORE UPDATE ON {table} FOR EACH ROW"
+        f" WHEN (OLD.* IS DISTINCT FROM NEW.*) EXECUTE FUNCTION row_version_bump()",
+    ]
+
+
+# SQLite cannot modify NEW; bump right after the write (the nested UPDATE does not re-fire it).
+# No-op updates bump too here: a spare 200 instead of a 304, never a stale one.
+def _sqlite_trigger(table: str) -> list[str]:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_row_version AFTER UPDATE ON {table} FOR EACH ROW"
+        f" WHEN NEW.version = OLD.version"
+        f" BEGIN UPDATE {table} SET version = OLD.version + 1 WHERE id = NEW.id; END",
+    ]
+
+
+async def install_triggers(conn: AsyncConnection) -> None:
+    pg = conn.dialect.name.startswith("postgres")
+    stmts = [_PG_FUNCTION] if pg else []
+    for table in VERSIONED:
+        stmts += _pg_trigger(table) if pg else _sqlite_trigger(table)
+    for stmt in stmts:
+        await conn.execute(text(stmt))
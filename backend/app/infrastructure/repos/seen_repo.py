@@ -0,0 +1,162 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Sequence
+
+from sqlalchemy import Select, and_, func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.seen_set import SeenSet
+from app.domain.repositories import ISeenRepo
+from app.infrastructure.repos.dialect import upsert_insert
+from app.infrastructure.repos.sql_models import (
+    CommunityModel,
+    ContentModel,
+    ContentSeenModel,
+    FollowModel,
+    MembershipModel,
+)
+
+
+class SeenRepo(ISeenRepo):
+    """Per-user seen state of community content, one row per (user, community)."""
+
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def record(self, user_id: str, content_ids: Iterable[str], max_bits: int) -> int:
+        """Mark content as seen. Returns items recorded.
+
+        Costs a content lookup, a locked read of the user's state and one upsert for the whole
+        batch, plus one gap query (`_skip_gaps`) per community left with out-of-order bits.
+        """
+        res = await self.s.execute(
+            select(ContentModel.community_id, ContentModel.seq)
+            .where(ContentModel.id.in_(set(content_ids)), ContentModel.seq.is_not(None))
+        )
+        by_community: dict[str, list[int]] = defaultdict(list)
+        for community_id, seq in res.all():
+            by_community[community_id].append(seq)
+        if not by_community:
+            return 0
+        states = await self._load(user_id, list(by_community), for_update=True)
+        now = datetime.utcnow()
+        rows = []
+        for community_id, seqs in by_community.items():
+            st = states.get(community_id) or SeenSet()
+            for seq in seqs:
+                st.add(seq)
+            st.compact(max_bits)
+            if st.bits:
+                await self._skip_gaps(community_id, st, max_bits)
+            rows.append(dict(user_id=user_id, community_id=community_id, watermark=st.watermark,
+                             bitmap=st.encode() or None, updated_at=now))
+        await self._upsert(rows)
+        return sum(len(v) for v in by_community.values())
+
+    async def mark_all_read(self, user_id: str, community_id: str) -> bool:
+        last_seq = (await self.s.execute(
+            select(CommunityModel.last_seq).where(CommunityModel.id == community_id)
+        )).scalar_one_or_none()
+        if last_seq is None:
+            return False
+        await self._upsert([dict(user_id=user_id, community_id=community_id, watermark=last_seq,
+                                 bitmap=None, updated_at=datetime.utcnow())])
+        return True
+
+    async def unread_counts(self, user_id: str) -> list[tuple[str, int]]:
+        """Unseen items per followed or joined community: an index range count above each watermark."""
+        mine = union(
+            select(FollowModel.community_id).where(FollowModel.user_id == user_id),
+            select(MembershipModel.community_id).where(MembershipModel.user_id == user_id),
+        ).subquery()
+        res = await self.s.execute(
+            select(mine.c.community_id, func.count(ContentModel.id), ContentSeenModel.bitmap)
+            .select_from(mine)
+            .outerjoin(ContentSeenModel, and_(
+                ContentSeenModel.user_id == user_id, ContentSeenModel.community_id == mine.c.community_id,
+            ))
+            .outerjoin(ContentModel, and_(
+                ContentModel.community_id == mine.c.community_id,
+                ContentModel.seq > func.coalesce(ContentSeenModel.watermark, 0),
+            ))
+            .group_by(mine.c.community_id, ContentSeenModel.bitmap)
+            .order_by(mine.c.community_id)
+        )
+        return [
+            (community_id, max(0, count - len(SeenSet.decode(0, bitmap))))
+            for community_id, count, bitmap in res.all()
+        ]
+
+    async def select_unseen(self, stmt: Select, user_id: str, *, offset: int = 0, limit: int = 20) -> list[ContentModel]:
+        """Run `select(ContentModel)...` (ordered, without offset/limit) keeping only items the user has not seen.
+
+        Items at or below the watermark are dropped in SQL; the few seen out of order (bitmap)
+        are dropped here, fetching further pages until `limit` items are collected.
+        """
+        stmt = (
+            stmt.add_columns(ContentSeenModel.watermark, ContentSeenModel.bitmap)
+            .outerjoin(ContentSeenModel, and_(
+                ContentSeenModel.user_id == user_id, ContentSeenModel.community_id == ContentModel.community_id,
+            ))
+            .where(or_(
+                ContentModel.seq.is_(None),
+                ContentSeenModel.watermark.is_(None),
+                ContentModel.seq > ContentSeenModel.watermark,
+            ))
+        )
+        page = max(2 * limit, 20)
+        sets: dict[str, SeenSet] = {}
+        out: list[ContentModel] = []
+        skipped = 0
+        pos = 0
+        while len(out) < limit:
+            rows = (await self.s.execute(stmt.offset(pos).limit(page))).all()
+            for m, watermark, bitmap in rows:
+                st = sets.get(m.community_id)
+                if st is None:
+                    st = sets[m.community_id] = SeenSet.decode(watermark, bitmap)
+                if m.seq is not None and m.seq in st:
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                out.append(m)
+                if len(out) == limit:
+                    break
+            if len(rows) < page:
+                break
+            pos += page
+        return out
+
+    async def _load(self, user_id: str, community_ids: Sequence[str], for_update: bool = False) -> dict[str, SeenSet]:
+        stmt = select(ContentSeenModel).where(
+            ContentSeenModel.user_id == user_id, ContentSeenModel.community_id.in_(community_ids)
+        )
+        if for_update:
+            # concurrent batches of one user must not overwrite each other's bits
+            stmt = stmt.with_for_update()
+        res = await self.s.execute(stmt)
+        return {m.community_id: SeenSet.decode(m.watermark, m.bitmap) for m in res.scalars().all()}
+
+    async def _skip_gaps(self, community_id: str, st: SeenSet, max_bits: int) -> None:
+        """Advance the watermark over seqs that do not exist (deleted content, sparse numbering)."""
+        seqs = (await self.s.execute(
+            select(ContentModel.seq)
+            .where(ContentModel.community_id == community_id, ContentModel.seq > st.watermark)
+            .order_by(ContentModel.seq)
+            .limit(len(st) + 1)
+        )).scalars().all()
+        first = st.first_unseen_above(seqs)
+        st.advance((first - 1) if first is not None else st.watermark + st.bits.bit_length())
+        st.compact(max_bits)
+
+    async def _upsert(self, rows: list[dict]) -> None:
+        stmt = upsert_insert(self.s)(ContentSeenModel).values(rows)
+        await self.s.execute(stmt.on_conflict_do_update(
+            index_elements=[ContentSeenModel.user_id, ContentSeenModel.community_id],
+            set_={
+                "watermark": stmt.excluded.watermark,
+                "bitmap": stmt.excluded.bitmap,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ))
@@ -1,9 +1,11 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, Integer, UniqueConstraint
+from sqlalchemy import BigInteger, String, Boolean, DateTime, FetchedValue, Float, ForeignKey, JSON, Text, Integer, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from app.core.config import settings
+
 
 class Base(DeclarativeBase):
     pass
@@ -23,6 +25,8 @@ class UserModel(Base):
     # Optional avatar reference to media table
     avatar_media_id: Mapped[str | None] = mapped_column(ForeignKey("media.id"), index=True, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # bumped by the DB on every update (see app/infrastructure/repos/row_version.py)
+    version: Mapped[int] = mapped_column(Integer, server_default="0")
 
 
 class ProfileModel(Base):
@@ -34,6 +38,7 @@ class ProfileModel(Base):
     interests: Mapped[str | None] = mapped_column(Text)  # comma-separated
     portfolio_url: Mapped[str | None] = mapped_column(String)
     description: Mapped[str | None] = mapped_column(Text)
+    version: Mapped[int] = mapped_column(Integer, server_default="0")
 
 
 class CompanyModel(Base):
@@ -46,6 +51,8 @@ class CompanyModel(Base):
     owner_user_id: Mapped[str | None] = mapped_column(ForeignKey("users.id"), index=True, nullable=True)
     logo_media_id: Mapped[str | None] = mapped_column(ForeignKey("media.id"), index=True, nullable=True)
     tags: Mapped[str | None] = mapped_column(Text)  # comma-separated
+    # change version for delta sync, stamped by the DB (see app/infrastructure/repos/sync_version.py)
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 
 class CommunityModel(Base):
@@ -59,6 +66,27 @@ class CommunityModel(Base):
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
     # Optional logo similar to companies.logo_media_id
     logo_media_id: Mapped[str | None] = mapped_column(ForeignKey("media.id"), index=True, nullable=True)
+    # last content.seq handed out in this community (see app/infrastructure/repos/content_seq.py)
+    last_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
+
+
+class CommunityRecommendationModel(Base):
+    """Top-k joinable communities per user, rewritten by app/scripts/build_recommendations.py."""
+    __tablename__ = "community_recommendations"
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    community_id: Mapped[str] = mapped_column(ForeignKey("communities.id"))
+    score: Mapped[float] = mapped_column(Float)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
+class CommunityPopularityModel(Base):
+    """Communities by member count, snapshot of the last recommendations run (cold-start fallback)."""
+    __tablename__ = "community_popularity"
+    community_id: Mapped[str] = mapped_column(ForeignKey("communities.id"), primary_key=True)
+    members: Mapped[int] = mapped_column(Integer)
+    rank: Mapped[int] = mapped_column(Integer, index=True)
 
 
 class MembershipModel(Base):
@@ -74,12 +102,14 @@ class FollowModel(Base):
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), index=True)
     community_id: Mapped[str] = mapped_column(ForeignKey("communities.id"), index=True)
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 class CompanyFollowModel(Base):
     __tablename__ = "company_follows"
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), index=True)
     company_id: Mapped[str] = mapped_column(ForeignKey("companies.id"), index=True)
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 
 class ContentModel(Base):
@@ -102,6 +132,20 @@ class ContentModel(Base):
     tags: Mapped[str | None] = mapped_column(Text)  # comma-separated
     cost: Mapped[int | None] = mapped_column(Integer)
     participant_payout: Mapped[int | None] = mapped_column(Integer)
+    # per-community sequence number, assigned by the DB on insert; seen-state tracking
+    seq: Mapped[int | None] = mapped_column(Integer, server_default=FetchedValue())
+    version: Mapped[int] = mapped_column(Integer, server_default="0")
+    __table_args__ = (Index("uq_content_community_seq", "community_id", "seq", unique=True),)
+
+
+class ContentSeenModel(Base):
+    """Seen content of one community for one user: seq <= watermark plus a bitmap above it (app/core/seen_set.py)."""
+    __tablename__ = "content_seen"
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    community_id: Mapped[str] = mapped_column(ForeignKey("communities.id"), primary_key=True)
+    watermark: Mapped[int] = mapped_column(Integer, default=0)
+    bitmap: Mapped[bytes | None] = mapped_column(LargeBinary)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
 class EventParticipantModel(Base):
@@ -112,13 +156,29 @@ class EventParticipantModel(Base):
     __table_args__ = (UniqueConstraint("user_id", "content_id", name="uq_event_participant"),)
 
 
+
+class EventReminderModel(Base):
+    """Pending reminder of a joined event (app/usecases/reminders.py), deleted once delivered."""
+    __tablename__ = "event_reminders"
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_id: Mapped[str] = mapped_column(ForeignKey("content.id", ondelete="CASCADE"), primary_key=True, index=True)
+    offset_minutes: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # the dispatcher reads due rows only: an index range scan from the oldest fire_at
+    fire_at: Mapped[datetime] = mapped_column(DateTime, index=True)
+
+
 class OTPModel(Base):
     __tablename__ = "otps"
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
-    phone: Mapped[str] = mapped_column(String, index=True)
+    phone: Mapped[str] = mapped_column(String)
     code: Mapped[str] = mapped_column(String)
     expires_at: Mapped[datetime] = mapped_column(DateTime)
     consumed: Mapped[bool] = mapped_column(Boolean, default=False)
+    # verify: latest live code per phone; also serves plain phone lookups. purge: range on expires_at
+    __table_args__ = (
+        Index("ix_otps_phone_consumed_expires", "phone", "consumed", "expires_at"),
+        Index("ix_otps_expires_at", "expires_at"),
+    )
 
     def __str__(self):
         return f'Id: {self.phone}, Code: {self.code}, Expires: {self.expires_at}, Consumed: {self.consumed}'
@@ -133,6 +193,11 @@ class MediaModel(Base):
     size: Mapped[int] = mapped_column(Integer)
     url: Mapped[str] = mapped_column(String)  # /media/{id}
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # videos, once processed (video_jobs): poster frame, HLS master playlist, length in seconds
+    poster_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    stream_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    duration: Mapped[float | None] = mapped_column(Float, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, server_default="0")
 
 
 class ContentMediaModel(Base):
@@ -153,14 +218,73 @@ class CompanyMediaModel(Base):
     __table_args__ = (UniqueConstraint("company_id", "media_id", name="uq_company_media"),)
 
 
+class VideoJobModel(Base):
+    """Processing state of an uploaded video: pending -> running -> done | failed.
+
+    The work itself is a `video.transcode` job of the job queue (JobModel)."""
+    __tablename__ = "video_jobs"
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
+    # the GC deletes unreferenced media rows together with their job
+    media_id: Mapped[str] = mapped_column(ForeignKey("media.id", ondelete="CASCADE"), unique=True)
+    status: Mapped[str] = mapped_column(String, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # workers pick the oldest claimable jobs
+    __table_args__ = (Index("ix_video_jobs_status_created", "status", "created_at"),)
+
+
+
+class JobModel(Base):
+    """Durable background job (app/usecases/jobs.py): pending -> running -> done | failed | cancelled."""
+    __tablename__ = "jobs"
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
+    kind: Mapped[str] = mapped_column(String)
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    # dedupe key: at most one unfinished job per key (cleared when the job finishes)
+    key: Mapped[str | None] = mapped_column(String, nullable=True, unique=True)
+    status: Mapped[str] = mapped_column(String, default="pending")
+    priority: Mapped[int] = mapped_column(Integer, default=0)
+    run_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=settings.JOB_MAX_ATTEMPTS)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # a running job whose lease ran out belonged to a worker that died; it is claimed again
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    __table_args__ = (
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+        Index("ix_jobs_kind_created", "kind", "created_at"),
+    )
+
+
+def story_expiry(created_at: datetime) -> datetime:
+    return created_at + timedelta(hours=settings.STORY_TTL_HOURS)
+
+
 class StoryModel(Base):
     __tablename__ = "stories"
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)
-    company_id: Mapped[str] = mapped_column(ForeignKey("companies.id"), index=True)
+    company_id: Mapped[str] = mapped_column(ForeignKey("companies.id"))
     title: Mapped[str] = mapped_column(String)
     media_url: Mapped[str] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     media_id: Mapped[str | None] = mapped_column(ForeignKey("media.id"), index=True)  # NEW
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=lambda: story_expiry(datetime.utcnow()))
+    # live stories of a company: story rings and per-company listings
+    __table_args__ = (Index("ix_stories_company_expires", "company_id", "expires_at"),)
+
+
+class StorySeenModel(Base):
+    """Per user and company: stories created up to `seen_until` were viewed (one row per ring, not per view)."""
+    __tablename__ = "story_seen"
+    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    company_id: Mapped[str] = mapped_column(ForeignKey("companies.id"), primary_key=True)
+    seen_until: Mapped[datetime] = mapped_column(DateTime, index=True)
 
 
 # NEW — справочники сфер/навыков/статусов и связи профиля
@@ -170,6 +294,7 @@ class SphereModel(Base):
     title: Mapped[str] = mapped_column(String)
     background_color: Mapped[str] = mapped_column(String)  # hex
     text_color: Mapped[str] = mapped_column(String)  # hex
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 
 class SkillModel(Base):
@@ -177,6 +302,7 @@ class SkillModel(Base):
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)  # uid
     title: Mapped[str] = mapped_column(String)
     sphere_id: Mapped[str] = mapped_column(ForeignKey("spheres.id"), index=True)
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 
 class ContentSkillModel(Base):
@@ -191,6 +317,7 @@ class StatusModel(Base):
     __tablename__ = "statuses"
     id: Mapped[str] = mapped_column(String, primary_key=True, default=uid)  # uid
     title: Mapped[str] = mapped_column(String)
+    version: Mapped[int] = mapped_column(BigInteger, server_default="0", index=True)
 
 
 class ProfileSkillModel(Base):
@@ -217,3 +344,23 @@ class CaseModel(Base):
     description: Mapped[str | None] = mapped_column(Text)
     date: Mapped[datetime] = mapped_column(DateTime)
     solutions_count: Mapped[int] = mapped_column(Integer, default=0)
+    version: Mapped[int] = mapped_column(Integer, server_default="0")
+
+
+class SyncClockModel(Base):
+    """Single row (id 1): last change version handed out, and the highest version whose
+    tombstones were purged (older sync tokens get a full resync)."""
+    __tablename__ = "sync_clock"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    purged_through: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class SyncTombstoneModel(Base):
+    """A deleted synced row; user_id is set for per-user rows (follows)."""
+    __tablename__ = "sync_tombstones"
+    version: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    entity: Mapped[str] = mapped_column(String)
+    entity_id: Mapped[str] = mapped_column(String)
+    user_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, index=True)
@@ -1,21 +1,30 @@
 from datetime import datetime
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import and_, case, delete, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities import Story
+from app.domain.entities import Story, StoryRing
 from app.domain.repositories import IStoryRepo
-from app.infrastructure.repos.sql_models import StoryModel
+from app.infrastructure.repos.dialect import upsert_insert
+from app.infrastructure.repos.sql_models import (
+    CompanyFollowModel,
+    CompanyModel,
+    StoryModel,
+    StorySeenModel,
+    story_expiry,
+)
 
 
-def _to_domain_story(m: StoryModel) -> Story:
+def _to_domain_story(m) -> Story:
     return Story(
         id=m.id,
         company_id=m.company_id,
         title=m.title,
         media_url=m.media_url,
         created_at=m.created_at,
+        media_id=m.media_id,
+        expires_at=m.expires_at,
     )
 
 
@@ -23,13 +32,16 @@ class StoryRepo(IStoryRepo):
     def __init__(self, s: AsyncSession):
         self.s = s
 
-    async def create(self, company_id: str, title: str, media_url: str) -> Story:
+    async def create(self, company_id: str, title: str, media_url: str, media_id: str | None = None) -> Story:
         """Создать сторис (одно медиа)."""
+        now = datetime.utcnow()
         m = StoryModel(
             company_id=company_id,
             title=title,
             media_url=media_url,
-            created_at=datetime.utcnow(),
+            media_id=media_id,
+            created_at=now,
+            expires_at=story_expiry(now),
         )
         self.s.add(m)
         await self.s.flush()
@@ -37,12 +49,17 @@ class StoryRepo(IStoryRepo):
 
     async def list(self, limit: int = 20) -> Sequence[Story]:
         res = await self.s.execute(
-            select(StoryModel).order_by(StoryModel.created_at.desc()).limit(limit)
+            select(StoryModel)
+            .where(StoryModel.expires_at > datetime.utcnow())
+            .order_by(StoryModel.created_at.desc())
+            .limit(limit)
         )
         return [_to_domain_story(r) for r in res.scalars().all()]
 
     async def get(self, story_id: str) -> Story | None:
-        res = await self.s.execute(select(StoryModel).where(StoryModel.id == story_id))
+        res = await self.s.execute(
+            select(StoryModel).where(StoryModel.id == story_id, StoryModel.expires_at > datetime.utcnow())
+        )
         row = res.scalar_one_or_none()
         return _to_domain_story(row) if row else None
 
@@ -51,8 +68,119 @@ class StoryRepo(IStoryRepo):
             return []
         res = await self.s.execute(
             select(StoryModel)
-            .where(StoryModel.company_id.in_(company_ids))
+            .where(StoryModel.company_id.in_(company_ids), StoryModel.expires_at > datetime.utcnow())
+            .order_by(StoryModel.created_at.desc())
+            .limit(limit)
+        )
+        return [_to_domain_story(r) for r in res.scalars().all()]
+
+    async def list_for_follower(self, user_id: str, limit: int = 20) -> Sequence[Story]:
+        """Latest live stories of companies the user follows (join, no id list round trip)."""
+        followed = select(CompanyFollowModel.company_id).where(CompanyFollowModel.user_id == user_id).distinct().subquery()
+        res = await self.s.execute(
+            select(StoryModel)
+            .join(followed, followed.c.company_id == StoryModel.company_id)
+            .where(StoryModel.expires_at > datetime.utcnow())
             .order_by(StoryModel.created_at.desc())
             .limit(limit)
         )
         return [_to_domain_story(r) for r in res.scalars().all()]
+
+    async def list_rings(self, user_id: str, limit: int = 20, per_ring: int = 20) -> Sequence[StoryRing]:
+        """Followed companies with live stories: rings with unseen stories first, then by latest story.
+
+        One statement: followed companies joined to their live stories and the user's seen
+        markers; window functions give per-ring counts/order, `per_ring` latest stories each.
+        """
+        now = datetime.utcnow()
+        followed = select(CompanyFollowModel.company_id).where(CompanyFollowModel.user_id == user_id).distinct().subquery()
+        ring = StoryModel.company_id
+        unseen = case(
+            (StorySeenModel.seen_until.is_(None), 1),
+            (StoryModel.created_at > StorySeenModel.seen_until, 1),
+            else_=0,
+        )
+        stories = (
+            select(
+                StoryModel.id, StoryModel.company_id, StoryModel.title, StoryModel.media_url,
+                StoryModel.media_id, StoryModel.created_at, StoryModel.expires_at,
+                CompanyModel.name.label("company_name"),
+                CompanyModel.logo_media_id.label("company_logo_media_id"),
+                StorySeenModel.seen_until,
+                func.row_number().over(partition_by=ring, order_by=(StoryModel.created_at.desc(), StoryModel.id)).label("rn"),
+                func.count().over(partition_by=ring).label("story_count"),
+                func.max(StoryModel.created_at).over(partition_by=ring).label("latest_at"),
+                func.sum(unseen).over(partition_by=ring).label("unseen_count"),
+            )
+            .join(followed, followed.c.company_id == StoryModel.company_id)
+            .join(CompanyModel, CompanyModel.id == StoryModel.company_id)
+            .outerjoin(StorySeenModel, and_(StorySeenModel.user_id == user_id, StorySeenModel.company_id == StoryModel.company_id))
+            .where(StoryModel.expires_at > now)
+            .subquery()
+        )
+        ranked = select(
+            stories,
+            func.dense_rank().over(order_by=(
+                case((stories.c.unseen_count > 0, 0), else_=1),
+                stories.c.latest_at.desc(),
+                stories.c.company_id,
+            )).label("ring_rank"),
+        ).where(stories.c.rn <= per_ring).subquery()
+        res = await self.s.execute(
+            select(ranked)
+            .where(ranked.c.ring_rank <= limit)
+            .order_by(ranked.c.ring_rank, ranked.c.created_at, ranked.c.id)
+        )
+        rings: dict[str, StoryRing] = {}
+        for r in res.all():
+            item = rings.get(r.company_id)
+            if item is None:
+                item = rings[r.company_id] = StoryRing(
+                    company_id=r.company_id,
+                    company_name=r.company_name,
+                    company_logo_media_id=r.company_logo_media_id,
+                    latest_at=r.latest_at,
+                    story_count=r.story_count,
+                    unseen_count=int(r.unseen_count or 0),
+                    seen_until=r.seen_until,
+                )
+            item.stories.append(_to_domain_story(r))
+        return list(rings.values())
+
+    async def mark_seen(self, user_id: str, story_id: str) -> bool:
+        """Advance the user's seen marker of the story's company up to this story; False if no such live story."""
+        story = (await self.s.execute(
+            select(StoryModel.company_id, StoryModel.created_at)
+            .where(StoryModel.id == story_id, StoryModel.expires_at > datetime.utcnow())
+        )).first()
+        if not story:
+            return False
+        stmt = upsert_insert(self.s)(StorySeenModel).values(user_id=user_id, company_id=story.company_id, seen_until=story.created_at)
+        # never move the marker back when an older story is reopened
+        await self.s.execute(stmt.on_conflict_do_update(
+            index_elements=[StorySeenModel.user_id, StorySeenModel.company_id],
+            set_={"seen_until": stmt.excluded.seen_until},
+            where=StorySeenModel.seen_until < stmt.excluded.seen_until,
+        ))
+        return True
+
+    async def purge_expired(self, expired_before: datetime, batch_size: int = 1000) -> int:
+        """Delete one batch of expired stories; returns the number of rows removed."""
+        ids = (await self.s.execute(
+            select(StoryModel.id).where(StoryModel.expires_at < expired_before).limit(batch_size)
+        )).scalars().all()
+        if ids:
+            await self.s.execute(delete(StoryModel).where(StoryModel.id.in_(ids)))
+        return len(ids)
+
+    async def purge_seen(self, seen_before: datetime, batch_size: int = 1000) -> int:
+        """Delete one batch of seen markers older than every live story they could cover."""
+        keys = (
+            select(StorySeenModel.user_id, StorySeenModel.company_id)
+            .where(StorySeenModel.seen_until < seen_before)
+            .limit(batch_size)
+        )
+        res = await self.s.execute(
+            delete(StorySeenModel).where(tuple_(StorySeenModel.user_id, StorySeenModel.company_id).in_(keys))
+        )
+        return res.rowcount
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities import SyncTombstone
+from app.domain.repositories import ISyncRepo
+from .community_repo import _from_row as _community_from_row
+from .company_repo import _from_row as _company_from_row
+from .reference_repo import _skill_from_row, _sphere_from_row, _status_from_row
+from .sql_models import (
+    CommunityModel, CompanyFollowModel, CompanyModel, FollowModel, SkillModel, SphereModel, StatusModel,
+    SyncClockModel, SyncTombstoneModel,
+)
+
+# catalog entity -> (model, row -> domain object)
+_CATALOG = {
+    "community": (CommunityModel, _community_from_row),
+    "company": (CompanyModel, _company_from_row),
+    "sphere": (SphereModel, _sphere_from_row),
+    "status": (StatusModel, _status_from_row),
+}
+# per-user entity -> (model, id the client knows the row by)
+_FOLLOWS = {
+    "follow": (FollowModel, FollowModel.community_id),
+    "company_follow": (CompanyFollowModel, CompanyFollowModel.company_id),
+}
+
+
+class SyncRepo(ISyncRepo):
+    """Reads for `GET /sync`; versions are maintained by triggers (sync_version.py)."""
+
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def clock(self) -> tuple[int, int]:
+        """(current version, highest purged tombstone version)."""
+        row = (await self.s.execute(
+            select(SyncClockModel.version, SyncClockModel.purged_through).where(SyncClockModel.id == 1)
+        )).first()
+        return (row[0], row[1]) if row else (0, 0)
+
+    async def changed(self, entity: str, since: int, upto: int, limit: int,
+                      user_id: str | None = None) -> list[tuple[int, object]]:
+        """(version, object) of rows changed in (since, upto], oldest first. Follows are the
+        user's followed ids; without a user there are none."""
+        if entity in _FOLLOWS:
+            if user_id is None:
+                return []
+            model, key = _FOLLOWS[entity]
+            res = await self.s.execute(
+                select(model.version, key)
+                .where(model.user_id == user_id, model.version > since, model.version <= upto)
+                .order_by(model.version).limit(limit)
+            )
+            return [(v, k) for v, k in res.all()]
+        if entity == "skill":
+            res = await self.s.execute(
+                select(SkillModel, SphereModel)
+                .outerjoin(SphereModel, SphereModel.id == SkillModel.sphere_id)
+                .where(SkillModel.version > since, SkillModel.version <= upto)
+                .order_by(SkillModel.version).limit(limit)
+            )
+            return [(m.version, _skill_from_row(m, _sphere_from_row(sp) if sp else None)) for m, sp in res.all()]
+        model, convert = _CATALOG[entity]
+        res = await self.s.execute(
+            select(model).where(model.version > since, model.version <= upto).order_by(model.version).limit(limit)
+        )
+        return [(m.version, convert(m)) for m in res.scalars().all()]
+
+    async def tombstones(self, since: int, upto: int, user_id: str | None, limit: int) -> list[SyncTombstone]:
+        """Deletes in (since, upto]: catalog ones and, for a user, their own."""
+        owner = SyncTombstoneModel.user_id.is_(None)
+        if user_id is not None:
+            owner = or_(owner, SyncTombstoneModel.user_id == user_id)
+        res = await self.s.execute(
+            select(SyncTombstoneModel)
+            .where(SyncTombstoneModel.version > since, SyncTombstoneModel.version <= upto, owner)
+            .order_by(SyncTombstoneModel.version).limit(limit)
+        )
+        return [SyncTombstone(version=m.version, entity=m.entity, entity_id=m.entity_id) for m in res.scalars().all()]
+
+    async def purge_tombstones(self, deleted_before: datetime) -> int:
+        """Drop tombstones older than `deleted_before`; tokens from before them need a full resync."""
+        through = (await self.s.execute(
+            select(func.max(SyncTombstoneModel.version)).where(SyncTombstoneModel.deleted_at < deleted_before)
+        )).scalar()
+        if through is None:
+            return 0
+        res = await self.s.execute(delete(SyncTombstoneModel).where(SyncTombstoneModel.version <= through))
+        await self.s.execute(
+            update(SyncClockModel).where(SyncClockModel.id == 1, SyncClockModel.purged_through < through)
+            .values(purged_through=through)
+        )
+        return res.rowcount
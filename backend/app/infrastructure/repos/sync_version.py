@@ -0,0 +1,141 @@
+"""Change versions for delta sync (`GET /sync`).
+
+Every synced table has a `version` column. Triggers stamp it from the single-row
+`sync_clock` counter whenever a row is inserted or one of its client-visible columns
+changes, and turn deletes into `sync_tombstones` rows. Like the content seq triggers, this
+covers every write path (repos, admin, scripts). Taking the version locks the clock row until
+the writer commits, so versions become visible in order: a client that has seen everything
+up to V can never miss a later commit with a smaller version. The price is that writes to
+synced tables are serialized; they are all small and rare (catalog edits, follows).
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+@dataclass(frozen=True)
+class SyncedTable:
+    table: str
+    entity: str
+    # changes to these bump the version (communities.last_seq moves on every post: not listed)
+    columns: tuple[str, ...]
+    # tombstone id: the row id, or what the client knows the row by (followed community id)
+    key: str = "id"
+    # per-user rows: tombstones carry the owner so only they receive them
+    owner: str | None = None
+
+
+SYNCED = (
+    SyncedTable("communities", "community",
+                ("company_id", "name", "description", "telegram_url", "tags", "is_archived", "logo_media_id")),
+    SyncedTable("companies", "company", ("name", "description", "logo_media_id", "tags")),
+    SyncedTable("spheres", "sphere", ("title", "background_color", "text_color")),
+    SyncedTable("skills", "skill", ("title", "sphere_id")),
+    SyncedTable("statuses", "status", ("title",)),
+    SyncedTable("follows", "follow", ("user_id", "community_id"), key="community_id", owner="user_id"),
+    SyncedTable("company_follows", "company_follow", ("user_id", "company_id"), key="company_id", owner="user_id"),
+)
+
+_PG_FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION sync_stamp() RETURNS trigger AS $$
+    BEGIN
+        UPDATE sync_clock SET version = version + 1 WHERE id = 1 RETURNING version INTO NEW.version;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # args: entity, key column[, owner column]
+    """
+    CREATE OR REPLACE FUNCTION sync_tombstone() RETURNS trigger AS $$
+    DECLARE
+        v bigint;
+        r jsonb := to_jsonb(OLD);
+    BEGIN
+        UPDATE sync_clock SET version = version + 1 WHERE id = 1 RETURNING version INTO v;
+        INSERT INTO sync_tombstones (version, entity, entity_id, user_id, deleted_at)
+        VALUES (v, TG_ARGV[0], r ->> TG_ARGV[1], CASE WHEN TG_NARGS > 2 THEN r ->> TG_ARGV[2] END,
+                now() AT TIME ZONE 'utc');
+        RETURN OLD;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+
+def _pg_triggers(t: SyncedTable) -> list[str]:
+    cols = ", ".join(t.columns)
+    old = ", ".join(f"OLD.{c}" for c in t.columns)
+    new = ", ".join(f"NEW.{c}" for c in t.columns)
+    args = ", ".join(f"'{a}'" for a in (t.entity, t.key, t.owner) if a)
+    return [
+        f"DROP TRIGGER IF EXISTS {t.table}_sync_insert ON {t.table}",
+        f"CREATE TRIGGER {t.table}_sync_insert BEFORE INSERT ON {t.table} FOR EACH ROW EXECUTE FUNCTION sync_stamp()",
+        f"DROP TRIGGER IF EXISTS {t.table}_sync_update ON {t.table}",
+        f"CREATE TRIGGER {t.table}_sync_update BEFORE UPDATE OF {cols} ON {t.table} FOR EACH ROW"
+        f" WHEN (ROW({old}) IS DISTINCT FROM ROW({new})) EXECUTE FUNCTION sync_stamp()",
+        f"DROP TRIGGER IF EXISTS {t.table}_sync_delete ON {t.table}",
+        f"CREATE TRIGGER {t.table}_sync_delete AFTER DELETE ON {t.table} FOR EACH ROW EXECUTE FUNCTION sync_tombstone({args})",
+    ]
+
+
+# SQLite cannot modify NEW; stamp the row right after the write
+def _sqlite_triggers(t: SyncedTable) -> list[str]:
+    bump = "UPDATE sync_clock SET version = version + 1 WHERE id = 1;"
+    stamp = f"UPDATE {t.table} SET version = (SELECT version FROM sync_clock WHERE id = 1) WHERE id = NEW.id;"
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in t.columns)
+    owner = f"OLD.{t.owner}" if t.owner else "NULL"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {t.table}_sync_insert AFTER INSERT ON {t.table} FOR EACH ROW"
+        f" BEGIN {bump} {stamp} END",
+        f"CREATE TRIGGER IF NOT EXISTS {t.table}_sync_update AFTER UPDATE OF {', '.join(t.columns)} ON {t.table}"
+        f" FOR EACH ROW WHEN {changed} BEGIN {bump} {stamp} END",
+        f"CREATE TRIGGER IF NOT EXISTS {t.table}_sync_delete AFTER DELETE ON {t.table} FOR EACH ROW BEGIN {bump}"
+        f" INSERT INTO sync_tombstones (version, entity, entity_id, user_id, deleted_at)"
+        f" SELECT version, '{t.entity}', OLD.{t.key}, {owner}, CURRENT_TIMESTAMP FROM sync_clock WHERE id = 1; END",
+    ]
+
+
+async def install_triggers(conn: AsyncConnection) -> None:
+    pg = conn.dialect.name.startswith("postgres")
+    stmts = list(_PG_FUNCTIONS) if pg else []
+    for t in SYNCED:
+        stmts += _pg_triggers(t) if pg else _sqlite_triggers(t)
+    for stmt in stmts:
+        await conn.execute(text(stmt))
+
+
+async def _renumber(conn: AsyncConnection, table: str, where: str) -> None:
+    """Give the rows matching `where` consecutive versions after the clock and move the clock past them."""
+    await conn.execute(text(
+        f"UPDATE {table} SET version = clock.version + numbered.n"
+        f" FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY version, id) AS n FROM {table} WHERE {where}) AS numbered,"
+        f" (SELECT version FROM sync_clock WHERE id = 1) AS clock"
+        f" WHERE {table}.id = numbered.id"
+    ))
+    await conn.execute(text(
+        f"UPDATE sync_clock SET version = (SELECT MAX(version) FROM {table}) WHERE id = 1"
+        f" AND (SELECT MAX(version) FROM {table}) > version"
+    ))
+
+
+async def stamp_existing(conn: AsyncConnection) -> None:
+    """Create the clock row and give rows written before the triggers existed versions of their own.
+
+    Versions within a table must be distinct: `GET /sync` pages by version alone, so rows sharing
+    one could be cut off at a page end and never delivered.
+    """
+    await conn.execute(text(
+        "INSERT INTO sync_clock (id, version, purged_through) SELECT 1, 0, 0"
+        " WHERE NOT EXISTS (SELECT 1 FROM sync_clock WHERE id = 1)"
+    ))
+    for t in SYNCED:
+        await _renumber(conn, t.table, "version = 0")
+
+
+async def split_shared_versions(conn: AsyncConnection) -> None:
+    """Re-stamp rows that share a version (left by an earlier `stamp_existing`); clients get them once more."""
+    for t in SYNCED:
+        await _renumber(conn, t.table, f"version IN (SELECT version FROM {t.table} GROUP BY version HAVING COUNT(*) > 1)")
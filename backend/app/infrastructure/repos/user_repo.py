@@ -99,3 +99,6 @@ class UserRepo(IUserRepo):
         self.s.add(m)
         await self.s.flush()
         return await self.get_by_id(m.id)
+
+    async def set_password_hash(self, user_id: str, password_hash: str) -> None:
+        await self.s.execute(update(UserModel).where(UserModel.id == user_id).values(password_hash=password_hash))
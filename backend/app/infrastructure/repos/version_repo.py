@@ -0,0 +1,130 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .sql_models import (
+    CaseModel, CommunityModel, CompanyMediaModel, CompanyModel, ContentMediaModel, ContentModel, ContentSkillModel,
+    EventParticipantModel, MediaModel, MembershipModel, ProfileModel, ProfileSkillModel, ProfileStatusModel,
+    SkillModel, SphereModel, StatusModel, UserModel,
+)
+
+Versions = list[tuple[str, str, int]]
+
+
+def _skills(skill_ids) -> list:
+    """Rows for skills shown with their sphere; `skill_ids` is a list or a subquery."""
+    return [
+        select(literal("skill"), SkillModel.id, SkillModel.version).where(SkillModel.id.in_(skill_ids)),
+        select(literal("sphere"), SphereModel.id, SphereModel.version)
+        .join(SkillModel, SkillModel.sphere_id == SphereModel.id).where(SkillModel.id.in_(skill_ids)),
+    ]
+
+
+def _profile(user_id: str) -> list:
+    profile_ids = select(ProfileModel.id).where(ProfileModel.user_id == user_id)
+    return [
+        select(literal("profile"), ProfileModel.id, ProfileModel.version).where(ProfileModel.user_id == user_id),
+        *_skills(select(ProfileSkillModel.skill_id).where(ProfileSkillModel.profile_id.in_(profile_ids))),
+        select(literal("status"), StatusModel.id, StatusModel.version)
+        .join(ProfileStatusModel, ProfileStatusModel.status_id == StatusModel.id)
+        .where(ProfileStatusModel.profile_id.in_(profile_ids)),
+    ]
+
+
+def _member_communities(user_id: str) -> list:
+    return [
+        select(literal("community"), CommunityModel.id, CommunityModel.version)
+        .join(MembershipModel, MembershipModel.community_id == CommunityModel.id)
+        .where(MembershipModel.user_id == user_id, CommunityModel.is_archived == False),
+    ]
+
+
+class VersionRepo:
+    """(kind, id, version) of every row an entity endpoint returns, read without loading the rows:
+    the input for its ETag. None when the entity does not exist."""
+
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def _collect(self, root: str, *selects) -> Optional[Versions]:
+        rows = [tuple(r) for r in (await self.s.execute(union_all(*selects))).all()]
+        return rows if any(kind == root for kind, _, _ in rows) else None
+
+    async def community_detail(self, community_id: str) -> Optional[Versions]:
+        members = select(MembershipModel.user_id).where(MembershipModel.community_id == community_id)
+        return await self._collect(
+            "community",
+            select(literal("community"), CommunityModel.id, CommunityModel.version).where(CommunityModel.id == community_id),
+            select(literal("case"), CaseModel.id, CaseModel.version).where(CaseModel.community_id == community_id),
+            select(literal("user"), UserModel.id, UserModel.version).where(UserModel.id.in_(members)),
+            select(literal("profile"), ProfileModel.user_id, ProfileModel.version).where(ProfileModel.user_id.in_(members)),
+        )
+
+    async def company_detail(self, company_id: str) -> Optional[Versions]:
+        row = (await self.s.execute(
+            select(CompanyModel.version, CompanyModel.tags).where(CompanyModel.id == company_id)
+        )).first()
+        if row is None:
+            return None
+        version, tags = row
+        # company tags are skill ids
+        skill_ids = [t.strip() for t in (tags or "").split(",") if t.strip()]
+        live = (CommunityModel.company_id == company_id, CommunityModel.is_archived == False)
+        return await self._collect(
+            "company",
+            select(literal("company"), literal(company_id), literal(version)),
+            select(literal("community"), CommunityModel.id, CommunityModel.version).where(*live),
+            select(literal("members"), MembershipModel.community_id, func.count())
+            .join(CommunityModel, CommunityModel.id == MembershipModel.community_id)
+            .where(*live).group_by(MembershipModel.community_id),
+            select(literal("media"), MediaModel.id, MediaModel.version)
+            .join(CompanyMediaModel, CompanyMediaModel.media_id == MediaModel.id)
+            .where(CompanyMediaModel.company_id == company_id),
+            select(literal("media_order"), CompanyMediaModel.media_id, CompanyMediaModel.order_index)
+            .where(CompanyMediaModel.company_id == company_id),
+            *(_skills(skill_ids) if skill_ids else []),
+        )
+
+    async def content_item(self, content_id: str) -> Optional[Versions]:
+        linked = select(ContentMediaModel.media_id).where(ContentMediaModel.content_id == content_id)
+        # legacy single media_id, shown when there are no links
+        legacy = select(ContentModel.media_id).where(ContentModel.id == content_id)
+        return await self._collect(
+            "content",
+            select(literal("content"), ContentModel.id, ContentModel.version).where(ContentModel.id == content_id),
+            select(literal("media"), MediaModel.id, MediaModel.version)
+            .where(MediaModel.id.in_(linked) | MediaModel.id.in_(legacy)),
+            select(literal("media_order"), ContentMediaModel.media_id, ContentMediaModel.order_index)
+            .where(ContentMediaModel.content_id == content_id),
+            *_skills(select(ContentSkillModel.skill_id).where(ContentSkillModel.content_id == content_id)),
+        )
+
+    async def user_detail(self, user_id: str) -> Optional[Versions]:
+        return await self._collect(
+            "user",
+            select(literal("user"), UserModel.id, UserModel.version).where(UserModel.id == user_id),
+            *_profile(user_id),
+            *_member_communities(user_id),
+        )
+
+    async def own_profile(self, user_id: str, events_limit: int = 50) -> Optional[Versions]:
+        """`GET /profiles/me`: the profile, its communities and the next `events_limit` joined events."""
+        joined = (
+            select(ContentModel.id, ContentModel.version)
+            .where(
+                ContentModel.id.in_(select(EventParticipantModel.content_id).where(EventParticipantModel.user_id == user_id)),
+                ContentModel.event_date >= datetime.utcnow(),
+                ContentModel.type == "event",
+            )
+            .order_by(ContentModel.event_date.asc())
+            .limit(events_limit)
+            .subquery()
+        )
+        return await self._collect(
+            "profile",
+            *_profile(user_id),
+            *_member_communities(user_id),
+            select(literal("event"), joined.c.id, joined.c.version),
+        )
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repositories import IVideoJobRepo
+from .sql_models import MediaModel, VideoJobModel
+
+
+class VideoJobRepo(IVideoJobRepo):
+    """Processing state per video; the `video.transcode` job that does the work lives in `jobs`."""
+
+    def __init__(self, s: AsyncSession):
+        self.s = s
+
+    async def enqueue(self, media_id: str) -> None:
+        self.s.add(VideoJobModel(media_id=media_id))
+        await self.s.flush()
+
+    async def start(self, media_id: str) -> None:
+        await self.s.execute(
+            update(VideoJobModel).where(VideoJobModel.media_id == media_id).values(
+                status="running", started_at=datetime.utcnow(), attempts=VideoJobModel.attempts + 1
+            )
+        )
+
+    async def complete(self, media_id: str) -> None:
+        await self.s.execute(
+            update(VideoJobModel).where(VideoJobModel.media_id == media_id)
+            .values(status="done", error=None, finished_at=datetime.utcnow())
+        )
+
+    async def fail(self, media_id: str, error: str, *, retry: bool) -> None:
+        await self.s.execute(
+            update(VideoJobModel).where(VideoJobModel.media_id == media_id).values(
+                status="pending" if retry else "failed",
+                error=error[-2000:],
+                finished_at=None if retry else datetime.utcnow(),
+            )
+        )
+
+    async def enqueue_unprocessed(self) -> list[str]:
+        """State rows for videos uploaded before the pipeline was enabled; returns their media ids."""
+        without_job = (
+            select(MediaModel.id)
+            .where(MediaModel.kind == "video", ~MediaModel.id.in_(select(VideoJobModel.media_id)))
+        )
+        ids = [i for i, in (await self.s.execute(without_job)).all()]
+        if ids:
+            await self.s.execute(insert(VideoJobModel), [dict(media_id=i) for i in ids])
+        return ids
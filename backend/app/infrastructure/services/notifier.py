@@ -0,0 +1,33 @@
+import logging
+from typing import Sequence
+
+from app.domain.entities import EventReminder
+
+logger = logging.getLogger("app.notify")
+
+
+class INotifier:
+    async def send_reminders(self, reminders: Sequence[EventReminder]) -> None:
+        """Deliver one batch; raising leaves the whole batch for the next attempt."""
+        raise NotImplementedError
+
+
+class LogNotifier(INotifier):
+    """Local stand-in for a push/SMS provider: one log line per reminder."""
+
+    async def send_reminders(self, reminders: Sequence[EventReminder]) -> None:
+        for r in reminders:
+            logger.info(
+                "reminder user=%s event=%s (%s at %s) %d min before",
+                r.user_id, r.event_id, r.event_title, r.event_date, r.offset_minutes,
+            )
+
+
+NOTIFIERS = {"log": LogNotifier}
+
+
+def get_notifier(name: str) -> INotifier:
+    try:
+        return NOTIFIERS[name]()
+    except KeyError:
+        raise ValueError(f"unknown notifier {name!r} (known: {', '.join(sorted(NOTIFIERS))})") from None
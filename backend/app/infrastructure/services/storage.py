@@ -1,31 +1,136 @@
-import os, uuid, pathlib, shutil
-from typing import BinaryIO, Tuple
+import os, re, uuid, pathlib, shutil
+from typing import BinaryIO, Iterator, Tuple
+
+# uploads are named by uuid4 hex; anything else under the root is not ours to move or delete
+UID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
 
 class IStorage:
     def save(self, file: BinaryIO, *, mime: str, ext: str | None) -> tuple[str, str]:
         """Сохраняет файл и возвращает (uid, public_url)"""
         raise NotImplementedError
 
-    def path_for(self, uid: str) -> str:
+    def path_for(self, uid: str, ext: str | None = None) -> str:
+        raise NotImplementedError
+
+    def asset_dir(self, uid: str) -> str:
+        """Directory for files derived from `uid` (video poster, HLS renditions)."""
+        raise NotImplementedError
+
+    def asset_path(self, uid: str, name: str) -> str | None:
+        """Path of derived file `name` (may contain '/'); None if it would leave the asset directory."""
+        raise NotImplementedError
+
+    def asset_url(self, uid: str, name: str) -> str:
+        raise NotImplementedError
+
+    def delete_assets(self, uid: str) -> None:
+        raise NotImplementedError
+
+    def buckets(self) -> list[str]:
+        """Groups of stored files the GC scans (and checkpoints) one at a time."""
+        raise NotImplementedError
+
+    def scan(self, bucket: str) -> Iterator[tuple[str, str, float]]:
+        """(uid, path, mtime) of the files in `bucket`, streamed."""
         raise NotImplementedError
 
 class LocalFileStorage(IStorage):
+    """Files under `root` sharded by uid: `ab/cd/abcd….ext` (65536 leaf directories).
+
+    Paths are computed from uid + ext, no directory listing. Files of the former flat
+    layout (`root/<uid>.<ext>`) are still found until `app.scripts.migrate_media_layout`
+    has moved them.
+    """
+
     def __init__(self, root: str = "/data/media", public_prefix: str = "/media"):
         self.root = pathlib.Path(root)
         self.prefix = public_prefix
         self.root.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def filename(uid: str, ext: str | None) -> str:
+        return f"{uid}{('.' + ext) if ext else ''}"
+
+    def sharded_path(self, uid: str, ext: str | None) -> pathlib.Path:
+        return self.root / uid[0:2] / uid[2:4] / self.filename(uid, ext)
+
     def save(self, file: BinaryIO, *, mime: str, ext: str | None) -> tuple[str, str]:
         uid = uuid.uuid4().hex
-        filename = f"{uid}{('.' + ext) if ext else ''}"
-        target = self.root / filename
-        with open(target, "wb") as out:
+        target = self.sharded_path(uid, ext)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # readers never see a partial file: write aside (dot files are skipped by scans), then rename
+        tmp = target.with_name(f".{target.name}.tmp")
+        with open(tmp, "wb") as out:
             shutil.copyfileobj(file, out)
+        os.replace(tmp, target)
         return uid, f"{self.prefix}/{uid}"
 
-    def path_for(self, uid: str) -> str:
-        # ищем файл по uid.* (расширение неизвестно)
-        for p in self.root.glob(f"{uid}*"):
-            return str(p)
-        # если не нашли, вернем путь по умолчанию без расширения
-        return str(self.root / uid)
\ No newline at end of file
+    def path_for(self, uid: str, ext: str | None = None) -> str:
+        """Where the file of `uid` is; the sharded path when it exists nowhere (yet)."""
+        sharded = self.sharded_path(uid, ext)
+        if sharded.exists():
+            return str(sharded)
+        legacy = self.root / self.filename(uid, ext)
+        if legacy.exists():
+            return str(legacy)
+        if ext is None:
+            # extension unknown: look around in the (small) shard directory, then the legacy root
+            for p in sharded.parent.glob(f"{uid}.*"):
+                if p.is_file():
+                    return str(p)
+            for p in self.root.glob(f"{uid}.*"):
+                if p.is_file():
+                    return str(p)
+        # checked again: the migrator may have moved the file between the two lookups
+        return str(sharded)
+
+    def asset_dir(self, uid: str) -> str:
+        # next to the original: ab/cd/<uid>.assets/
+        return str(self.sharded_path(uid, "assets"))
+
+    def asset_path(self, uid: str, name: str) -> str | None:
+        base = os.path.realpath(self.asset_dir(uid))
+        path = os.path.realpath(os.path.join(base, name))
+        return path if path.startswith(base + os.sep) else None
+
+    def asset_url(self, uid: str, name: str) -> str:
+        return f"{self.prefix}/{uid}/{name}"
+
+    def delete_assets(self, uid: str) -> None:
+        shutil.rmtree(self.asset_dir(uid), ignore_errors=True)
+
+    def buckets(self) -> list[str]:
+        # "" is the legacy flat root (its files only), then one bucket per top-level shard
+        return [""] + sorted(
+            e.name for e in os.scandir(self.root) if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")
+        )
+
+    def scan(self, bucket: str) -> Iterator[tuple[str, str, float]]:
+        dirs = [self.root] if bucket == "" else sorted(
+            pathlib.Path(e.path) for e in os.scandir(self.root / bucket) if e.is_dir(follow_symlinks=False)
+        )
+        for d in dirs:
+            # scandir streams entries; dot files (GC checkpoints, temp files) are not media
+            with os.scandir(d) as it:
+                for e in it:
+                    if not e.name.startswith(".") and e.is_file(follow_symlinks=False):
+                        yield e.name.split(".", 1)[0], e.path, e.stat(follow_symlinks=False).st_mtime
+
+    def iter_legacy(self) -> Iterator[os.DirEntry]:
+        """Files still in the flat layout."""
+        with os.scandir(self.root) as it:
+            for e in it:
+                if not e.name.startswith(".") and e.is_file(follow_symlinks=False):
+                    yield e
+
+    def move_to_shard(self, name: str) -> bool:
+        """Move legacy `root/<name>` to its sharded path; False if it is already gone."""
+        uid, _, ext = name.partition(".")
+        target = self.sharded_path(uid, ext or None)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # same filesystem: atomic, a concurrent reader finds the file at one of the two paths
+            os.rename(self.root / name, target)
+        except FileNotFoundError:
+            return False
+        return True
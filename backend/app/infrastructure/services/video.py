@@ -0,0 +1,105 @@
+"""ffmpeg/ffprobe wrapper: poster frame, duration and HLS renditions of one video.
+
+`transcode` runs in a worker process (see `app.usecases.video`), so this module only
+depends on the standard library and must stay importable on its own.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rendition:
+    height: int
+    video_kbps: int
+
+
+def parse_renditions(spec: str) -> list[Rendition]:
+    """"360:800,720:2500" -> renditions sorted by height."""
+    out = []
+    for part in spec.split(","):
+        if part.strip():
+            h, kbps = part.split(":")
+            out.append(Rendition(int(h), int(kbps)))
+    return sorted(out, key=lambda r: r.height)
+
+
+def tools_available(ffmpeg: str, ffprobe: str) -> bool:
+    return shutil.which(ffmpeg) is not None and shutil.which(ffprobe) is not None
+
+
+def _run(cmd: list[str], timeout: float) -> str:
+    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{os.path.basename(cmd[0])} exited with {proc.returncode}: {proc.stderr.strip()[-1000:]}")
+    return proc.stdout
+
+
+def probe(ffprobe: str, src: str, timeout: float = 60) -> tuple[float, int, int]:
+    """(duration seconds, width, height) of the first video stream."""
+    out = json.loads(_run(
+        [ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", src], timeout
+    ))
+    video = next((s for s in out.get("streams", []) if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise RuntimeError("no video stream")
+    duration = float(out.get("format", {}).get("duration") or video.get("duration") or 0.0)
+    return duration, int(video["width"]), int(video["height"])
+
+
+def transcode(
+    src: str,
+    out_dir: str,
+    *,
+    ffmpeg: str,
+    ffprobe: str,
+    renditions: list[Rendition],
+    segment_seconds: int = 4,
+    timeout: float = 1800,
+) -> dict:
+    """Write `poster.jpg` and `hls/master.m3u8` (+ one playlist with segments per rendition)
+    into `out_dir`, replacing a previous result. Returns duration, asset names and heights."""
+    if not os.path.isfile(src):
+        raise FileNotFoundError(f"source file missing: {src}")
+    duration, width, height = probe(ffprobe, src, timeout)
+    # renditions no taller than the source; a small source still gets the lowest one
+    wanted = [r for r in renditions if r.height <= height] or renditions[:1]
+    tmp = out_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(os.path.join(tmp, "hls"))
+    base = [ffmpeg, "-nostdin", "-y", "-v", "error"]
+    _run(base + [
+        "-ss", f"{min(1.0, duration / 2):.3f}", "-i", src, "-frames:v", "1",
+        "-vf", f"scale=-2:{min(height, 720)}", "-q:v", "3", os.path.join(tmp, "poster.jpg"),
+    ], timeout)
+    master = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for r in wanted:
+        name = f"{r.height}p"
+        os.makedirs(os.path.join(tmp, "hls", name))
+        _run(base + [
+            "-i", src, "-map", "0:v:0", "-map", "0:a:0?",
+            "-vf", f"scale=-2:{r.height}", "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+            "-b:v", f"{r.video_kbps}k", "-maxrate", f"{int(r.video_kbps * 1.07)}k", "-bufsize", f"{r.video_kbps * 2}k",
+            # keyframes on segment boundaries: every rendition switches at the same points
+            "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})",
+            "-c:a", "aac", "-b:a", "128k", "-ac", "2",
+            "-f", "hls", "-hls_time", str(segment_seconds), "-hls_playlist_type", "vod",
+            "-hls_segment_filename", os.path.join(tmp, "hls", name, "seg_%05d.ts"),
+            os.path.join(tmp, "hls", name, "index.m3u8"),
+        ], timeout)
+        w = round(width * r.height / height / 2) * 2
+        master.append(f"#EXT-X-STREAM-INF:BANDWIDTH={(r.video_kbps + 128) * 1000},RESOLUTION={w}x{r.height}")
+        master.append(f"{name}/index.m3u8")
+    with open(os.path.join(tmp, "hls", "master.m3u8"), "w") as f:
+        f.write("\n".join(master) + "\n")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp, out_dir)
+    return {
+        "duration": duration,
+        "poster": "poster.jpg",
+        "stream": "hls/master.m3u8",
+        "heights": [r.height for r in wanted],
+    }
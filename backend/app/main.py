@@ -1,10 +1,26 @@
-import uvicorn
+import time
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
 
-from app.adapters.db import engine
-from app.infrastructure.repos.sql_models import Base
+from app.adapters.db import async_session, engine, warm_pool
+from app.adapters.periodic import PeriodicTask
+from app.adapters.pubsub import broker
+from app.core import metrics
+from app.core.config import settings
+from app.presentation.api import media_endpoints
 from app.presentation.api.router import api
-from app.migrations.auto import run_lightweight_migrations
+from app.presentation.middleware import MetricsMiddleware, QueryStatsMiddleware
+from app.presentation.warmup import state as readiness, warm_up
+from app.migrations.ledger import run_migrations
+from app.usecases.auth import OTP_PURGE_JOB, purge_otps
+from app.usecases.content import STORY_PURGE_JOB, purge_stories
+from app.infrastructure.services.notifier import get_notifier
+from app.usecases.jobs import JOB_PURGE_JOB, JobRunner, purge_jobs, schedule
+from app.usecases.reminders import REMINDER_DISPATCH_JOB, dispatch_reminders
+from app.usecases.sync import SYNC_PURGE_JOB, purge_tombstones
+from app.usecases.video import VIDEO_JOB, VideoPipeline
 
 app = FastAPI(title="Communities API", swagger_ui_parameters={
     "dom_id": "#swagger-ui",
@@ -14,14 +30,68 @@ app = FastAPI(title="Communities API", swagger_ui_parameters={
     "showCommonExtensions": True,
 })
 app.include_router(api)
+if settings.METRICS_ENABLED:
+    # added first => runs inside QueryStatsMiddleware and sees the request's SQL stats
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+
+video_pipeline = VideoPipeline(async_session, media_endpoints.storage)
+notifier = get_notifier(settings.NOTIFIER)
+
+job_runner = JobRunner(async_session)
+job_runner.register(OTP_PURGE_JOB, lambda job: purge_otps(async_session))
+job_runner.register(STORY_PURGE_JOB, lambda job: purge_stories(async_session))
+job_runner.register(JOB_PURGE_JOB, lambda job: purge_jobs(async_session))
+job_runner.register(REMINDER_DISPATCH_JOB, lambda job: dispatch_reminders(async_session, notifier))
+job_runner.register(SYNC_PURGE_JOB, lambda job: purge_tombstones(async_session))
+if video_pipeline.available:
+    # workers without ffmpeg leave video jobs to the others
+    job_runner.register(VIDEO_JOB, video_pipeline.process, concurrency=video_pipeline.workers)
+
+
+def _periodic(name: str, interval: float, kind: str) -> PeriodicTask:
+    return PeriodicTask(name, interval, lambda: schedule(async_session, kind, interval))
+
+
+# every worker schedules the purges; the per-interval dedupe key keeps it to one job of each per
+# interval, one worker runs it
+background_tasks = [
+    _periodic("otp_purge", settings.OTP_PURGE_INTERVAL_SECONDS, OTP_PURGE_JOB),
+    _periodic("story_purge", settings.STORY_PURGE_INTERVAL_SECONDS, STORY_PURGE_JOB),
+    _periodic("job_purge", settings.JOB_PURGE_INTERVAL_SECONDS, JOB_PURGE_JOB),
+    _periodic("sync_purge", settings.SYNC_PURGE_INTERVAL_SECONDS, SYNC_PURGE_JOB),
+    _periodic("event_reminders", settings.EVENT_REMINDER_POLL_SECONDS, REMINDER_DISPATCH_JOB),
+]
 
 
 @app.on_event("startup")
 async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    # Run additive, idempotent migrations to keep old DBs compatible
-    await run_lightweight_migrations()
+    # one version read when the schema is current; pending steps run under a lock.
+    # Skipped in workers started by app.serve, which migrates before forking.
+    if settings.MIGRATE_ON_STARTUP:
+        await run_migrations(engine)
+    # runs before the worker accepts connections
+    await warm_pool()
+    if settings.WARMUP_ENABLED:
+        await warm_up(app)
+    for task in background_tasks:
+        task.start()
+    if settings.JOB_RUNNER_ENABLED:
+        job_runner.start()
+    # one LISTEN connection per worker for live updates written by the others
+    broker.start(engine)
+    readiness.ready = True
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # draining: let the load balancer stop routing here
+    readiness.ready = False
+    await broker.stop()
+    for task in background_tasks:
+        await task.stop()
+    await job_runner.stop()
+    video_pipeline.shutdown()
 
 
 @app.get("/health")
@@ -29,5 +99,33 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once warm-up finished and the DB answers, 503 otherwise."""
+    if not readiness.ready:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    t0 = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse({"status": "db_unavailable"}, status_code=503)
+    return {
+        "status": "ready",
+        "db_latency_ms": round((time.perf_counter() - t0) * 1000.0, 2),
+        "warmup_ms": round(readiness.warmup_ms, 1),
+        "warmup_errors": readiness.warmup_errors,
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=False)
+    from app.serve import main
+
+    main()
@@ -0,0 +1,110 @@
+"""Versioned migration ledger.
+
+`schema_migrations` records every applied step of `app.migrations.versions`. On boot a
+single `SELECT MAX(version)` decides whether anything has to run; an up-to-date database
+costs one query and no schema introspection.
+
+When steps are pending, exactly one process applies them: Postgres takes a session-level
+advisory lock, SQLite an exclusive file lock next to the database file. Processes that
+waited for the lock re-read the ledger and skip what the winner already applied.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.migrations.versions import MIGRATIONS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger("app.migrations")
+
+LEDGER_TABLE = "schema_migrations"
+# arbitrary application-wide key for pg_advisory_lock
+ADVISORY_LOCK_KEY = 0x57434D494752  # "WCMIGR"
+
+_CREATE_LEDGER = f"""
+CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+async def current_version(engine: AsyncEngine) -> int:
+    """Highest applied version; 0 when the ledger does not exist yet."""
+    try:
+        async with engine.connect() as conn:
+            return int((await conn.execute(text(f"SELECT MAX(version) FROM {LEDGER_TABLE}"))).scalar() or 0)
+    except DBAPIError:
+        return 0
+
+
+@asynccontextmanager
+async def _migration_lock(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    async with engine.connect() as conn:
+        if conn.dialect.name.startswith("postgres"):
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            await conn.commit()
+            try:
+                yield conn
+            finally:
+                if conn.in_transaction():
+                    await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                await conn.commit()
+            return
+
+        database = engine.url.database if conn.dialect.name == "sqlite" else None
+        if fcntl is None or not database or database == ":memory:":
+            yield conn
+            return
+        fd = os.open(f"{database}.migrate.lock", os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+            yield conn
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+async def run_migrations(engine: AsyncEngine | None = None) -> int:
+    """Apply pending steps; returns how many were applied by this process."""
+    if engine is None:
+        from app.adapters.db import engine
+    target = latest_version()
+    if await current_version(engine) >= target:
+        return 0
+
+    applied = 0
+    async with _migration_lock(engine) as conn:
+        async with conn.begin():
+            await conn.execute(text(_CREATE_LEDGER))
+        async with conn.begin():
+            done = set((await conn.execute(text(f"SELECT version FROM {LEDGER_TABLE}"))).scalars())
+        for step in MIGRATIONS:
+            if step.version in done:
+                continue
+            async with conn.begin():
+                await step.up(conn)
+                await conn.execute(
+                    text(f"INSERT INTO {LEDGER_TABLE} (version, name) VALUES (:version, :name)"),
+                    {"version": step.version, "name": step.name},
+                )
+            applied += 1
+            logger.info("applied migration %04d_%s", step.version, step.name)
+    return applied
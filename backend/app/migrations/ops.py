@@ -0,0 +1,71 @@
+"""Idempotent schema operations for migration steps.
+
+Steps may run against databases that were partly migrated by the old one-off scripts, so
+every operation checks the live schema first. The checks only run while a step is being
+applied, never on a regular boot.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.infrastructure.repos.sql_models import Base
+
+
+def is_postgres(conn: AsyncConnection) -> bool:
+    return conn.dialect.name.startswith("postgres")
+
+
+async def has_table(conn: AsyncConnection, table: str) -> bool:
+    return await conn.run_sync(lambda c: inspect(c).has_table(table))
+
+
+async def has_column(conn: AsyncConnection, table: str, column: str) -> bool:
+    def _check(c) -> bool:
+        insp = inspect(c)
+        return insp.has_table(table) and any(col["name"] == column for col in insp.get_columns(table))
+    return await conn.run_sync(_check)
+
+
+async def has_unique(conn: AsyncConnection, table: str, columns: list[str]) -> bool:
+    """True if a unique constraint or unique index covers exactly `columns`."""
+    def _check(c) -> bool:
+        insp = inspect(c)
+        if not insp.has_table(table):
+            return False
+        uniques = [u["column_names"] for u in insp.get_unique_constraints(table)]
+        uniques += [i["column_names"] for i in insp.get_indexes(table) if i.get("unique")]
+        return any(list(cols) == list(columns) for cols in uniques)
+    return await conn.run_sync(_check)
+
+
+async def create_tables(conn: AsyncConnection, *tables: str) -> None:
+    """Create model tables (with their indexes) that do not exist yet."""
+    await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=[Base.metadata.tables[t] for t in tables]))
+
+
+async def add_column(conn: AsyncConnection, table: str, column: str, pg_type: str, sqlite_type: str | None = None) -> bool:
+    if await has_column(conn, table, column):
+        return False
+    ddl_type = pg_type if is_postgres(conn) else (sqlite_type or pg_type)
+    await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    return True
+
+
+async def drop_column(conn: AsyncConnection, table: str, column: str) -> bool:
+    # SQLite supports DROP COLUMN since 3.35
+    if not await has_column(conn, table, column):
+        return False
+    await conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    return True
+
+
+async def rename_column(conn: AsyncConnection, table: str, old: str, new: str) -> bool:
+    if not await has_column(conn, table, old) or await has_column(conn, table, new):
+        return False
+    await conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}"))
+    return True
+
+
+async def create_index(conn: AsyncConnection, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    await conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
@@ -0,0 +1,248 @@
+"""Ordered schema migrations.
+
+Each step gets the next version number and is applied once, inside its own transaction,
+by `app.migrations.ledger.run_migrations`. Never edit or renumber a released step; add a
+new one instead. Steps must stay idempotent (use `app.migrations.ops`): databases created
+before the ledger existed start from version 0 and replay everything.
+
+Steps 2-7 replace the former `scripts/migrate_*.py` one-off scripts and the boot-time
+column checks in `migrations/auto.py`.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.infrastructure.repos import content_seq, row_version, sync_version
+from app.infrastructure.repos.sql_models import Base, EventReminderModel, JobModel, uid
+from app.migrations import ops
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    up: Callable[[AsyncConnection], Awaitable[None]]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, name: str):
+    def register(fn):
+        if MIGRATIONS and version != MIGRATIONS[-1].version + 1:
+            raise RuntimeError(f"migration {version} ({name}) is out of order")
+        MIGRATIONS.append(Migration(version, name, fn))
+        return fn
+    return register
+
+
+@migration(1, "baseline_schema")
+async def _baseline(conn: AsyncConnection) -> None:
+    # fresh databases get the current schema at once; existing ones only the missing tables
+    # (cases, company_media, content_* ...), their columns are fixed up by the steps below
+    await conn.run_sync(Base.metadata.create_all)
+
+
+@migration(2, "unify_posts_events_to_content")
+async def _unify_content(conn: AsyncConnection) -> None:
+    """Copy legacy posts/events/post_media rows into content tables; point participants to content."""
+    pg = ops.is_postgres(conn)
+    insert = "INSERT INTO" if pg else "INSERT OR IGNORE INTO"
+    on_conflict = " ON CONFLICT (id) DO NOTHING" if pg else ""
+    now = "NOW()" if pg else "datetime('now')"
+    if await ops.has_table(conn, "posts"):
+        await conn.execute(text(
+            f"{insert} content (id, community_id, type, title, body, created_at) "
+            f"SELECT p.id, p.community_id, 'post', p.title, p.body, p.created_at FROM posts p{on_conflict}"
+        ))
+    if await ops.has_table(conn, "events"):
+        await conn.execute(text(
+            f"{insert} content (id, community_id, type, title, event_date, city, location, description, "
+            f"registration, format, media_id, created_at) "
+            f"SELECT e.id, e.community_id, 'event', e.title, e.starts_at, e.city, e.location, e.description, "
+            f"e.registration, e.format, e.media_id, {now} FROM events e{on_conflict}"
+        ))
+    if await ops.has_table(conn, "post_media"):
+        await conn.execute(text(
+            f"{insert} content_media (id, content_id, media_id, order_index) "
+            f"SELECT pm.id, pm.post_id, pm.media_id, pm.order_index FROM post_media pm{on_conflict}"
+        ))
+    if await ops.has_column(conn, "event_participants", "event_id"):
+        if pg:
+            await conn.execute(text(
+                "ALTER TABLE event_participants DROP CONSTRAINT IF EXISTS event_participants_event_id_fkey"
+            ))
+        await ops.rename_column(conn, "event_participants", "event_id", "content_id")
+        if pg:
+            await conn.execute(text(
+                "ALTER TABLE event_participants ADD CONSTRAINT event_participants_content_id_fkey "
+                "FOREIGN KEY (content_id) REFERENCES content(id)"
+            ))
+
+
+@migration(3, "drop_post_author_and_featured")
+async def _drop_post_columns(conn: AsyncConnection) -> None:
+    if await ops.has_table(conn, "posts"):
+        await ops.drop_column(conn, "posts", "author_user_id")
+        await ops.drop_column(conn, "posts", "featured")
+
+
+@migration(4, "community_columns")
+async def _community_columns(conn: AsyncConnection) -> None:
+    await ops.add_column(conn, "communities", "description", "TEXT NULL")
+    await ops.add_column(conn, "communities", "telegram_url", "VARCHAR NULL", "TEXT NULL")
+    await ops.add_column(conn, "communities", "tags", "TEXT NULL")
+    await ops.add_column(conn, "communities", "is_archived", "BOOLEAN NOT NULL DEFAULT FALSE", "BOOLEAN NOT NULL DEFAULT 0")
+    await ops.add_column(conn, "communities", "logo_media_id", "VARCHAR NULL", "TEXT NULL")
+    await ops.create_index(conn, "ix_communities_logo_media_id", "communities", ["logo_media_id"])
+
+
+@migration(5, "company_columns")
+async def _company_columns(conn: AsyncConnection) -> None:
+    await ops.add_column(conn, "companies", "phone", "VARCHAR NULL", "TEXT NULL")
+    if not await ops.has_unique(conn, "companies", ["phone"]):
+        await ops.create_index(conn, "ix_companies_phone", "companies", ["phone"], unique=True)
+    await ops.add_column(conn, "companies", "owner_user_id", "VARCHAR NULL", "TEXT NULL")
+    await ops.create_index(conn, "ix_companies_owner_user_id", "companies", ["owner_user_id"])
+    await ops.add_column(conn, "companies", "logo_media_id", "VARCHAR NULL", "TEXT NULL")
+    await ops.create_index(conn, "ix_companies_logo_media_id", "companies", ["logo_media_id"])
+    await ops.add_column(conn, "companies", "tags", "TEXT NULL")
+
+
+@migration(6, "user_avatar_and_phone_login")
+async def _user_columns(conn: AsyncConnection) -> None:
+    await ops.add_column(conn, "users", "avatar_media_id", "VARCHAR NULL", "TEXT NULL")
+    await ops.create_index(conn, "ix_users_avatar_media_id", "users", ["avatar_media_id"])
+    # phone is the login identifier
+    if not await ops.has_unique(conn, "users", ["phone"]):
+        await ops.create_index(conn, "uq_users_phone", "users", ["phone"], unique=True)
+
+
+@migration(7, "cases_solutions_count")
+async def _cases_solutions_count(conn: AsyncConnection) -> None:
+    # legacy cases.points was renamed to solutions_count
+    if await ops.rename_column(conn, "cases", "points", "solutions_count"):
+        return
+    await ops.add_column(conn, "cases", "solutions_count", "INTEGER NOT NULL DEFAULT 0")
+
+
+@migration(8, "otps_lookup_index")
+async def _otps_lookup_index(conn: AsyncConnection) -> None:
+    await ops.create_index(conn, "ix_otps_phone_consumed_expires", "otps", ["phone", "consumed", "expires_at"])
+    # the composite index covers lookups by phone alone
+    await conn.execute(text("DROP INDEX IF EXISTS ix_otps_phone"))
+
+
+@migration(9, "story_expiry_and_seen_markers")
+async def _story_expiry(conn: AsyncConnection) -> None:
+    ttl = settings.STORY_TTL_HOURS
+    await ops.add_column(conn, "stories", "expires_at", "TIMESTAMP NULL", "DATETIME NULL")
+    if ops.is_postgres(conn):
+        await conn.execute(text(
+            f"UPDATE stories SET expires_at = created_at + INTERVAL '{ttl} hours' WHERE expires_at IS NULL"
+        ))
+    else:
+        await conn.execute(text(
+            f"UPDATE stories SET expires_at = datetime(created_at, '+{ttl} hours') WHERE expires_at IS NULL"
+        ))
+    await ops.create_index(conn, "ix_stories_expires_at", "stories", ["expires_at"])
+    await ops.create_index(conn, "ix_stories_company_expires", "stories", ["company_id", "expires_at"])
+    # the composite index covers lookups by company alone
+    await conn.execute(text("DROP INDEX IF EXISTS ix_stories_company_id"))
+    await ops.create_tables(conn, "story_seen")
+
+
+@migration(10, "content_seq_and_seen_state")
+async def _content_seq(conn: AsyncConnection) -> None:
+    await ops.add_column(conn, "communities", "last_seq", "INTEGER NOT NULL DEFAULT 0")
+    await ops.add_column(conn, "content", "seq", "INTEGER NULL")
+    await content_seq.number_missing(conn)
+    await ops.create_index(conn, "uq_content_community_seq", "content", ["community_id", "seq"], unique=True)
+    await content_seq.install_trigger(conn)
+    await ops.create_tables(conn, "content_seen")
+
+
+@migration(11, "community_recommendations")
+async def _community_recommendations(conn: AsyncConnection) -> None:
+    await ops.create_tables(conn, "community_recommendations", "community_popularity")
+
+
+@migration(12, "video_pipeline")
+async def _video_pipeline(conn: AsyncConnection) -> None:
+    await ops.add_column(conn, "media", "poster_url", "VARCHAR NULL", "TEXT NULL")
+    await ops.add_column(conn, "media", "stream_url", "VARCHAR NULL", "TEXT NULL")
+    await ops.add_column(conn, "media", "duration", "DOUBLE PRECISION NULL", "REAL NULL")
+    await ops.create_tables(conn, "video_jobs")
+
+
+@migration(13, "job_queue")
+async def _job_queue(conn: AsyncConnection) -> None:
+    await ops.create_tables(conn, "jobs")
+    # unfinished videos of the former video_jobs polling become `video.transcode` jobs
+    rows = (await conn.execute(text(
+        "SELECT media_id FROM video_jobs WHERE status IN ('pending', 'running') "
+        "AND 'video:' || media_id NOT IN (SELECT key FROM jobs WHERE key IS NOT NULL)"
+    ))).all()
+    if rows:
+        await conn.execute(insert(JobModel.__table__), [
+            dict(id=uid(), kind="video.transcode", payload={"media_id": media_id}, key=f"video:{media_id}",
+                 max_attempts=settings.VIDEO_JOB_MAX_ATTEMPTS)
+            for media_id, in rows
+        ])
+    await conn.execute(text("UPDATE video_jobs SET status = 'pending' WHERE status = 'running'"))
+
+
+@migration(14, "event_reminders")
+async def _event_reminders(conn: AsyncConnection) -> None:
+    await ops.create_tables(conn, "event_reminders")
+    # participants of upcoming events joined before reminders existed
+    offsets = sorted({int(m) for m in settings.EVENT_REMINDER_OFFSETS_MINUTES.split(",") if m.strip()})
+    now = datetime.utcnow()
+    rows = (await conn.execute(text(
+        "SELECT ep.user_id, c.id, c.event_date FROM event_participants ep JOIN content c ON c.id = ep.content_id "
+        "WHERE c.type = 'event' AND c.event_date > :now"
+    ), {"now": now})).all()
+    reminders = []
+    for user_id, event_id, event_date in rows:
+        if isinstance(event_date, str):
+            event_date = datetime.fromisoformat(event_date)
+        for m in offsets:
+            fire_at = event_date - timedelta(minutes=m)
+            if fire_at > now:
+                reminders.append(dict(user_id=user_id, event_id=event_id, offset_minutes=m, fire_at=fire_at))
+    await conn.execute(text("DELETE FROM event_reminders"))
+    if reminders:
+        await conn.execute(insert(EventReminderModel.__table__), reminders)
+
+
+@migration(15, "delta_sync_versions")
+async def _delta_sync(conn: AsyncConnection) -> None:
+    await ops.create_tables(conn, "sync_clock", "sync_tombstones")
+    for t in sync_version.SYNCED:
+        await ops.add_column(conn, t.table, "version", "BIGINT NOT NULL DEFAULT 0", "INTEGER NOT NULL DEFAULT 0")
+        await ops.create_index(conn, f"ix_{t.table}_version", t.table, ["version"])
+    await sync_version.stamp_existing(conn)
+    await sync_version.install_triggers(conn)
+
+
+@migration(16, "row_versions")
+async def _row_versions(conn: AsyncConnection) -> None:
+    for table in row_version.VERSIONED:
+        await ops.add_column(conn, table, "version", "INTEGER NOT NULL DEFAULT 0")
+    await row_version.install_triggers(conn)
+
+
+@migration(17, "sync_distinct_versions")
+async def _sync_distinct_versions(conn: AsyncConnection) -> None:
+    await sync_version.split_shared_versions(conn)
+
+
+@migration(18, "otps_expiry_index")
+async def _otps_expiry_index(conn: AsyncConnection) -> None:
+    # purge deletes by expiry; the lookup index leads with phone and cannot serve it
+    await ops.create_index(conn, "ix_otps_expires_at", "otps", ["expires_at"])
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.db import get_session
+from app.core.config import settings
+from app.core.rate_limit import SlidingWindowLimiter, check_and_add
+from app.core.security import PasswordHasherBusy
 from app.infrastructure.repos.otp_repo import OTPRepo
 from app.infrastructure.repos.user_repo import UserRepo
 from app.infrastructure.repos.company_repo import CompanyRepo
@@ -10,16 +15,37 @@ from app.usecases.auth import AuthUseCase
 
 router = APIRouter()
 
+# shared by the student and company flows: one phone is one SMS budget
+_window = settings.OTP_RATE_WINDOW_SECONDS
+otp_request_limits = (
+    SlidingWindowLimiter(settings.OTP_REQUEST_PER_PHONE, _window),
+    SlidingWindowLimiter(settings.OTP_REQUEST_PER_IP, _window),
+)
+otp_verify_limits = (
+    SlidingWindowLimiter(settings.OTP_VERIFY_PER_PHONE, _window),
+    SlidingWindowLimiter(settings.OTP_VERIFY_PER_IP, _window),
+)
+
+
+def _rate_limit(limits: tuple[SlidingWindowLimiter, SlidingWindowLimiter], phone: str, request: Request) -> None:
+    by_phone, by_ip = limits
+    ip = request.client.host if request.client else "unknown"
+    wait = check_and_add((by_phone, phone), (by_ip, ip))
+    if wait > 0:
+        raise HTTPException(status_code=429, detail="Too many requests", headers={"Retry-After": str(math.ceil(wait))})
+
 
 @router.post("/otp/request", status_code=204)
-async def request_otp(data: PhoneIn, session: AsyncSession = Depends(get_session)):
+async def request_otp(data: PhoneIn, request: Request, session: AsyncSession = Depends(get_session)):
+    _rate_limit(otp_request_limits, data.phone, request)
     uc = AuthUseCase(users=UserRepo(session), otps=OTPRepo(session))
     await uc.request_otp(data.phone)
     return None
 
 
 @router.post("/otp/verify", response_model=TokenOut)
-async def verify_otp(data: OTPVerifyIn, session: AsyncSession = Depends(get_session)):
+async def verify_otp(data: OTPVerifyIn, request: Request, session: AsyncSession = Depends(get_session)):
+    _rate_limit(otp_verify_limits, data.phone, request)
     uc = AuthUseCase(users=UserRepo(session), otps=OTPRepo(session), companies=CompanyRepo(session))
     try:
         token = await uc.verify_otp(data.phone, data.code)
@@ -29,14 +55,16 @@ async def verify_otp(data: OTPVerifyIn, session: AsyncSession = Depends(get_sess
 
 
 @router.post("/company/otp/request", status_code=204)
-async def company_request_otp(data: PhoneIn, session: AsyncSession = Depends(get_session)):
+async def company_request_otp(data: PhoneIn, request: Request, session: AsyncSession = Depends(get_session)):
+    _rate_limit(otp_request_limits, data.phone, request)
     uc = AuthUseCase(users=UserRepo(session), otps=OTPRepo(session))
     await uc.request_otp(data.phone)
     return None
 
 
 @router.post("/company/otp/verify", response_model=TokenOut)
-async def company_verify_otp(data: OTPVerifyIn, session: AsyncSession = Depends(get_session)):
+async def company_verify_otp(data: OTPVerifyIn, request: Request, session: AsyncSession = Depends(get_session)):
+    _rate_limit(otp_verify_limits, data.phone, request)
     uc = AuthUseCase(users=UserRepo(session), otps=OTPRepo(session), companies=CompanyRepo(session))
     try:
         token = await uc.company_verify_otp(data.phone, data.code)
@@ -55,6 +83,8 @@ async def admin_signup(data: AdminSignupIn, session: AsyncSession = Depends(get_
         token = await uc.admin_signup(data.email, data.password, data.signup_token)
     except PermissionError:
         raise HTTPException(status_code=403, detail="Forbidden")
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Too busy, retry later", headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     return TokenOut(access_token=token)
@@ -65,6 +95,8 @@ async def admin_login(data: AdminLoginIn, session: AsyncSession = Depends(get_se
     uc = AuthUseCase(users=UserRepo(session), otps=OTPRepo(session))
     try:
         token = await uc.admin_login(data.email, data.password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Too busy, retry later", headers={"Retry-After": "1"})
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid credentials")
     return TokenOut(access_token=token)
@@ -0,0 +1,141 @@
+"""Several GET requests in one round trip (`POST /batch`).
+
+On start the mobile app makes a handful of independent reads; over a slow link each of them
+costs a round trip. A batch runs them in-process against the app itself (same routing,
+middleware, validation and caches as over HTTP), at most BATCH_CONCURRENCY at a time, and
+answers with all results in request order. The caller's token is checked once and the user is
+shared by the sub-requests. Sub-response bodies are embedded as rendered, not parsed again.
+The batch itself holds no DB session; each sub-request has its own, as over HTTP.
+"""
+
+import asyncio
+import logging
+from urllib.parse import unquote
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.adapters.db import async_session
+from app.core.config import settings
+from app.core.deps import BATCH_PRINCIPAL, bearer, get_current_user
+from app.presentation.schemas.batch import BatchIn, BatchOut, BatchRequestIn
+from app.presentation.serialization import dumps
+
+logger = logging.getLogger("app.batch")
+
+router = APIRouter()
+
+# never batched: endless streams, batches of batches
+_UNBATCHABLE = ("/stream", "/batch")
+# request headers a sub-request may set; everything else comes from the batch request
+_FORWARDED = frozenset({"if-none-match", "accept", "accept-language"})
+# sub-response headers passed back
+_RETURNED = ("content-type", "etag", "cache-control", "retry-after")
+# connection-level scope keys a sub-request shares with the batch request
+_INHERITED = ("type", "asgi", "http_version", "scheme", "server", "client", "root_path")
+
+Result = tuple[int, dict[str, str], bytes]
+
+
+def _error(status: int, detail: str) -> Result:
+    return status, {"content-type": "application/json"}, dumps({"detail": detail})
+
+
+def _sub_scope(request: Request, base: dict, sub: BatchRequestIn) -> dict:
+    """ASGI scope of a sub-request; ValueError when `sub.path` cannot be batched."""
+    target = sub.path.split("#", 1)[0]
+    raw_path, _, query = target.partition("?")
+    # checked on the decoded path, which is the one routed ("/%73tream" is "/stream")
+    path = unquote(raw_path)
+    if not path.startswith("/") or path.startswith("//"):
+        raise ValueError("Path must start with a single /")
+    if any(path.rstrip("/") == p or path.startswith(p + "/") for p in _UNBATCHABLE):
+        raise ValueError(f"{path} cannot be batched")
+    headers = list(base["headers"])
+    for name, value in sub.headers.items():
+        if name.lower() in _FORWARDED:
+            headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    return {
+        **base,
+        "method": "GET",
+        "path": path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(request.scope.get("state") or {}),
+    }
+
+
+async def _call(app, scope: dict) -> Result:
+    status, headers, body = None, {}, bytearray()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # a client that stays connected until the response is complete
+        await asyncio.get_running_loop().create_future()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                name = name.decode("latin-1").lower()
+                if name in _RETURNED:
+                    headers[name] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # the app has answered 500 already if it got that far
+        logger.exception("batch sub-request GET %s failed", scope["path"])
+        if status is None:
+            return _error(500, "Internal Server Error")
+    return status or 500, headers, bytes(body)
+
+
+def _render(ids: list[str], results: list[Result]) -> bytes:
+    parts = []
+    for id_, (status, headers, body) in zip(ids, results):
+        is_json = body and headers.get("content-type", "").startswith("application/json")
+        head = dumps({"id": id_, "status": status, "headers": headers})
+        parts.append(head[:-1] + b',"body":' + (body if is_json else b"null") + b"}")
+    return b'{"responses":[' + b",".join(parts) + b"]}"
+
+
+@router.post("", response_model=BatchOut)
+async def batch(data: BatchIn, request: Request, creds: HTTPAuthorizationCredentials | None = Depends(bearer)):
+    """Run up to BATCH_MAX_REQUESTS GET requests; each result carries its own status (a failing
+    sub-request does not fail the batch), in request order."""
+    if len(data.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(413, f"Too many requests (max {settings.BATCH_MAX_REQUESTS})")
+    base = {k: request.scope[k] for k in _INHERITED if k in request.scope}
+    base["headers"] = [(b"host", request.headers.get("host", "").encode("latin-1"))]
+    if creds:
+        # checked once on a short session; a bad token fails the whole batch
+        async with async_session() as s:
+            user = await get_current_user(creds, s)
+        base[BATCH_PRINCIPAL] = (creds.credentials, user)
+        base["headers"].append((b"authorization", request.headers["authorization"].encode("latin-1")))
+
+    gate = asyncio.Semaphore(settings.BATCH_CONCURRENCY)
+
+    async def run(sub: BatchRequestIn) -> Result:
+        try:
+            scope = _sub_scope(request, base, sub)
+        except ValueError as e:
+            return _error(400, str(e))
+        async with gate:
+            try:
+                return await asyncio.wait_for(_call(request.app, scope), settings.BATCH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                return _error(504, "Timeout")
+
+    results = await asyncio.gather(*(run(sub) for sub in data.requests))
+    ids = [sub.id if sub.id is not None else str(i) for i, sub in enumerate(data.requests)]
+    return Response(_render(ids, results), media_type="application/json")
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 import jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.adapters.db import get_session
+from app.adapters.db import commit_hook, get_session
 from app.core.deps import get_current_user, role_required, get_current_company, bearer
 from app.core.config import settings
 from app.infrastructure.repos.community_repo import CommunityRepo
@@ -11,6 +11,7 @@ from app.infrastructure.repos.company_repo import CompanyRepo
 from app.infrastructure.repos.post_repo import PostRepo
 from app.infrastructure.repos.case_repo import CaseRepo
 from app.infrastructure.repos.media_repo import MediaRepo
+from app.infrastructure.repos.version_repo import VersionRepo
 from app.presentation.schemas.communities import (
     CommunityOut,
     CommunityCreateIn,
@@ -20,7 +21,10 @@ from app.presentation.schemas.communities import (
     CommunityMemberOut,
 )
 from app.presentation.schemas.cases import CaseOut, CaseCreateIn
-from app.presentation.schemas.content import PostOut, MediaOut, SkillOut, ContentSphereOut
+from app.presentation.schemas.content import PostOut
+from app.presentation.conditional import etag, not_modified, set_etag
+from app.presentation.fields import Fields, fields_param
+from app.presentation.serialization import FastJSONResponse, community_dict, post_dict
 from app.usecases.communities import CommunityUseCase
 from app.infrastructure.repos.membership_repo import MembershipRepo
 from app.infrastructure.repos.user_repo import UserRepo
@@ -34,6 +38,7 @@ async def list_my_communities(
     session: AsyncSession = Depends(get_session),
     user=Depends(get_current_user),
     creds = Depends(bearer),
+    fields: Fields = Depends(fields_param(CommunityOut)),
 ):
     c_repo = CommunityRepo(session)
     # If company user — return communities of this company
@@ -55,98 +60,58 @@ async def list_my_communities(
         # Regular user — return followed communities
         follow_ids = await FollowRepo(session).list_community_ids_for_user(user.id)
         items = await c_repo.list_by_ids(follow_ids)
-    return [
-        CommunityOut(
-            id=i.id,
-            company_id=i.company_id or "",
-            name=i.name,
-            description=i.description or "",
-            telegram_url=i.telegram_url or "",
-            tags=i.tags,
-            is_archived=bool(i.is_archived),
-            logo_media_id=i.logo_media_id or "",
-        )
-        for i in items
-    ]
+    return FastJSONResponse(fields.project_all(community_dict(i) for i in items))
 
 
 @router.get("/joinable", response_model=list[CommunityOut])
 async def list_joinable_communities(
     offset: int = 0,
     limit: int = 20,
+    fields: Fields = Depends(fields_param(CommunityOut)),
     session: AsyncSession = Depends(get_session),
     user=Depends(get_current_user),
 ):
     repo = CommunityRepo(session)
     items = await repo.list_joinable(user.id, offset=offset, limit=limit)
-    return [
-        CommunityOut(
-            id=i.id,
-            company_id=i.company_id or "",
-            name=i.name,
-            description=i.description or "",
-            telegram_url=i.telegram_url or "",
-            tags=i.tags,
-            is_archived=bool(i.is_archived),
-            logo_media_id=i.logo_media_id or "",
-        )
-        for i in items
-    ]
+    return FastJSONResponse(fields.project_all(community_dict(i) for i in items))
 
 @router.get("/", response_model=list[CommunityOut])
-async def list_communities(session: AsyncSession = Depends(get_session)):
+async def list_communities(fields: Fields = Depends(fields_param(CommunityOut)),
+                           session: AsyncSession = Depends(get_session)):
     repo = CommunityRepo(session)
     items = await repo.list_all()
-    return [
-        CommunityOut(
-            id=i.id,
-            company_id=i.company_id or "",
-            name=i.name,
-            description=i.description or "",
-            telegram_url=i.telegram_url or "",
-            tags=i.tags,
-            is_archived=bool(i.is_archived),
-            logo_media_id=i.logo_media_id or "",
-        )
-        for i in items
-    ]
+    return FastJSONResponse(fields.project_all(community_dict(i) for i in items))
 
 
 @router.get("/by-company/{company_id}", response_model=list[CommunityOut])
-async def list_company_communities(company_id: str, session: AsyncSession = Depends(get_session)):
+async def list_company_communities(company_id: str, fields: Fields = Depends(fields_param(CommunityOut)),
+                                   session: AsyncSession = Depends(get_session)):
     repo = CommunityRepo(session)
     items = await repo.list_for_company(company_id)
     # Compute members count per community
-    ids = [i.id for i in items]
-    counts = await MembershipRepo(session).counts_for_communities(ids)
-    return [
-        CommunityOut(
-            id=i.id,
-            company_id=i.company_id or "",
-            name=i.name,
-            description=i.description or "",
-            telegram_url=i.telegram_url or "",
-            tags=i.tags,
-            is_archived=bool(i.is_archived),
-            logo_media_id=i.logo_media_id or "",
-            members_count=int(counts.get(i.id, 0) or 0),
-        )
-        for i in items
-    ]
+    counts: dict[str, int] = {}
+    if "members_count" in fields:
+        counts = await MembershipRepo(session).counts_for_communities([i.id for i in items])
+    return FastJSONResponse(fields.project_all(community_dict(i, counts.get(i.id)) for i in items))
 
 
 @router.get("/{community_id}", response_model=CommunityDetailOut)
-async def get_community_detail(community_id: str, session: AsyncSession = Depends(get_session)):
+async def get_community_detail(community_id: str, request: Request,
+                               fields: Fields = Depends(fields_param(CommunityDetailOut)),
+                               session: AsyncSession = Depends(get_session)):
+    tag = etag("community_detail" + fields.key, await VersionRepo(session).community_detail(community_id))
+    if (cached := not_modified(request, tag)) is not None:
+        return cached
     c_repo = CommunityRepo(session)
     community = await c_repo.get(community_id)
     if not community:
         raise HTTPException(404, "Not found")
 
     # Cases
-    cases = await CaseRepo(session).list_for_community(community_id)
+    cases = await CaseRepo(session).list_for_community(community_id) if "cases" in fields else []
 
     # Members
-    member_ids = await MembershipRepo(session).list_user_ids_for_community(community_id)
+    member_ids = await MembershipRepo(session).list_user_ids_for_community(community_id) if "members" in fields else []
     users: list = []
     if member_ids:
         urepo = UserRepo(session)
@@ -158,7 +123,7 @@ async def get_community_detail(community_id: str, session: AsyncSession = Depend
             prof = await prepo.get_by_user_id(u.id)
             users.append((u, prof.full_name if prof else None))
 
-    return CommunityDetailOut(
+    out = CommunityDetailOut(
         id=community.id,
         company_id=community.company_id or "",
         name=community.name,
@@ -190,6 +155,7 @@ async def get_community_detail(community_id: str, session: AsyncSession = Depend
             for (u, full_name) in users
         ],
     )
+    return set_etag(FastJSONResponse(fields.project(out.model_dump(mode="json"))), tag)
 
 
 @router.post("/", response_model=CommunityOut)
@@ -198,7 +164,8 @@ async def create_community(
     session: AsyncSession = Depends(get_session),
     company=Depends(get_current_company),
 ):
-    uc = CommunityUseCase(communities=CommunityRepo(session), members=None, follows=FollowRepo(session))
+    uc = CommunityUseCase(communities=CommunityRepo(session), members=None, follows=FollowRepo(session),
+                          on_commit=commit_hook(session))
     c = await uc.create(
         name=data.name,
         company_id=company.id,
@@ -221,7 +188,8 @@ async def create_community(
 
 @router.patch("/{community_id}", response_model=CommunityOut, dependencies=[Depends(role_required("company"))])
 async def update_community(community_id: str, data: CommunityUpdateIn, session: AsyncSession = Depends(get_session)):
-    uc = CommunityUseCase(communities=CommunityRepo(session), members=None, follows=FollowRepo(session))
+    uc = CommunityUseCase(communities=CommunityRepo(session), members=None, follows=FollowRepo(session),
+                          on_commit=commit_hook(session))
     c = await uc.update(community_id, **data.model_dump(exclude_unset=True))
     if not c:
         raise HTTPException(404, "Not found")
@@ -256,45 +224,19 @@ async def list_community_posts(
     community_id: str,
     offset: int = 0,
     limit: int = 20,
+    fields: Fields = Depends(fields_param(PostOut)),
     session: AsyncSession = Depends(get_session),
 ):
     posts = await PostRepo(session).list_for_community(community_id, offset=offset, limit=limit)
     media_repo = MediaRepo(session)
-
-    def _media_to_out(m) -> MediaOut:
-        kind = m.kind.value if hasattr(m.kind, "value") else m.kind
-        return MediaOut(id=m.id, kind=kind, mime=m.mime, ext=m.ext, size=m.size, url=m.url)
-
-    result: list[PostOut] = []
+    result: list[dict] = []
     for p in posts:
-        media = await media_repo.list_for_content(p.id)
+        # relations are loaded only when requested
+        media = await media_repo.list_for_content(p.id) if "media" in fields else []
         # load skills with sphere colors
-        skills = await PostRepo(session).list_skills_for_post(p.id)
-        def _skill_to_out(s) -> SkillOut:
-            sp = getattr(s, "sphere", None)
-            return SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(ContentSphereOut(
-                    id=sp.id,
-                    title=sp.title,
-                    background_color=sp.background_color,
-                    text_color=sp.text_color,
-                ) if sp else None),
-            )
-        result.append(PostOut(
-            id=p.id,
-            community_id=p.community_id,
-            title=p.title,
-            body=p.body,
-            media=[_media_to_out(m) for m in media],
-            tags=p.tags,
-            skills=[_skill_to_out(s) for s in skills],
-            cost=p.cost,
-            participant_payout=p.participant_payout,
-        ))
-    return result
+        skills = await PostRepo(session).list_skills_for_post(p.id) if "skills" in fields else []
+        result.append(post_dict(p, media, skills))
+    return FastJSONResponse(fields.project_all(result))
 
 
 @router.post("/{community_id}/cases", response_model=CaseOut, dependencies=[Depends(role_required("company"))])
@@ -1,140 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.adapters.db import get_session
+from app.adapters.db import commit_hook, get_session
 from app.core.deps import get_current_user, role_required, get_current_company
 from app.infrastructure.repos.company_repo import CompanyRepo
-from app.infrastructure.repos.community_repo import CommunityRepo
 from app.infrastructure.repos.company_follow_repo import CompanyFollowRepo
-from app.infrastructure.repos.membership_repo import MembershipRepo
 from app.infrastructure.repos.media_repo import MediaRepo
+from app.infrastructure.repos.version_repo import VersionRepo
+from app.presentation.conditional import etag, not_modified, set_etag
+from app.presentation.fields import Fields, fields_param
 from app.presentation.schemas.companies import CompanyOut, CompanyUpdateIn, CompanyDetailOut
-from app.presentation.schemas.content import MediaOut, SkillOut, ContentSphereOut
-from app.infrastructure.repos.sql_models import SkillModel, SphereModel
-from sqlalchemy import select
-from app.presentation.schemas.communities import CommunityOut
-from app.usecases.companies import CompanyUseCase
+from app.presentation.serialization import FastJSONResponse, company_detail_dict, company_dict
+from app.usecases.companies import CompanyReadModel, CompanyUseCase
 
 router = APIRouter()
 
 
-async def _skills_from_tag_ids(session: AsyncSession, tag_ids: list[str]) -> list[SkillOut]:
-    if not tag_ids:
-        return []
-    res = await session.execute(select(SkillModel).where(SkillModel.id.in_(tag_ids)))
-    skill_models = res.scalars().all()
-    sphere_ids = list({m.sphere_id for m in skill_models})
-    spheres_map = {}
-    if sphere_ids:
-        sp_res = await session.execute(select(SphereModel).where(SphereModel.id.in_(sphere_ids)))
-        spheres_map = {sp.id: sp for sp in sp_res.scalars().all()}
-    by_id = {m.id: m for m in skill_models}
-    out: list[SkillOut] = []
-    for sid in tag_ids:
-        m = by_id.get(sid)
-        if not m:
-            continue
-        sp = spheres_map.get(m.sphere_id)
-        out.append(SkillOut(
-            id=m.id,
-            title=m.title,
-            sphere_id=m.sphere_id,
-            sphere=(ContentSphereOut(id=sp.id, title=sp.title, background_color=sp.background_color, text_color=sp.text_color) if sp else None),
-        ))
-    return out
+async def _with_skills(session: AsyncSession, companies, fields: Fields) -> list[dict]:
+    # skills are the only relation of CompanyOut; resolved only when requested
+    skills = await CompanyReadModel(session).skills_for(companies) if "skills" in fields else {}
+    return [company_dict(c, skills.get(c.id, ())) for c in companies]
 
 
 @router.get("/", response_model=list[CompanyOut])
-async def list_companies(session: AsyncSession = Depends(get_session)):
-    repo = CompanyRepo(session)
-    companies = await repo.list_all()
-    out: list[CompanyOut] = []
-    for c in companies:
-        skills = await _skills_from_tag_ids(session, c.tags)
-        out.append(CompanyOut(id=c.id, name=c.name, description=c.description or "", logo_media_id=c.logo_media_id or "", skills=skills))
-    return out
+async def list_companies(fields: Fields = Depends(fields_param(CompanyOut)), session: AsyncSession = Depends(get_session)):
+    companies = await CompanyRepo(session).list_all()
+    return FastJSONResponse(fields.project_all(await _with_skills(session, companies, fields)))
 
 
 @router.get("/me", response_model=CompanyDetailOut, dependencies=[Depends(role_required("company"))])
 async def get_my_company(session: AsyncSession = Depends(get_session), company=Depends(get_current_company)):
-    # Build the same detailed payload as for GET /companies/{company_id}
-    comm_repo = CommunityRepo(session)
-    communities = await comm_repo.list_for_company(company.id)
-    counts = await MembershipRepo(session).counts_for_communities([c.id for c in communities])
-    media_repo = MediaRepo(session)
-    media = await media_repo.list_for_company(company.id)
-
-    return CompanyDetailOut(
-        id=company.id,
-        name=company.name,
-        description=company.description or "",
-        logo_media_id=company.logo_media_id or "",
-        skills=await _skills_from_tag_ids(session, company.tags),
-        media=[MediaOut(id=m.id, kind=m.kind.value if hasattr(m.kind, "value") else m.kind, mime=m.mime, ext=m.ext, size=m.size, url=m.url) for m in media],
-        communities=[
-            CommunityOut(
-                id=i.id,
-                company_id=i.company_id or "",
-                name=i.name,
-                description=i.description or "",
-                telegram_url=i.telegram_url or "",
-                tags=i.tags,
-                is_archived=bool(i.is_archived),
-                logo_media_id=i.logo_media_id or "",
-                members_count=int(counts.get(i.id, 0) or 0),
-            )
-            for i in communities
-        ],
-    )
+    # Same detailed payload as for GET /companies/{company_id}; the version keeps another
+    # worker's cached page from outliving an edit made through this one
+    versions = await VersionRepo(session).company_detail(company.id)
+    detail = await CompanyReadModel(session).detail(company.id, version=etag("company_detail", versions))
+    if not detail:
+        raise HTTPException(404, "Not found")
+    return FastJSONResponse(company_detail_dict(detail))
 
 
 @router.get("/{company_id}", response_model=CompanyDetailOut)
-async def get_company(company_id: str, session: AsyncSession = Depends(get_session)):
-    c_repo = CompanyRepo(session)
-    company = await c_repo.get(company_id)
-    if not company:
+async def get_company(company_id: str, request: Request, fields: Fields = Depends(fields_param(CompanyDetailOut)),
+                      session: AsyncSession = Depends(get_session)):
+    versions = await VersionRepo(session).company_detail(company_id)
+    tag = etag("company_detail" + fields.key, versions)
+    if (cached := not_modified(request, tag)) is not None:
+        return cached
+    # the page comes from the detail cache (one entry for all selections), a selection only trims it
+    detail = await CompanyReadModel(session).detail(company_id, version=etag("company_detail", versions))
+    if not detail:
         raise HTTPException(404, "Not found")
-
-    comm_repo = CommunityRepo(session)
-    communities = await comm_repo.list_for_company(company_id)
-    counts = await MembershipRepo(session).counts_for_communities([c.id for c in communities])
-    media_repo = MediaRepo(session)
-    media = await media_repo.list_for_company(company_id)
-
-    return CompanyDetailOut(
-        id=company.id,
-        name=company.name,
-        description=company.description or "",
-        logo_media_id=company.logo_media_id or "",
-        skills=await _skills_from_tag_ids(session, company.tags),
-        media=[MediaOut(id=m.id, kind=m.kind.value if hasattr(m.kind, "value") else m.kind, mime=m.mime, ext=m.ext, size=m.size, url=m.url) for m in media],
-        communities=[
-            CommunityOut(
-                id=i.id,
-                company_id=i.company_id or "",
-                name=i.name,
-                description=i.description or "",
-                telegram_url=i.telegram_url or "",
-                tags=i.tags,
-                is_archived=bool(i.is_archived),
-                logo_media_id=i.logo_media_id or "",
-                members_count=int(counts.get(i.id, 0) or 0),
-            )
-            for i in communities
-        ],
-    )
-
+    return set_etag(FastJSONResponse(fields.project(company_detail_dict(detail))), tag)
 
 
 @router.get("/me/followed", response_model=list[CompanyOut])
-async def my_followed_companies(session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+async def my_followed_companies(fields: Fields = Depends(fields_param(CompanyOut)),
+                               session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
     uc = CompanyUseCase(companies=CompanyRepo(session), company_follows=CompanyFollowRepo(session))
     companies = await uc.list_followed(user.id)
-    out: list[CompanyOut] = []
-    for c in companies:
-        skills = await _skills_from_tag_ids(session, c.tags)
-        out.append(CompanyOut(id=c.id, name=c.name, description=c.description or "", logo_media_id=c.logo_media_id or "", skills=skills))
-    return out
+    return FastJSONResponse(fields.project_all(await _with_skills(session, companies, fields)))
 
 
 @router.post("/{company_id}/follow")
@@ -157,11 +81,7 @@ async def update_my_company(
     session: AsyncSession = Depends(get_session),
     company=Depends(get_current_company),
 ):
-    payload = data.model_dump(exclude_unset=True)
-    media_uids = payload.pop("media_uids", None)
-    uc = CompanyUseCase(companies=CompanyRepo(session))
-    c = await uc.update(company.id, **payload)
-    if media_uids is not None:
-        await MediaRepo(session).replace_for_company(company.id, media_uids)
-    skills = await _skills_from_tag_ids(session, c.tags)
-    return CompanyOut(id=c.id, name=c.name, description=c.description, logo_media_id=c.logo_media_id, skills=skills)
+    uc = CompanyUseCase(companies=CompanyRepo(session), media=MediaRepo(session), on_commit=commit_hook(session))
+    c = await uc.update(company.id, **data.model_dump(exclude_unset=True))
+    skills = await CompanyReadModel(session).skills_for([c])
+    return FastJSONResponse(company_dict(c, skills[c.id]))
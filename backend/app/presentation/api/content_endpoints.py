@@ -1,79 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.adapters.db import get_session
-from app.core.deps import get_current_user, role_required
+from app.core.config import settings
+from app.core.deps import get_current_user, get_optional_user, role_required
 from app.infrastructure.repos.media_repo import MediaRepo
 from app.infrastructure.repos.post_repo import PostRepo  # реализуй как прежде
+from app.infrastructure.repos.seen_repo import SeenRepo
 from app.infrastructure.repos.story_repo import StoryRepo  # реализуй как прежде
 from app.infrastructure.repos.company_follow_repo import CompanyFollowRepo
+from app.infrastructure.repos.content_bulk_repo import ContentBulkRepo
 from app.infrastructure.repos.sql_models import ContentModel
-from app.presentation.schemas.content import PostCreateIn, PostUpdateIn, PostOut, StoryCreateIn, StoryOut, MediaOut, SkillOut, ContentItemOut, ContentSphereOut
+from app.infrastructure.repos.version_repo import VersionRepo
+from app.presentation.conditional import etag, not_modified, set_etag
+from app.presentation.fields import Fields, fields_param
+from app.presentation.schemas.content import PostCreateIn, PostUpdateIn, PostOut, StoryCreateIn, StoryOut, StoryRingOut, MediaOut, SkillOut, ContentItemOut, ContentSphereOut
+from app.presentation.schemas.content import SeenIn, SeenRecordedOut, UnreadOut
+from app.presentation.schemas.content import PostBulkCreateIn, BulkCreateOut, BulkCreatedOut, BulkErrorOut, split_bulk_items
+from app.presentation.serialization import FastJSONResponse, content_item_dict, post_dict, story_ring_dict
+from app.usecases.bulk_content import BulkContentUseCase
 from app.usecases.content import ContentUseCase
+from app.usecases.seen import SeenUseCase
 
 router = APIRouter()
 
 
 def _media_to_out(m) -> MediaOut:
     return MediaOut(id=m.id, kind=m.kind.value if hasattr(m.kind, "value") else m.kind, mime=m.mime, ext=m.ext,
-                    size=m.size, url=m.url)
+                    size=m.size, url=m.url, poster_url=getattr(m, "poster_url", None),
+                    stream_url=getattr(m, "stream_url", None), duration=getattr(m, "duration", None))
 
 
-@router.get("/posts", response_model=list[ContentItemOut])
-async def list_posts(offset: int = 0, limit: int = 20, session: AsyncSession = Depends(get_session)):
-    """Unified feed: posts + events, sorted by created_at desc."""
-    media_repo = MediaRepo(session)
-    stmt = (
-        select(ContentModel)
-        .order_by(ContentModel.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    res = await session.execute(stmt)
-    items = res.scalars().all()
-    result: list[ContentItemOut] = []
-    for c in items:
-        media = await media_repo.list_for_content(c.id)
-        if not media and getattr(c, "media_id", None):
-            m = await media_repo.get(c.media_id)
+async def _relations(session: AsyncSession, item, fields: Fields, legacy_media: bool = False) -> tuple[list, list]:
+    """Media and skills of a post or event, each queried only when the response includes it."""
+    media: list = []
+    if "media" in fields:
+        media_repo = MediaRepo(session)
+        media = list(await media_repo.list_for_content(item.id))
+        # Fallback: if no content_media links, try legacy single media_id field
+        if legacy_media and not media and getattr(item, "media_id", None):
+            m = await media_repo.get(item.media_id)
             if m:
                 media = [m]
-        body = c.body if c.type == "post" else (c.description or None)
-        # tags parsing from comma-separated string
-        tags = [t.strip() for t in (c.tags or "").split(",") if t.strip()]
-        # skills via PostRepo utility (content_id works for both types)
-        skills = await PostRepo(session).list_skills_for_post(c.id)
-        def _skill_to_out(s) -> SkillOut:
-            sp = getattr(s, "sphere", None)
-            return SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(
-                    ContentSphereOut(
-                        id=sp.id,
-                        title=sp.title,
-                        background_color=sp.background_color,
-                        text_color=sp.text_color,
-                    ) if sp else None
-                ),
-            )
-
-        result.append(ContentItemOut(
-            id=c.id,
-            community_id=c.community_id,
-            type=c.type,
-            title=c.title,
-            body=body,
-            event_date=c.event_date,
-            media=[_media_to_out(m) for m in media],
-            tags=tags,
-            skills=[_skill_to_out(s) for s in skills],
-            cost=c.cost,
-            participant_payout=c.participant_payout,
-        ))
-    return result
+    # skills via PostRepo utility (content_id works for both types)
+    skills = await PostRepo(session).list_skills_for_post(item.id) if "skills" in fields else []
+    return media, skills
+
+
+@router.get("/posts", response_model=list[ContentItemOut])
+async def list_posts(offset: int = 0, limit: int = 20, unseen_only: bool = False,
+                     fields: Fields = Depends(fields_param(ContentItemOut)),
+                     session: AsyncSession = Depends(get_session), user=Depends(get_optional_user)):
+    """Unified feed: posts + events, sorted by created_at desc. `unseen_only` (auth) skips items the user has seen."""
+    stmt = select(ContentModel).order_by(ContentModel.created_at.desc())
+    if unseen_only:
+        if user is None:
+            raise HTTPException(401, "Not authenticated")
+        items = await SeenRepo(session).select_unseen(stmt, user.id, offset=offset, limit=limit)
+    else:
+        res = await session.execute(stmt.offset(offset).limit(limit))
+        items = res.scalars().all()
+    result: list[dict] = []
+    for c in items:
+        media, skills = await _relations(session, c, fields, legacy_media=True)
+        result.append(content_item_dict(c, media, skills))
+    return FastJSONResponse(fields.project_all(result))
 
 
 @router.post("/posts", response_model=PostOut)
@@ -119,6 +111,21 @@ async def create_post(data: PostCreateIn, session: AsyncSession = Depends(get_se
     )
 
 
+@router.post("/posts/bulk", response_model=BulkCreateOut)
+async def bulk_create_posts(data: PostBulkCreateIn, session: AsyncSession = Depends(get_session),
+                            user=Depends(role_required("company"))):
+    """Create up to BULK_CREATE_MAX_ITEMS posts at once; invalid items are reported, not fatal."""
+    if len(data.items) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(413, f"Too many items (max {settings.BULK_CREATE_MAX_ITEMS})")
+    valid, errors = split_bulk_items(data.items, PostCreateIn)
+    created, ref_errors = await BulkContentUseCase(ContentBulkRepo(session)).create_posts(valid)
+    errors.extend(BulkErrorOut(index=i, detail=d) for i, d in ref_errors)
+    return BulkCreateOut(
+        created=[BulkCreatedOut(index=i, id=cid) for i, cid in created],
+        errors=sorted(errors, key=lambda e: e.index),
+    )
+
+
 @router.patch("/posts/{post_id}", response_model=PostOut)
 async def update_post(post_id: str, data: PostUpdateIn, session: AsyncSession = Depends(get_session),
                       user=Depends(role_required("company"))):
@@ -154,52 +161,18 @@ async def update_post(post_id: str, data: PostUpdateIn, session: AsyncSession =
 
 
 @router.get("/posts/{post_id}", response_model=ContentItemOut)
-async def get_post(post_id: str, session: AsyncSession = Depends(get_session)):
+async def get_post(post_id: str, request: Request, fields: Fields = Depends(fields_param(ContentItemOut)),
+                   session: AsyncSession = Depends(get_session)):
+    tag = etag("content_item" + fields.key, await VersionRepo(session).content_item(post_id))
+    if (cached := not_modified(request, tag)) is not None:
+        return cached
     # Load raw content row to preserve type-specific fields (event_date, description)
     row = (await session.execute(select(ContentModel).where(ContentModel.id == post_id))).scalar_one_or_none()
     if not row:
         raise HTTPException(404, "Not found")
-    media_repo = MediaRepo(session)
-    media = await media_repo.list_for_content(row.id)
-    # Fallback: if no content_media links, try legacy single media_id field
-    if not media and getattr(row, "media_id", None):
-        m = await media_repo.get(row.media_id)
-        if m:
-            media = [m]
-    # Build skills enriched with sphere (same as list)
-    skills = await PostRepo(session).list_skills_for_post(row.id)
-    def _skill_to_out(s) -> SkillOut:
-        sp = getattr(s, "sphere", None)
-        return SkillOut(
-            id=s.id,
-            title=s.title,
-            sphere_id=s.sphere_id,
-            sphere=(
-                ContentSphereOut(
-                    id=sp.id,
-                    title=sp.title,
-                    background_color=sp.background_color,
-                    text_color=sp.text_color,
-                ) if sp else None
-            ),
-        )
-    # Unify body/event fields with list endpoint behavior
-    body = row.body if row.type == "post" else (row.description or None)
-    # Parse tags from comma-separated string for consistency
-    tags = [t.strip() for t in (row.tags or "").split(",") if t.strip()]
-    return ContentItemOut(
-        id=row.id,
-        community_id=row.community_id,
-        type=row.type,
-        title=row.title,
-        body=body,
-        event_date=row.event_date,
-        media=[_media_to_out(m) for m in media],
-        tags=tags,
-        skills=[_skill_to_out(s) for s in skills],
-        cost=row.cost,
-        participant_payout=row.participant_payout,
-    )
+    media, skills = await _relations(session, row, fields, legacy_media=True)
+    # same shape as the feed items
+    return set_etag(FastJSONResponse(fields.project(content_item_dict(row, media, skills))), tag)
 
 
 @router.post("/stories", response_model=StoryOut)
@@ -211,7 +184,7 @@ async def create_story(data: StoryCreateIn, session: AsyncSession = Depends(get_
     except ValueError:
         raise HTTPException(400, "Media not found")
     m = await MediaRepo(session).get(story.media_id) if getattr(story, "media_id", None) else None
-    return StoryOut(id=story.id, community_id=story.community_id, title=story.title, media_url=story.media_url,
+    return StoryOut(id=story.id, community_id=story.company_id, title=story.title, media_url=story.media_url,
                     media=_media_to_out(m) if m else None)
 
 
@@ -221,118 +194,57 @@ async def get_story(story_id: str, session: AsyncSession = Depends(get_session))
     story, m = await uc.get_story_full(story_id)
     if not story:
         raise HTTPException(404, "Not found")
-    return StoryOut(id=story.id, community_id=story.community_id, title=story.title, media_url=story.media_url,
+    return StoryOut(id=story.id, community_id=story.company_id, title=story.title, media_url=story.media_url,
                     media=_media_to_out(m) if m else None)
 
 
+@router.post("/stories/{story_id}/seen", status_code=204)
+async def mark_story_seen(story_id: str, session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+    """Mark the story and everything older in its company's ring as seen."""
+    uc = ContentUseCase(posts=PostRepo(session), stories=StoryRepo(session), media=MediaRepo(session))
+    try:
+        await uc.mark_story_seen(user.id, story_id)
+    except ValueError:
+        raise HTTPException(404, "Not found")
+    return None
+
+
 @router.get("/users/{user_id}/posts/featured", response_model=list[PostOut])
-async def list_user_featured_posts(user_id: str, limit: int = 20, session: AsyncSession = Depends(get_session)):
+async def list_user_featured_posts(user_id: str, limit: int = 20, fields: Fields = Depends(fields_param(PostOut)),
+                                   session: AsyncSession = Depends(get_session)):
     uc = ContentUseCase(posts=PostRepo(session), stories=StoryRepo(session), media=MediaRepo(session))
     posts = await uc.featured_posts_for_user(user_id=user_id, limit=limit)
-    out: list[PostOut] = []
+    out: list[dict] = []
     for p in posts:
-        media = await MediaRepo(session).list_for_content(p.id)
-        skills = await PostRepo(session).list_skills_for_post(p.id)
-        def _skill_to_out(s) -> SkillOut:
-            sp = getattr(s, "sphere", None)
-            return SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(
-                    ContentSphereOut(
-                        id=sp.id,
-                        title=sp.title,
-                        background_color=sp.background_color,
-                        text_color=sp.text_color,
-                    ) if sp else None
-                ),
-            )
-
-        out.append(PostOut(
-            id=p.id, community_id=p.community_id,
-            title=p.title, body=p.body,
-            media=[_media_to_out(m) for m in media],
-            tags=p.tags,
-            skills=[_skill_to_out(s) for s in skills],
-            cost=p.cost,
-            participant_payout=p.participant_payout,
-        ))
-    return out
+        media, skills = await _relations(session, p, fields)
+        out.append(post_dict(p, media, skills))
+    return FastJSONResponse(fields.project_all(out))
 
 
 @router.get("/me/posts/featured", response_model=list[PostOut])
-async def list_my_featured_posts(limit: int = 20, session: AsyncSession = Depends(get_session),
-                                 user=Depends(get_current_user)):
+async def list_my_featured_posts(limit: int = 20, fields: Fields = Depends(fields_param(PostOut)),
+                                 session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
     uc = ContentUseCase(posts=PostRepo(session), stories=StoryRepo(session), media=MediaRepo(session))
     posts = await uc.featured_posts_for_user(user_id=user.id, limit=limit)
-    out: list[PostOut] = []
+    out: list[dict] = []
     for p in posts:
-        media = await MediaRepo(session).list_for_content(p.id)
-        skills = await PostRepo(session).list_skills_for_post(p.id)
-        def _skill_to_out(s) -> SkillOut:
-            sp = getattr(s, "sphere", None)
-            return SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(
-                    ContentSphereOut(
-                        id=sp.id,
-                        title=sp.title,
-                        background_color=sp.background_color,
-                        text_color=sp.text_color,
-                    ) if sp else None
-                ),
-            )
-
-        out.append(PostOut(
-            id=p.id, community_id=p.community_id,
-            title=p.title, body=p.body,
-            media=[_media_to_out(m) for m in media],
-            tags=p.tags,
-            skills=[_skill_to_out(s) for s in skills],
-            cost=p.cost,
-            participant_payout=p.participant_payout,
-        ))
-    return out
+        media, skills = await _relations(session, p, fields)
+        out.append(post_dict(p, media, skills))
+    return FastJSONResponse(fields.project_all(out))
 
 
 @router.get("/me/posts/from-followed-communities", response_model=list[PostOut])
-async def posts_from_followed_communities(limit: int = 20, session: AsyncSession = Depends(get_session),
+async def posts_from_followed_communities(limit: int = 20, unseen_only: bool = False,
+                                          fields: Fields = Depends(fields_param(PostOut)),
+                                          session: AsyncSession = Depends(get_session),
                                           user=Depends(get_current_user)):
     uc = ContentUseCase(posts=PostRepo(session), stories=StoryRepo(session), media=MediaRepo(session))
-    posts = await uc.posts_from_followed_communities(user_id=user.id, limit=limit)
-    out: list[PostOut] = []
+    posts = await uc.posts_from_followed_communities(user_id=user.id, limit=limit, unseen_only=unseen_only)
+    out: list[dict] = []
     for p in posts:
-        media = await MediaRepo(session).list_for_content(p.id)
-        skills = await PostRepo(session).list_skills_for_post(p.id)
-        def _skill_to_out(s) -> SkillOut:
-            sp = getattr(s, "sphere", None)
-            return SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(
-                    ContentSphereOut(
-                        id=sp.id,
-                        title=sp.title,
-                        background_color=sp.background_color,
-                        text_color=sp.text_color,
-                    ) if sp else None
-                ),
-            )
-
-        out.append(PostOut(
-            id=p.id, community_id=p.community_id,
-            title=p.title, body=p.body,
-            media=[_media_to_out(m) for m in media],
-            tags=p.tags,
-            skills=[_skill_to_out(s) for s in skills],
-            cost=p.cost,
-            participant_payout=p.participant_payout,
-        ))
-    return out
+        media, skills = await _relations(session, p, fields)
+        out.append(post_dict(p, media, skills))
+    return FastJSONResponse(fields.project_all(out))
 
 
 @router.get("/me/stories/from-followed-companies", response_model=list[StoryOut])
@@ -346,3 +258,42 @@ async def stories_from_followed_companies(limit: int = 20, session: AsyncSession
         StoryOut(id=s.id, community_id=s.company_id, title=s.title, media_url=s.media_url, media=None)
         for s in stories
     ]
+
+
+@router.get("/me/stories/rings", response_model=list[StoryRingOut])
+async def story_rings(limit: int = 20, per_ring: int = 20, session: AsyncSession = Depends(get_session),
+                      user=Depends(get_current_user)):
+    """Followed companies with live stories: rings with unseen stories first, then by latest story."""
+    uc = ContentUseCase(posts=PostRepo(session), stories=StoryRepo(session), media=MediaRepo(session))
+    rings = await uc.story_rings(user.id, limit=min(limit, 100), per_ring=min(per_ring, 100))
+    return FastJSONResponse([story_ring_dict(r) for r in rings])
+
+
+@router.post("/me/seen", response_model=SeenRecordedOut)
+async def record_seen(data: SeenIn, session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+    """Batched impressions: mark feed items (posts/events) as seen. Unknown ids are ignored."""
+    uc = SeenUseCase(SeenRepo(session))
+    try:
+        recorded = await uc.record_impressions(user.id, data.content_ids)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return SeenRecordedOut(recorded=recorded)
+
+
+@router.post("/me/communities/{community_id}/read", status_code=204)
+async def mark_community_read(community_id: str, session: AsyncSession = Depends(get_session),
+                              user=Depends(get_current_user)):
+    uc = SeenUseCase(SeenRepo(session))
+    try:
+        await uc.mark_community_read(user.id, community_id)
+    except ValueError:
+        raise HTTPException(404, "Community not found")
+    return None
+
+
+@router.get("/me/unread", response_model=list[UnreadOut])
+async def unread_counts(session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+    """Unseen items per followed or joined community."""
+    uc = SeenUseCase(SeenRepo(session))
+    counts = await uc.unread_counts(user.id)
+    return FastJSONResponse([{"community_id": cid, "unread": n} for cid, n in counts])
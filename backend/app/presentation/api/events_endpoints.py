@@ -1,106 +1,49 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.adapters.db import get_session
+from app.adapters.db import commit_hook, get_session
+from app.core.config import settings
 from app.core.deps import get_current_user, role_required
 from app.infrastructure.repos.event_repo import EventRepo
 from app.infrastructure.repos.post_repo import PostRepo
-from app.presentation.schemas.events import EventOut, EventCreateIn
-from app.presentation.schemas.content import SkillOut, ContentSphereOut
+from app.infrastructure.repos.reminder_repo import ReminderRepo
+from app.infrastructure.repos.content_bulk_repo import ContentBulkRepo
+from app.presentation.schemas.events import EventOut, EventCreateIn, EventUpdateIn, EventBulkCreateIn
+from app.presentation.schemas.content import SkillOut, ContentSphereOut, BulkCreateOut, BulkCreatedOut, BulkErrorOut, split_bulk_items
+from app.presentation.fields import Fields, fields_param
+from app.presentation.serialization import FastJSONResponse, event_dict
+from app.usecases.bulk_content import BulkContentUseCase
 from app.usecases.events import EventsUseCase
 
 router = APIRouter()
 
 
+async def _skills(session: AsyncSession, event, fields: Fields) -> list:
+    # the only relation of EventOut; skipped unless requested
+    return await PostRepo(session).list_skills_for_post(event.id) if "skills" in fields else []
+
+
 @router.get("/upcoming", response_model=list[EventOut])
-async def list_upcoming(limit: int = 20, session: AsyncSession = Depends(get_session)):
+async def list_upcoming(limit: int = 20, fields: Fields = Depends(fields_param(EventOut)),
+                        session: AsyncSession = Depends(get_session)):
     """Public: list all upcoming events across communities."""
     uc = EventsUseCase(events=EventRepo(session))
     events = await uc.upcoming_all(limit=limit)
-    async def _skill_outs(content_id: str) -> list[SkillOut]:
-        skills = await PostRepo(session).list_skills_for_post(content_id)
-        out: list[SkillOut] = []
-        for s in skills:
-            sp = getattr(s, "sphere", None)
-            out.append(SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(ContentSphereOut(
-                    id=sp.id,
-                    title=sp.title,
-                    background_color=sp.background_color,
-                    text_color=sp.text_color,
-                ) if sp else None),
-            ))
-        return out
-    return [
-        EventOut(
-            id=e.id,
-            community_id=e.community_id,
-            title=e.title,
-            event_date=e.event_date,
-            city=e.city,
-            location=e.location,
-            description=e.description,
-            registration=e.registration,
-            format=e.format,
-            media_id=e.media_id,
-            tags=e.tags,
-            skills=await _skill_outs(e.id),
-            cost=e.cost,
-            participant_payout=e.participant_payout,
-        )
-        for e in events
-    ]
+    return FastJSONResponse(fields.project_all([event_dict(e, await _skills(session, e, fields)) for e in events]))
 
 
 @router.get("/my/upcoming", response_model=list[EventOut])
-async def list_my_upcoming(limit: int = 20, session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+async def list_my_upcoming(limit: int = 20, fields: Fields = Depends(fields_param(EventOut)),
+                           session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
     uc = EventsUseCase(events=EventRepo(session))
     events = await uc.my_upcoming(user.id, limit=limit)
-    async def _skill_outs(content_id: str) -> list[SkillOut]:
-        skills = await PostRepo(session).list_skills_for_post(content_id)
-        out: list[SkillOut] = []
-        for s in skills:
-            sp = getattr(s, "sphere", None)
-            out.append(SkillOut(
-                id=s.id,
-                title=s.title,
-                sphere_id=s.sphere_id,
-                sphere=(ContentSphereOut(
-                    id=sp.id,
-                    title=sp.title,
-                    background_color=sp.background_color,
-                    text_color=sp.text_color,
-                ) if sp else None),
-            ))
-        return out
-    return [
-        EventOut(
-            id=e.id,
-            community_id=e.community_id,
-            title=e.title,
-            event_date=e.event_date,
-            city=e.city,
-            location=e.location,
-            description=e.description,
-            registration=e.registration,
-            format=e.format,
-            media_id=e.media_id,
-            tags=e.tags,
-            skills=await _skill_outs(e.id),
-            cost=e.cost,
-            participant_payout=e.participant_payout,
-        )
-        for e in events
-    ]
+    return FastJSONResponse(fields.project_all([event_dict(e, await _skills(session, e, fields)) for e in events]))
 
 
 @router.post("/", response_model=EventOut)
 async def create_event(data: EventCreateIn, session: AsyncSession = Depends(get_session),
                        user=Depends(role_required("company"))):
-    uc = EventsUseCase(events=EventRepo(session))
+    uc = EventsUseCase(events=EventRepo(session), on_commit=commit_hook(session))
     e = await uc.create(
         community_id=data.community_id,
         title=data.title,
@@ -150,15 +93,41 @@ async def create_event(data: EventCreateIn, session: AsyncSession = Depends(get_
     )
 
 
+@router.post("/bulk", response_model=BulkCreateOut)
+async def bulk_create_events(data: EventBulkCreateIn, session: AsyncSession = Depends(get_session),
+                             user=Depends(role_required("company"))):
+    """Create up to BULK_CREATE_MAX_ITEMS events at once; invalid items are reported, not fatal."""
+    if len(data.items) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(413, f"Too many items (max {settings.BULK_CREATE_MAX_ITEMS})")
+    valid, errors = split_bulk_items(data.items, EventCreateIn)
+    created, ref_errors = await BulkContentUseCase(ContentBulkRepo(session), commit_hook(session)).create_events(valid)
+    errors.extend(BulkErrorOut(index=i, detail=d) for i, d in ref_errors)
+    return BulkCreateOut(
+        created=[BulkCreatedOut(index=i, id=cid) for i, cid in created],
+        errors=sorted(errors, key=lambda e: e.index),
+    )
+
+
+@router.patch("/{event_id}", response_model=EventOut)
+async def update_event(event_id: str, data: EventUpdateIn, session: AsyncSession = Depends(get_session),
+                       user=Depends(role_required("company"))):
+    """Partial update; a new event_date moves the participants' reminders."""
+    uc = EventsUseCase(events=EventRepo(session), reminders=ReminderRepo(session), on_commit=commit_hook(session))
+    e = await uc.update(event_id, **data.model_dump(exclude_unset=True))
+    if e is None:
+        raise HTTPException(404, "Not found")
+    return FastJSONResponse(event_dict(e, await PostRepo(session).list_skills_for_post(e.id)))
+
+
 @router.post("/{event_id}/join")
 async def join_event(event_id: str, session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
-    uc = EventsUseCase(events=EventRepo(session))
+    uc = EventsUseCase(events=EventRepo(session), reminders=ReminderRepo(session))
     await uc.join(user.id, event_id)
     return {"status": "ok"}
 
 
 @router.delete("/{event_id}/join")
 async def unjoin_event(event_id: str, session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
-    uc = EventsUseCase(events=EventRepo(session))
+    uc = EventsUseCase(events=EventRepo(session), reminders=ReminderRepo(session))
     await uc.unjoin(user.id, event_id)
     return {"status": "ok"}
@@ -5,14 +5,22 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.adapters.cache import TTLCache
 from app.adapters.db import get_session
+from app.core.config import settings
 from app.domain.entities import MediaType
 from app.infrastructure.repos.media_repo import MediaRepo
 from app.infrastructure.services.storage import LocalFileStorage
+from app.usecases.video import enqueue_video
 
 router = APIRouter()
 
-storage = LocalFileStorage(root="/data/media", public_prefix="/media")
+storage = LocalFileStorage(root=settings.MEDIA_ROOT, public_prefix="/media")
+# media id -> (ext, mime) of existing rows; unknown ids are not cached, so a public route
+# probed with random ids cannot evict the real entries
+media_file_cache = TTLCache("media_file", ttl=3600, maxsize=100_000)
+# derived video files; mimetypes does not know HLS everywhere
+ASSET_TYPES = {".m3u8": "application/vnd.apple.mpegurl", ".ts": "video/mp2t", ".jpg": "image/jpeg"}
 
 
 def _guess_kind(mime: str) -> str:
@@ -27,19 +35,47 @@ async def upload_media(file: UploadFile = File(...), session: AsyncSession = Dep
     ext = os.path.splitext(file.filename or "")[1].lstrip(".").lower() or None
     uid, url = storage.save(file.file, mime=mime, ext=ext)
     # Determine saved file size reliably
-    path = storage.path_for(uid)
+    path = storage.path_for(uid, ext)
     size = os.path.getsize(path) if os.path.exists(path) else 0
     repo = MediaRepo(session)
     media = await repo.create(uid=uid, kind=_guess_kind(mime), mime=mime, ext=ext, size=size, url=url)
+    if media.kind == MediaType.video and settings.VIDEO_PIPELINE_ENABLED:
+        # poster/HLS are produced in the background; poster_url and stream_url stay null until then
+        await enqueue_video(session, media.id)
     return {
         "id": media.id, "kind": media.kind.value, "mime": media.mime, "ext": media.ext, "size": media.size,
-        "url": media.url
+        "url": media.url, "poster_url": media.poster_url, "stream_url": media.stream_url, "duration": media.duration,
     }
 
 
+async def _file_info(session: AsyncSession, media_id: str) -> tuple[str | None, str | None] | None:
+    m = await MediaRepo(session).get(media_id)
+    return (m.ext, m.mime) if m else None
+
+
 @router.get("/{media_id}")
-async def get_media(media_id: str):
-    path = storage.path_for(media_id)
+async def get_media(media_id: str, session: AsyncSession = Depends(get_session)):
+    # ext (part of the file path) and mime never change for a media id
+    info = media_file_cache.get(media_id)
+    if info is None:
+        info = await _file_info(session, media_id)
+        if info is not None:
+            media_file_cache.set(media_id, info)
+    if info is None:
+        # no row: a file of the legacy flat layout uploaded without one, if any
+        path, mime = storage.path_for(media_id), None
+    else:
+        path, mime = storage.path_for(media_id, info[0]), info[1]
     if not os.path.exists(path):
         raise HTTPException(404, "Not found")
-    return FileResponse(path)
+    return FileResponse(path, media_type=mime)
+
+
+@router.get("/{media_id}/{asset:path}")
+async def get_media_asset(media_id: str, asset: str):
+    """Files derived from a video: `poster.jpg`, `hls/master.m3u8` and the renditions it lists."""
+    path = storage.asset_path(media_id, asset)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(404, "Not found")
+    mime = ASSET_TYPES.get(os.path.splitext(path)[1]) or mimetypes.guess_type(path)[0]
+    return FileResponse(path, media_type=mime)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.db import get_session
@@ -6,6 +6,8 @@ from app.core.deps import get_current_user
 from app.infrastructure.repos.profile_repo import ProfileRepo
 from app.infrastructure.repos.community_repo import CommunityRepo
 from app.infrastructure.repos.event_repo import EventRepo
+from app.infrastructure.repos.version_repo import VersionRepo
+from app.presentation.conditional import etag, not_modified, set_etag
 from app.presentation.schemas.profiles import ProfileOut, ProfileUpdateIn, SkillOut, SphereOut, StatusOut
 from app.presentation.schemas.communities import CommunityOut
 from app.presentation.schemas.events import EventOut
@@ -38,7 +40,13 @@ def _to_out(p, *, communities: list[CommunityOut] | None = None, joined_events:
 
 
 @router.get("/me", response_model=ProfileOut)
-async def get_my_profile(session: AsyncSession = Depends(get_session), user=Depends(get_current_user)):
+async def get_my_profile(request: Request, response: Response, session: AsyncSession = Depends(get_session),
+                         user=Depends(get_current_user)):
+    # None until the profile exists (created below)
+    tag = etag("own_profile", await VersionRepo(session).own_profile(user.id))
+    if (cached := not_modified(request, tag, private=True)) is not None:
+        return cached
+    set_etag(response, tag, private=True)
     uc = ProfileUseCase(profiles=ProfileRepo(session))
     p = await uc.get_or_create_for_user(user.id)
     # Fetch user communities and joined events
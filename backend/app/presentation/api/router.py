@@ -10,6 +10,9 @@ from . import admin_endpoints
 from . import profiles_endpoints
 from . import reference_endpoints
 from . import users_endpoints
+from . import stream_endpoints
+from . import sync_endpoints
+from . import batch_endpoints
 
 api = APIRouter()
 api.include_router(auth_endpoints.router, prefix="/auth", tags=["auth"])
@@ -22,4 +25,7 @@ api.include_router(admin_endpoints.router, prefix="/admin", tags=["admin"])
 api.include_router(profiles_endpoints.router, prefix="/profiles", tags=["profiles"])
 api.include_router(reference_endpoints.router, prefix="/reference", tags=["reference"])
 api.include_router(users_endpoints.router, prefix="/users", tags=["users"])
+api.include_router(stream_endpoints.router, prefix="/stream", tags=["stream"])
+api.include_router(sync_endpoints.router, prefix="/sync", tags=["sync"])
+api.include_router(batch_endpoints.router, prefix="/batch", tags=["batch"])
 # NOTE: Other endpoints can be wired similarly.
@@ -0,0 +1,78 @@
+"""Server-sent event streams: clients keep one connection open instead of polling.
+
+Each stream sends `event: <type>` / `data: <json>` frames from app/adapters/pubsub.py, a
+`: ping` comment every SSE_HEARTBEAT_SECONDS (keeps proxies from closing an idle connection and
+finds dead clients) and ends with `event: overflow` when the client cannot keep up. Browsers
+reconnect by themselves (EventSource); after a reconnect the client refetches its lists, events
+are not replayed. No DB session is held while a stream is open.
+"""
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.adapters.db import async_session
+from app.adapters.pubsub import CLOSED, OVERFLOW, broker
+from app.core.config import settings
+from app.core.deps import bearer, get_current_user
+from app.infrastructure.repos.community_repo import CommunityRepo
+
+router = APIRouter()
+
+
+def _stream(channels: set[str]) -> StreamingResponse:
+    if broker.connections >= settings.SSE_MAX_CONNECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many live connections",
+            headers={"Retry-After": "30"},
+        )
+
+    async def frames():
+        # subscribed once the response starts: a client gone before that leaves nothing behind
+        sub = broker.subscribe(channels)
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+            while True:
+                ev = await sub.get(settings.SSE_HEARTBEAT_SECONDS)
+                if ev is None:
+                    yield ": ping\n\n"
+                    continue
+                data = json.dumps(ev.data, separators=(",", ":"), default=str)
+                yield f"event: {ev.type}\ndata: {data}\n\n"
+                if ev is OVERFLOW or ev is CLOSED:
+                    return
+        finally:
+            sub.close()
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",      # nginx: pass frames through unbuffered
+    })
+
+
+async def _channels(creds: HTTPAuthorizationCredentials | None, *channels: str) -> set[str]:
+    """`channels` plus the caller's own `user:{id}` channel when a token is sent."""
+    out = set(channels)
+    if creds:
+        async with async_session() as s:
+            user = await get_current_user(creds, s)
+        out.add(f"user:{user.id}")
+    return out
+
+
+@router.get("/feed")
+async def stream_feed(creds: HTTPAuthorizationCredentials | None = Depends(bearer)):
+    """New posts and events in every community (`post.created`, `event.created`, `event.updated`);
+    with a token also the caller's `event.joined` / `event.left`."""
+    return _stream(await _channels(creds, "feed"))
+
+
+@router.get("/communities/{community_id}")
+async def stream_community(community_id: str, creds: HTTPAuthorizationCredentials | None = Depends(bearer)):
+    """Posts and events of one community; with a token also the caller's own events."""
+    async with async_session() as s:
+        if await CommunityRepo(s).get(community_id) is None:
+            raise HTTPException(status_code=404, detail="Community not found")
+    return _stream(await _channels(creds, f"community:{community_id}"))
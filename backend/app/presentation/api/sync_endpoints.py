@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters.db import get_session
+from app.core.config import settings
+from app.core.deps import get_optional_user
+from app.infrastructure.repos.sync_repo import SyncRepo
+from app.presentation.schemas.sync import SyncOut
+from app.presentation.serialization import FastJSONResponse, community_dict, company_dict, skill_dict, sphere_dict
+from app.usecases.companies import CompanyReadModel
+from app.usecases.sync import SyncUseCase
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncOut)
+async def sync(
+    since: str = "",
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=settings.SYNC_PAGE_SIZE),
+    session: AsyncSession = Depends(get_session),
+    user=Depends(get_optional_user),
+):
+    """Communities, companies, spheres, skills and statuses changed since the token (and, with a
+    bearer token, the caller's follows). First call without `since`; then pass the returned token."""
+    if since and not since.isdigit():
+        raise HTTPException(400, "Invalid sync token")
+    delta = await SyncUseCase(SyncRepo(session)).changes(int(since or 0), user.id if user else None, limit)
+    companies = delta.upserted["company"]
+    skills = await CompanyReadModel(session).skills_for(companies)
+
+    def section(entity: str, items: list) -> dict:
+        return {"upserted": items, "deleted": delta.deleted.get(entity, [])}
+
+    return FastJSONResponse({
+        "token": str(delta.token),
+        "reset": delta.reset,
+        "has_more": delta.has_more,
+        "communities": section("community", [community_dict(c) for c in delta.upserted["community"]]),
+        "companies": section("company", [company_dict(c, skills[c.id]) for c in companies]),
+        "spheres": section("sphere", [sphere_dict(sp) for sp in delta.upserted["sphere"]]),
+        "skills": section("skill", [skill_dict(sk) for sk in delta.upserted["skill"]]),
+        "statuses": section("status", [{"id": st.id, "title": st.title} for st in delta.upserted["status"]]),
+        "followed_communities": section("follow", delta.upserted.get("follow", [])),
+        "followed_companies": section("company_follow", delta.upserted.get("company_follow", [])),
+    })
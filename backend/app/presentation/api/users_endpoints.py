@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.db import get_session
 from app.infrastructure.repos.user_repo import UserRepo
 from app.infrastructure.repos.profile_repo import ProfileRepo
 from app.infrastructure.repos.community_repo import CommunityRepo
+from app.infrastructure.repos.version_repo import VersionRepo
+from app.presentation.conditional import etag, not_modified, set_etag
 from app.presentation.schemas.users import (
     UserOut,
     UserDetailOut,
@@ -36,7 +38,11 @@ async def list_users(session: AsyncSession = Depends(get_session)):
 
 
 @router.get("/{user_id}", response_model=UserDetailOut)
-async def get_user(user_id: str, session: AsyncSession = Depends(get_session)):
+async def get_user(user_id: str, request: Request, response: Response, session: AsyncSession = Depends(get_session)):
+    tag = etag("user_detail", await VersionRepo(session).user_detail(user_id))
+    if (cached := not_modified(request, tag)) is not None:
+        return cached
+    set_etag(response, tag)
     urepo = UserRepo(session)
     prepo = ProfileRepo(session)
     crepo = CommunityRepo(session)
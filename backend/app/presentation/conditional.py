@@ -0,0 +1,52 @@
+"""Conditional GET for entity endpoints (ETag / If-None-Match).
+
+The ETag of a response is a hash of the (kind, id, version) rows it is built from
+(`VersionRepo`), read in one query before anything is loaded. When it matches the client's
+`If-None-Match` the endpoint answers 304 and skips the hydration queries entirely.
+
+Tags are weak (`W/"..."`): equal tags mean the same data, not necessarily byte-identical
+JSON (member lists come in DB order). There is no Last-Modified: deletes leave no timestamp
+behind, so it could not be derived from the rows that are still there.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+
+# bump when a response shape changes so clients do not keep bodies of the old shape
+_REPRESENTATION = "1"
+
+
+def etag(endpoint: str, versions: Optional[Iterable[tuple]]) -> Optional[str]:
+    if versions is None:
+        return None
+    h = hashlib.blake2b(f"{_REPRESENTATION}:{endpoint}".encode(), digest_size=12)
+    for row in sorted(versions):
+        h.update(repr(row).encode())
+    return f'W/"{h.hexdigest()}"'
+
+
+def _cache_headers(tag: str, private: bool) -> dict[str, str]:
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache" if private else "no-cache"}
+    if private:
+        headers["Vary"] = "Authorization"
+    return headers
+
+
+def not_modified(request: Request, tag: Optional[str], *, private: bool = False) -> Optional[Response]:
+    """304 for a request whose If-None-Match lists `tag` (weak comparison), else None."""
+    header = request.headers.get("if-none-match")
+    if not tag or not header:
+        return None
+    if header.strip() != "*":
+        tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+        if tag.removeprefix("W/") not in tags:
+            return None
+    return Response(status_code=304, headers=_cache_headers(tag, private))
+
+
+def set_etag(response: Response, tag: Optional[str], *, private: bool = False) -> Response:
+    if tag:
+        response.headers.update(_cache_headers(tag, private))
+    return response
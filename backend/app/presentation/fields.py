@@ -0,0 +1,56 @@
+"""Sparse fieldsets: `?fields=id,title,event_date` on list and detail endpoints.
+
+The parameter names top-level fields of the endpoint's `*Out` schema; the response keeps only
+those, in schema order. Endpoints also consult it before hydrating: relations nobody asked for
+(media, skills, members, counts) are not queried, so a widget that needs ids, titles and dates
+costs the list query alone. Without the parameter responses are unchanged.
+"""
+
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+
+class Fields:
+    """Requested fields of one response; `name in fields` is True for every field when all are wanted."""
+
+    def __init__(self, names: Optional[frozenset[str]] = None):
+        self.names = names
+
+    def __contains__(self, name: str) -> bool:
+        return self.names is None or name in self.names
+
+    @property
+    def key(self) -> str:
+        """Stable suffix for cache keys and ETags: responses differ per selection."""
+        return "" if self.names is None else ":" + ",".join(sorted(self.names))
+
+    def project(self, item: dict) -> dict:
+        if self.names is None:
+            return item
+        return {k: v for k, v in item.items() if k in self.names}
+
+    def project_all(self, items: Iterable[dict]) -> list[dict]:
+        return [self.project(i) for i in items]
+
+
+ALL = Fields()
+
+
+def fields_param(model: type[BaseModel]):
+    """Dependency parsing `?fields=` for responses of `model`; unknown names are a 400."""
+    allowed = frozenset(model.model_fields)
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(model.model_fields)}"),
+    ) -> Fields:
+        if fields is None:
+            return ALL
+        names = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = names - allowed
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+        return Fields(names or None)
+
+    return dependency
@@ -0,0 +1,137 @@
+import json
+import logging
+import time
+
+from app.adapters.db_stats import current_stats, track_queries
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+
+def route_template(scope) -> str:
+    """Route template of the request (`/communities/{community_id}`), bounded for log/metric labels;
+    requests that matched no route collapse into `<unmatched>`.
+
+    `route.path` is relative to the router that declares it; the include prefix in front of it
+    is the part of the request path before what the route matched.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "<unmatched>"
+    path = scope.get("path", "")
+    for i in [i for i, ch in enumerate(path) if ch == "/"] + [len(path)]:
+        if route.path_regex.match(path[i:]):
+            return path[:i] + template
+    return template
+
+
+class QueryStatsMiddleware:
+    """Count SQL statements and DB time per HTTP request.
+
+    Adds `X-DB-Queries` / `X-DB-Time-Ms` response headers unless running in prod, and
+    writes one JSON log line per request to the `app.db` logger: INFO when the request is
+    heavy (too many statements or a slow one), DEBUG otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.headers = settings.DB_STATS_HEADERS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        t0 = time.perf_counter()
+        with track_queries() as stats:
+            async def _send(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    if self.headers:
+                        headers = list(message.get("headers", []))
+                        headers.append((b"x-db-queries", str(stats.count).encode()))
+                        headers.append((b"x-db-time-ms", f"{stats.total_ms:.2f}".encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                self._log(scope, status, stats, (time.perf_counter() - t0) * 1000.0)
+
+    @staticmethod
+    def _log(scope, status: int, stats, elapsed_ms: float) -> None:
+        heavy = stats.count >= settings.DB_QUERY_WARN_COUNT or (
+            stats.slowest and stats.slowest[0][0] >= settings.DB_SLOW_QUERY_MS
+        )
+        level = logging.INFO if heavy else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(level, json.dumps({
+            "event": "request_db_stats",
+            "method": scope.get("method"),
+            "route": route_template(scope),
+            "status": status,
+            "duration_ms": round(elapsed_ms, 2),
+            "db_queries": stats.count,
+            "db_time_ms": round(stats.total_ms, 2),
+            "slowest": [{"ms": round(ms, 2), "sql": sql} for ms, sql in stats.slowest],
+        }, ensure_ascii=False))
+
+
+class MetricsMiddleware:
+    """Per-route request counters and latency/DB-time histograms for `/metrics`.
+
+    Mounted inside `QueryStatsMiddleware` so the request's statement stats are available.
+    Children are looked up once per (method, route) and reused afterwards.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._children: dict[tuple[str, str], tuple] = {}
+
+    def _bound(self, method: str, route: str):
+        key = (method, route)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                metrics.http_latency.labels(method, route),
+                metrics.http_db_time.labels(method, route),
+                metrics.http_db_queries.labels(method, route),
+            )
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = metrics.http_in_flight.labels()
+        in_flight.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - t0
+            in_flight.dec()
+            method = scope.get("method", "")
+            route = route_template(scope)
+            latency, db_time, db_queries = self._bound(method, route)
+            latency.observe(elapsed)
+            metrics.http_requests.labels(method, route, str(status)).inc()
+            stats = current_stats()
+            if stats is not None:
+                db_time.observe(stats.total_ms / 1000.0)
+                db_queries.observe(stats.count)
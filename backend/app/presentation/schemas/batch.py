@@ -0,0 +1,30 @@
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class BatchRequestIn(BaseModel):
+    # echoed in the response; defaults to the position in the batch
+    id: Optional[str] = None
+    # only reads can be batched; any other method rejects the batch instead of running as a GET
+    method: Literal["GET"] = "GET"
+    # path with query string, e.g. "/events/my/upcoming?limit=5"
+    path: str
+    # only If-None-Match, Accept and Accept-Language are passed on; auth comes from the batch
+    headers: dict[str, str] = {}
+
+
+class BatchIn(BaseModel):
+    requests: list[BatchRequestIn]
+
+
+class BatchResponseOut(BaseModel):
+    id: str
+    status: int
+    headers: dict[str, str] = {}
+    # parsed JSON; null for empty (304) and non-JSON responses
+    body: Any = None
+
+
+class BatchOut(BaseModel):
+    responses: list[BatchResponseOut]
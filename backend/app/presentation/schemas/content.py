@@ -1,7 +1,7 @@
-from typing import Optional, List
+from typing import Any, Optional, List
 from datetime import datetime
 
-from pydantic import BaseModel, root_validator
+from pydantic import BaseModel, ValidationError, root_validator
 
 
 class MediaOut(BaseModel):
@@ -11,6 +11,10 @@ class MediaOut(BaseModel):
     ext: Optional[str] = None
     size: int
     url: str
+    # videos, once processed (app/usecases/video.py)
+    poster_url: Optional[str] = None
+    stream_url: Optional[str] = None
+    duration: Optional[float] = None
 
     @root_validator(pre=True)
     def _fill_nulls_media(cls, values: dict):
@@ -44,6 +48,39 @@ class PostCreateIn(BaseModel):
     participant_payout: Optional[int] = None
 
 
+class PostBulkCreateIn(BaseModel):
+    # raw items (any JSON value): each one is validated as PostCreateIn separately,
+    # so a single bad item does not reject the whole batch
+    items: List[Any]
+
+
+class BulkCreatedOut(BaseModel):
+    index: int
+    id: str
+
+
+class BulkErrorOut(BaseModel):
+    index: int
+    detail: Any
+
+
+class BulkCreateOut(BaseModel):
+    created: List[BulkCreatedOut] = []
+    errors: List[BulkErrorOut] = []
+
+
+def split_bulk_items(items: List[Any], model: type[BaseModel]) -> tuple[list[tuple[int, dict]], list[BulkErrorOut]]:
+    """Validate each raw item against ``model``; return (index, data) pairs and per-item errors."""
+    valid: list[tuple[int, dict]] = []
+    errors: list[BulkErrorOut] = []
+    for index, raw in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(raw).model_dump()))
+        except ValidationError as e:
+            errors.append(BulkErrorOut(index=index, detail=e.errors(include_url=False, include_context=False)))
+    return valid, errors
+
+
 class PostUpdateIn(BaseModel):
     title: Optional[str] = None
     body: Optional[str] = None
@@ -113,3 +150,36 @@ class StoryOut(BaseModel):
     title: str
     media_url: str
     media: Optional[MediaOut] = None  # NEW
+
+
+class RingStoryOut(BaseModel):
+    id: str
+    title: str
+    media_url: str
+    media_id: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime
+    seen: bool
+
+
+class StoryRingOut(BaseModel):
+    company_id: str
+    company_name: str
+    company_logo_media_id: Optional[str] = None
+    latest_at: datetime
+    story_count: int
+    unseen_count: int
+    stories: list[RingStoryOut]  # oldest first, the order they are played in
+
+
+class SeenIn(BaseModel):
+    content_ids: list[str]
+
+
+class SeenRecordedOut(BaseModel):
+    recorded: int
+
+
+class UnreadOut(BaseModel):
+    community_id: str
+    unread: int
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from pydantic import BaseModel, root_validator
 from app.presentation.schemas.content import SkillOut
@@ -47,3 +47,30 @@ class EventCreateIn(BaseModel):
     skill_ids: Optional[List[str]] = None
     cost: Optional[int] = None
     participant_payout: Optional[int] = None
+
+
+class EventUpdateIn(BaseModel):
+    title: Optional[str] = None
+    event_date: Optional[datetime] = None
+    city: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    registration: Optional[str] = None
+    format: Optional[str] = None
+    media_id: Optional[str] = None
+    tags: Optional[List[str]] = None
+    skill_ids: Optional[List[str]] = None
+    cost: Optional[int] = None
+    participant_payout: Optional[int] = None
+
+    @root_validator(pre=True)
+    def _keep_date(cls, values: dict):
+        # may be left out, but an event cannot lose its date
+        if "event_date" in values and values["event_date"] is None:
+            raise ValueError("event_date cannot be null")
+        return values
+
+
+class EventBulkCreateIn(BaseModel):
+    # raw items, validated one by one as EventCreateIn
+    items: List[Any]
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    payload: dict[str, Any] = {}
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    key: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobListOut(BaseModel):
+    counts: dict[str, int]
+    items: list[JobOut]
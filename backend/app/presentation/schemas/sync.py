@@ -0,0 +1,53 @@
+from pydantic import BaseModel
+
+from app.presentation.schemas.communities import CommunityOut
+from app.presentation.schemas.companies import CompanyOut
+from app.presentation.schemas.content import SkillOut
+from app.presentation.schemas.profiles import SphereOut, StatusOut
+
+
+class CommunitiesDeltaOut(BaseModel):
+    upserted: list[CommunityOut] = []
+    deleted: list[str] = []
+
+
+class CompaniesDeltaOut(BaseModel):
+    upserted: list[CompanyOut] = []
+    deleted: list[str] = []
+
+
+class SpheresDeltaOut(BaseModel):
+    upserted: list[SphereOut] = []
+    deleted: list[str] = []
+
+
+class SkillsDeltaOut(BaseModel):
+    upserted: list[SkillOut] = []
+    deleted: list[str] = []
+
+
+class StatusesDeltaOut(BaseModel):
+    upserted: list[StatusOut] = []
+    deleted: list[str] = []
+
+
+class IdsDeltaOut(BaseModel):
+    upserted: list[str] = []
+    deleted: list[str] = []
+
+
+class SyncOut(BaseModel):
+    # send back as ?since= on the next sync
+    token: str
+    # true: replace the local copy instead of merging (first sync, or the token is too old)
+    reset: bool
+    # more changes after this page: sync again right away with the new token
+    has_more: bool
+    communities: CommunitiesDeltaOut
+    companies: CompaniesDeltaOut
+    spheres: SpheresDeltaOut
+    skills: SkillsDeltaOut
+    statuses: StatusesDeltaOut
+    # the caller's followed community/company ids (empty without a token)
+    followed_communities: IdsDeltaOut
+    followed_companies: IdsDeltaOut
@@ -0,0 +1,185 @@
+"""Fast response path for list endpoints.
+
+FastAPI validates a returned `*Out` model against `response_model` once more and then
+serializes it, so feed pages pay two passes per item plus nested skills/media. Hot list
+endpoints instead project domain objects straight into JSON-ready dicts with the helpers
+below (same shape and null defaults as the `*Out` schemas, which stay the documented
+`response_model`) and return `FastJSONResponse`, which FastAPI sends as is.
+
+`orjson` is used when installed, the stdlib encoder otherwise; both emit datetimes the way
+Pydantic does (ISO 8601, `Z` for UTC). `app.scripts.bench_serialization` compares the paths.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, Optional
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(obj: Any):
+    if isinstance(obj, datetime):
+        if obj.tzinfo is not None and obj.utcoffset() == timezone.utc.utcoffset(None):
+            return obj.replace(tzinfo=None).isoformat() + "Z"
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for pre-projected content (dicts/lists of primitives and datetimes)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _enum_value(v):
+    return v.value if hasattr(v, "value") else v
+
+
+def _or_empty(v: Optional[str]) -> str:
+    return "" if v is None else v
+
+
+def sphere_dict(sp) -> Optional[dict]:
+    if sp is None:
+        return None
+    return {"id": sp.id, "title": sp.title, "background_color": sp.background_color, "text_color": sp.text_color}
+
+
+def skill_dict(s) -> dict:
+    # SkillOut
+    return {"id": s.id, "title": s.title, "sphere_id": s.sphere_id, "sphere": sphere_dict(getattr(s, "sphere", None))}
+
+
+def media_dict(m) -> dict:
+    # MediaOut
+    return {
+        "id": m.id, "kind": _enum_value(m.kind), "mime": m.mime, "ext": _or_empty(m.ext), "size": m.size, "url": m.url,
+        "poster_url": getattr(m, "poster_url", None), "stream_url": getattr(m, "stream_url", None),
+        "duration": getattr(m, "duration", None),
+    }
+
+
+def post_dict(p, media: Iterable = (), skills: Iterable = ()) -> dict:
+    # PostOut
+    return {
+        "id": p.id,
+        "community_id": p.community_id,
+        "title": p.title,
+        "body": _or_empty(p.body),
+        "media": [media_dict(m) for m in media],
+        "tags": list(p.tags or []),
+        "skills": [skill_dict(s) for s in skills],
+        "cost": p.cost or 0,
+        "participant_payout": p.participant_payout or 0,
+    }
+
+
+def content_item_dict(row, media: Iterable = (), skills: Iterable = ()) -> dict:
+    """ContentItemOut from a raw `ContentModel` row (posts and events share the feed)."""
+    body = row.body if row.type == "post" else (row.description or None)
+    return {
+        "id": row.id,
+        "community_id": row.community_id,
+        "type": row.type,
+        "title": row.title,
+        "body": _or_empty(body),
+        "event_date": row.event_date,
+        "media": [media_dict(m) for m in media],
+        "tags": [t.strip() for t in (row.tags or "").split(",") if t.strip()],
+        "skills": [skill_dict(s) for s in skills],
+        "cost": row.cost or 0,
+        "participant_payout": row.participant_payout or 0,
+    }
+
+
+def event_dict(e, skills: Iterable = ()) -> dict:
+    # EventOut
+    return {
+        "id": e.id,
+        "community_id": e.community_id,
+        "title": e.title,
+        "event_date": e.event_date,
+        "city": _or_empty(e.city),
+        "location": _or_empty(e.location),
+        "description": _or_empty(e.description),
+        "registration": _or_empty(e.registration),
+        "format": _or_empty(e.format),
+        "media_id": _or_empty(e.media_id),
+        "tags": list(e.tags or []),
+        "skills": [skill_dict(s) for s in skills],
+        "cost": e.cost or 0,
+        "participant_payout": e.participant_payout or 0,
+    }
+
+
+def community_dict(c, members_count: Optional[int] = None) -> dict:
+    # CommunityOut
+    return {
+        "id": c.id,
+        "name": c.name,
+        "company_id": _or_empty(c.company_id),
+        "description": _or_empty(c.description),
+        "telegram_url": _or_empty(c.telegram_url),
+        "tags": list(c.tags or []),
+        "is_archived": bool(c.is_archived),
+        "logo_media_id": _or_empty(c.logo_media_id),
+        "members_count": int(members_count or 0),
+    }
+
+
+def company_dict(c, skills: Iterable = ()) -> dict:
+    # CompanyOut
+    return {
+        "id": c.id,
+        "name": c.name,
+        "description": _or_empty(c.description),
+        "logo_media_id": _or_empty(c.logo_media_id),
+        "skills": [skill_dict(s) for s in skills],
+    }
+
+
+def company_detail_dict(d) -> dict:
+    # CompanyDetailOut from a `CompanyDetail` read model
+    out = company_dict(d.company, d.skills)
+    out["communities"] = [community_dict(c, n) for c, n in d.communities]
+    out["media"] = [media_dict(m) for m in d.media]
+    return out
+
+
+def story_ring_dict(ring) -> dict:
+    # StoryRingOut
+    seen_until = ring.seen_until
+    return {
+        "company_id": ring.company_id,
+        "company_name": ring.company_name,
+        "company_logo_media_id": ring.company_logo_media_id,
+        "latest_at": ring.latest_at,
+        "story_count": ring.story_count,
+        "unseen_count": ring.unseen_count,
+        "stories": [
+            {
+                "id": st.id,
+                "title": st.title,
+                "media_url": st.media_url,
+                "media_id": st.media_id,
+                "created_at": st.created_at,
+                "expires_at": st.expires_at,
+                "seen": seen_until is not None and st.created_at <= seen_until,
+            }
+            for st in ring.stories
+        ],
+    }
@@ -0,0 +1,59 @@
+"""Worker warm-up and readiness state.
+
+`warm_up(app)` runs at the end of startup, before the worker accepts connections: it builds
+the OpenAPI schema and replays the hot public GETs in-process, so routing, dependency
+resolution, serialization, the SQL statements (and asyncpg's per-connection statement cache)
+and the reference/upcoming-events caches are all hot for the first real request.
+`/ready` reports ready only after that, unlike `/health` which only says the process is up.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+import httpx
+
+logger = logging.getLogger("app.warmup")
+
+# public endpoints on the hot path; warm-up failures are logged, never fatal
+WARMUP_PATHS = (
+    "/reference/spheres",
+    "/reference/skills",
+    "/reference/statuses",
+    "/events/upcoming",
+    "/content/posts",
+)
+
+
+@dataclass
+class Readiness:
+    ready: bool = False
+    warmup_ms: float = 0.0
+    warmup_errors: int = 0
+
+
+state = Readiness()
+
+
+async def warm_up(app) -> None:
+    t0 = time.perf_counter()
+    errors = 0
+    try:
+        app.openapi()
+    except Exception:
+        errors += 1
+        logger.exception("warm-up: openapi schema failed")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in WARMUP_PATHS:
+            try:
+                r = await client.get(path)
+                if r.status_code >= 400:
+                    errors += 1
+                    logger.warning("warm-up: GET %s -> %d", path, r.status_code)
+            except Exception:
+                errors += 1
+                logger.exception("warm-up: GET %s failed", path)
+    state.warmup_ms = (time.perf_counter() - t0) * 1000.0
+    state.warmup_errors = errors
+    logger.info("warm-up done in %.1f ms (%d error(s))", state.warmup_ms, errors)
@@ -0,0 +1,136 @@
+"""
+Microbenchmark for feed response serialization.
+
+Compares, per item, for synthetic `/content/posts` pages (each item with 2 media and 3
+skills with spheres):
+- models: build `ContentItemOut` models and let FastAPI re-validate them against
+  `response_model` and serialize (dump -> validate -> dump(mode="json") -> json.dumps)
+- adapter: build the models once and dump with a pre-built `TypeAdapter` (no re-validation)
+- projection: `app.presentation.serialization.content_item_dict` + `dumps` (orjson if installed)
+
+All three paths are checked to produce the same JSON before timing.
+
+Usage:
+  python -m app.scripts.bench_serialization
+  python -m app.scripts.bench_serialization --sizes 20,100,500 --repeat 7 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.domain.entities import Media, MediaType, Skill, Sphere
+from app.presentation.schemas.content import ContentItemOut, ContentSphereOut, MediaOut, SkillOut
+from app.presentation.serialization import content_item_dict, dumps, orjson
+
+_ADAPTER = TypeAdapter(list[ContentItemOut])
+
+
+def _page(n: int):
+    sphere = Sphere(id="s" * 32, title="Разработка", background_color="#E8F0FE", text_color="#1A73E8")
+    skills = [Skill(id=f"{k:032x}", title=f"Навык {k}", sphere_id=sphere.id, sphere=sphere) for k in range(3)]
+    now = datetime(2030, 1, 1, 12, 0, 0)
+    page = []
+    for i in range(n):
+        row = SimpleNamespace(
+            id=f"{i:032x}", community_id="c" * 32, type="event" if i % 4 == 0 else "post",
+            title=f"Заголовок {i}", body="Текст поста " * 20, description="Описание события",
+            event_date=now + timedelta(days=i) if i % 4 == 0 else None,
+            tags="python,backend,ml", cost=None if i % 2 else 1000, participant_payout=None,
+        )
+        media = [
+            Media(id=f"{i:030x}m{j}", kind=MediaType.image, mime="image/jpeg", ext="jpg" if j else None,
+                  size=120_000 + j, url=f"/media/m{i}{j}", created_at=now)
+            for j in range(2)
+        ]
+        page.append((row, media, skills))
+    return page
+
+
+def _models(page) -> list[ContentItemOut]:
+    # what the endpoints did before: hand-built models, one per item
+    out = []
+    for row, media, skills in page:
+        out.append(ContentItemOut(
+            id=row.id, community_id=row.community_id, type=row.type, title=row.title,
+            body=row.body if row.type == "post" else (row.description or None),
+            event_date=row.event_date,
+            media=[MediaOut(id=m.id, kind=m.kind.value, mime=m.mime, ext=m.ext, size=m.size, url=m.url) for m in media],
+            tags=[t.strip() for t in (row.tags or "").split(",") if t.strip()],
+            skills=[SkillOut(id=s.id, title=s.title, sphere_id=s.sphere_id, sphere=ContentSphereOut(
+                id=s.sphere.id, title=s.sphere.title, background_color=s.sphere.background_color,
+                text_color=s.sphere.text_color)) for s in skills],
+            cost=row.cost, participant_payout=row.participant_payout,
+        ))
+    return out
+
+
+def path_models(page) -> bytes:
+    models = _models(page)
+    # FastAPI response_model handling: dump, validate again, serialize, encode
+    validated = _ADAPTER.validate_python([m.model_dump() for m in models])
+    data = _ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def path_adapter(page) -> bytes:
+    return _ADAPTER.dump_json(_models(page))
+
+
+def path_projection(page) -> bytes:
+    return dumps([content_item_dict(row, media, skills) for row, media, skills in page])
+
+
+PATHS = {"models": path_models, "adapter": path_adapter, "projection": path_projection}
+
+
+def _bench(fn, page, repeat: int) -> float:
+    """Best-of-`repeat` microseconds per item (each run loops until ~50 ms have passed)."""
+    best = float("inf")
+    for _ in range(repeat):
+        loops, t0 = 0, time.perf_counter()
+        while True:
+            fn(page)
+            loops += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= 0.05:
+                break
+        best = min(best, elapsed / loops)
+    return best * 1e6 / len(page)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Per-item serialization cost of feed pages")
+    ap.add_argument("--sizes", default="20,100,500", help="Comma-separated page sizes")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", dest="json_path", default=None, help="Write results to this file")
+    args = ap.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    print(f"encoder: {'orjson' if orjson is not None else 'json (stdlib)'}")
+    print(f"{'items':>6} " + " ".join(f"{name + ' us/item':>20}" for name in PATHS) + f" {'speedup':>8}")
+    results = []
+    for n in sizes:
+        page = _page(n)
+        reference = json.loads(path_models(page))
+        for name, fn in PATHS.items():
+            if json.loads(fn(page)) != reference:
+                raise SystemExit(f"{name}: output differs from the response_model path")
+        row = {name: _bench(fn, page, args.repeat) for name, fn in PATHS.items()}
+        speedup = row["models"] / row["projection"]
+        print(f"{n:>6} " + " ".join(f"{row[name]:>20.2f}" for name in PATHS) + f" {speedup:>7.1f}x")
+        results.append({"items": n, "us_per_item": row, "speedup": round(speedup, 2)})
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"encoder": "orjson" if orjson is not None else "json", "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
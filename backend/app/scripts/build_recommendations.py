@@ -0,0 +1,40 @@
+"""
+Rebuild the offline community recommendations served by `GET /communities/joinable`.
+
+Reads memberships, profile skills/interests, community skills and tags, scores every user
+against every community in blocks (numpy/scipy) and replaces `community_recommendations`
+and `community_popularity`. Safe to run while the API serves traffic: each block of users
+is swapped in its own transaction, rows of users that lost every signal are removed at
+the end. Run it periodically (cron / a scheduled job), e.g. nightly.
+
+Usage (Docker):
+  docker compose exec api python -m app.scripts.build_recommendations
+  docker compose exec api python -m app.scripts.build_recommendations --top-k 100 --block-cells 4000000
+"""
+
+import argparse
+import asyncio
+
+from app.adapters.db import async_session
+from app.core.config import settings
+from app.usecases.recommendations import build_recommendations
+
+
+async def run(args: argparse.Namespace) -> None:
+    stats = await build_recommendations(async_session, top_k_per_user=args.top_k, max_block_cells=args.block_cells)
+    print(
+        f"Scored {stats.users} user(s) x {stats.communities} communities in {stats.seconds:.1f}s; "
+        f"{stats.rows} recommendation(s) for {stats.recommended_users} user(s)"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Rebuild offline community recommendations")
+    ap.add_argument("--top-k", type=int, default=settings.RECOMMENDATIONS_TOP_K, help="stored recommendations per user")
+    ap.add_argument("--block-cells", type=int, default=settings.RECOMMENDATIONS_BLOCK_CELLS,
+                    help="max dense scores held in memory at once (users per block x communities)")
+    asyncio.run(run(ap.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ Usage (Docker):
 
 Notes:
 - Idempotent: running again after deletion makes no changes.
-- Orphan cleanup affects DB rows only; it does not remove files from storage.
+- Orphan cleanup affects DB rows only; run `app.scripts.media_gc` to remove files from storage.
 """
 
 from __future__ import annotations
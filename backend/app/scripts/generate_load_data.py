@@ -0,0 +1,399 @@
+"""
+High-volume synthetic dataset for load testing.
+
+Builds users (with profiles and profile skills), companies, communities, memberships,
+follows, company follows, content (posts/events), content skills and event participants
+with production-like skew:
+- community popularity follows a Zipf law (a few huge communities, a long tail);
+- per-user follow/membership counts follow a power law (Pareto).
+
+Rows are generated in chunks by a process pool and written in parallel: through
+`COPY` on Postgres (asyncpg `copy_records_to_table`) and multi-row `executemany` on SQLite.
+All generated ids start with `lt` so the dataset can be wiped with `--wipe`.
+
+Usage (Docker):
+  docker compose exec api python -m app.scripts.generate_load_data --users 1000000 --communities 20000
+  docker compose exec api python -m app.scripts.generate_load_data --wipe
+
+Notes:
+- Requires reference data (spheres/skills); falls back to generating a small synthetic set.
+- Deterministic for a given `--seed`: ids are derived from row numbers, not stored in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Iterator
+
+from sqlalchemy import delete, insert, select
+
+from app.adapters.db import engine
+from app.infrastructure.repos import content_seq
+from app.infrastructure.repos.sql_models import (
+    Base,
+    UserModel,
+    ProfileModel,
+    ProfileSkillModel,
+    CompanyModel,
+    CommunityModel,
+    MembershipModel,
+    FollowModel,
+    CompanyFollowModel,
+    ContentModel,
+    ContentSkillModel,
+    EventParticipantModel,
+    SkillModel,
+    SphereModel,
+)
+
+ID_PREFIX = "lt"
+
+
+def _id(kind: str, n: int) -> str:
+    # 32 chars like uuid4().hex, derived from the row number
+    return f"{ID_PREFIX}{kind}{n:028x}"
+
+
+@dataclass(frozen=True)
+class Shape:
+    seed: int
+    users: int
+    companies: int
+    communities: int
+    content: int
+    event_ratio: float
+    community_zipf: float
+    follow_alpha: float
+    max_follows: int
+    membership_ratio: float
+    company_follow_alpha: float
+    max_skills: int
+    participants_alpha: float
+    max_participants: int
+    days: int
+    skill_ids: tuple[str, ...]
+    now: datetime
+
+
+class ZipfSampler:
+    """Sample ranks 0..n-1 with P(k) ~ 1 / (k + 1) ** s via bisect over cumulative weights."""
+
+    def __init__(self, n: int, s: float):
+        acc = 0.0
+        self.cum: list[float] = []
+        for k in range(1, n + 1):
+            acc += 1.0 / (k ** s)
+            self.cum.append(acc)
+        self.total = acc
+
+    def sample(self, rnd: random.Random) -> int:
+        return bisect.bisect_left(self.cum, rnd.random() * self.total)
+
+    def sample_unique(self, rnd: random.Random, k: int, n: int) -> set[int]:
+        k = min(k, n)
+        out: set[int] = set()
+        # bounded retries: heavy heads make repeated hits likely
+        for _ in range(k * 8):
+            if len(out) >= k:
+                break
+            out.add(self.sample(rnd))
+        return out
+
+
+def _power_law(rnd: random.Random, alpha: float, cap: int) -> int:
+    return min(cap, int(rnd.paretovariate(alpha)) - 1)
+
+
+def _rnd(shape: Shape, table: str, chunk: int) -> random.Random:
+    return random.Random(f"{shape.seed}:{table}:{chunk}")
+
+
+def _created_at(shape: Shape, rnd: random.Random) -> datetime:
+    return shape.now - timedelta(seconds=rnd.randrange(shape.days * 86400))
+
+
+# --- chunk generators (run in worker processes) ---
+
+def _gen_users(shape: Shape, chunk: int, start: int, end: int) -> dict[str, list[dict]]:
+    rnd = _rnd(shape, "users", chunk)
+    users, profiles, profile_skills = [], [], []
+    for i in range(start, end):
+        users.append(dict(
+            id=_id("us", i), role="student", phone=f"+70{i:09d}", email=None, password_hash=None,
+            avatar_media_id=None, created_at=_created_at(shape, rnd),
+        ))
+        profiles.append(dict(
+            id=_id("pr", i), user_id=_id("us", i), full_name=f"Load User {i}", city=None, interests=None,
+            portfolio_url=None, description=None,
+        ))
+        if shape.skill_ids:
+            for j, sid in enumerate(rnd.sample(shape.skill_ids, min(len(shape.skill_ids), rnd.randint(0, shape.max_skills)))):
+                profile_skills.append(dict(id=_id("ps", i * 16 + j), profile_id=_id("pr", i), skill_id=sid))
+    return {"users": users, "profiles": profiles, "profile_skills": profile_skills}
+
+
+def _gen_companies(shape: Shape, chunk: int, start: int, end: int) -> dict[str, list[dict]]:
+    rnd = _rnd(shape, "companies", chunk)
+    rows = []
+    for i in range(start, end):
+        tags = rnd.sample(shape.skill_ids, min(len(shape.skill_ids), 3)) if shape.skill_ids else []
+        rows.append(dict(
+            id=_id("co", i), phone=f"+71{i:09d}", name=f"Load Company {i}", description=None,
+            owner_user_id=None, logo_media_id=None, tags=",".join(tags) or None,
+        ))
+    return {"companies": rows}
+
+
+def _gen_communities(shape: Shape, chunk: int, start: int, end: int) -> dict[str, list[dict]]:
+    rows = []
+    for i in range(start, end):
+        rows.append(dict(
+            id=_id("cm", i), company_id=_id("co", i % shape.companies), name=f"Load Community {i}",
+            description=None, telegram_url=None, tags="load", is_archived=False, logo_media_id=None,
+        ))
+    return {"communities": rows}
+
+
+def _gen_relations(shape: Shape, chunk: int, start: int, end: int) -> dict[str, list[dict]]:
+    """Per-user follows, memberships and company follows (power-law counts, Zipf targets)."""
+    rnd = _rnd(shape, "relations", chunk)
+    communities = ZipfSampler(shape.communities, shape.community_zipf)
+    companies = ZipfSampler(shape.companies, shape.community_zipf)
+    follows, memberships, company_follows = [], [], []
+    for u in range(start, end):
+        uid = _id("us", u)
+        followed = communities.sample_unique(rnd, _power_law(rnd, shape.follow_alpha, shape.max_follows), shape.communities)
+        for k, c in enumerate(followed):
+            follows.append(dict(id=_id("fo", u * 256 + k), user_id=uid, community_id=_id("cm", c)))
+            if rnd.random() < shape.membership_ratio:
+                memberships.append(dict(id=_id("ms", u * 256 + k), user_id=uid, community_id=_id("cm", c), role="member"))
+        n_companies = _power_law(rnd, shape.company_follow_alpha, shape.max_follows)
+        for k, c in enumerate(companies.sample_unique(rnd, n_companies, shape.companies)):
+            company_follows.append(dict(id=_id("cf", u * 256 + k), user_id=uid, company_id=_id("co", c)))
+    return {"follows": follows, "memberships": memberships, "company_follows": company_follows}
+
+
+def _gen_content(shape: Shape, chunk: int, start: int, end: int) -> dict[str, list[dict]]:
+    rnd = _rnd(shape, "content", chunk)
+    communities = ZipfSampler(shape.communities, shape.community_zipf)
+    content, content_skills, participants = [], [], []
+    for i in range(start, end):
+        cid = _id("ct", i)
+        community = communities.sample(rnd)
+        is_event = rnd.random() < shape.event_ratio
+        created = _created_at(shape, rnd)
+        row = dict(
+            id=cid, community_id=_id("cm", community), type="event" if is_event else "post",
+            title=f"Load {'event' if is_event else 'post'} {i}", body=None, created_at=created,
+            event_date=None, city=None, location=None, description=None, registration=None, format=None,
+            media_id=None, tags=None, cost=None, participant_payout=None,
+            # chunks run in parallel, so per-community numbers cannot be dense here; a
+            # unique seq is enough for seen tracking, counters are synced after the load
+            seq=i + 1,
+        )
+        if is_event:
+            row.update(
+                event_date=created + timedelta(days=rnd.randint(1, 60)), city="Москва", location="Онлайн",
+                description="Load test event", format="online",
+            )
+            # bigger communities get more participants
+            boost = max(1, shape.max_participants // (community + 1))
+            n = min(shape.max_participants, _power_law(rnd, shape.participants_alpha, boost) + 1)
+            for k, u in enumerate({rnd.randrange(shape.users) for _ in range(n)}):
+                participants.append(dict(id=_id("ep", i * 4096 + k), user_id=_id("us", u), content_id=cid))
+        else:
+            row["body"] = "Load test post body"
+        content.append(row)
+        if shape.skill_ids:
+            for k, sid in enumerate(rnd.sample(shape.skill_ids, min(len(shape.skill_ids), rnd.randint(0, shape.max_skills)))):
+                content_skills.append(dict(id=_id("cs", i * 16 + k), content_id=cid, skill_id=sid))
+    return {"content": content, "content_skills": content_skills, "event_participants": participants}
+
+
+TABLES = {
+    "users": UserModel.__table__,
+    "profiles": ProfileModel.__table__,
+    "profile_skills": ProfileSkillModel.__table__,
+    "companies": CompanyModel.__table__,
+    "communities": CommunityModel.__table__,
+    "follows": FollowModel.__table__,
+    "memberships": MembershipModel.__table__,
+    "company_follows": CompanyFollowModel.__table__,
+    "content": ContentModel.__table__,
+    "content_skills": ContentSkillModel.__table__,
+    "event_participants": EventParticipantModel.__table__,
+}
+
+# write order within a chunk respects foreign keys
+WRITE_ORDER = list(TABLES)
+
+
+# --- writers ---
+
+async def _write(is_pg: bool, batch: dict[str, list[dict]]) -> dict[str, int]:
+    written: dict[str, int] = {}
+    async with engine.begin() as conn:
+        for name in WRITE_ORDER:
+            rows = batch.get(name)
+            if not rows:
+                continue
+            table = TABLES[name]
+            if is_pg:
+                raw = await conn.get_raw_connection()
+                columns = list(rows[0].keys())
+                await raw.driver_connection.copy_records_to_table(
+                    table.name, records=[tuple(r[c] for c in columns) for r in rows], columns=columns
+                )
+            else:
+                await conn.execute(insert(table), rows)
+            written[name] = len(rows)
+    return written
+
+
+async def _run_stage(
+    label: str,
+    gen: Callable[[Shape, int, int, int], dict[str, list[dict]]],
+    shape: Shape,
+    total: int,
+    chunk_size: int,
+    pool: ProcessPoolExecutor,
+    is_pg: bool,
+    parallel: int,
+) -> None:
+    loop = asyncio.get_running_loop()
+    sem = asyncio.Semaphore(parallel)
+    counts: dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    async def one(chunk: int, start: int, end: int):
+        async with sem:
+            batch = await loop.run_in_executor(pool, gen, shape, chunk, start, end)
+            for k, v in (await _write(is_pg, batch)).items():
+                counts[k] = counts.get(k, 0) + v
+
+    ranges: Iterator[tuple[int, int, int]] = (
+        (n, s, min(s + chunk_size, total)) for n, s in enumerate(range(0, total, chunk_size))
+    )
+    await asyncio.gather(*(one(*r) for r in ranges))
+    took = time.perf_counter() - t0
+    summary = ", ".join(f"{k}={v}" for k, v in counts.items()) or "nothing"
+    print(f"[{label}] {summary} in {took:.1f}s")
+
+
+async def _skill_ids() -> tuple[str, ...]:
+    async with engine.begin() as conn:
+        ids = tuple(r for r, in (await conn.execute(select(SkillModel.id))).all())
+        if ids:
+            return ids
+        # no reference data: create a small synthetic set
+        await conn.execute(insert(SphereModel), [
+            dict(id=_id("sp", i), title=f"Load sphere {i}", background_color="#EEEEEE", text_color="#111111")
+            for i in range(5)
+        ])
+        await conn.execute(insert(SkillModel), [
+            dict(id=_id("sk", i), title=f"Load skill {i}", sphere_id=_id("sp", i % 5)) for i in range(40)
+        ])
+        return tuple(_id("sk", i) for i in range(40))
+
+
+async def wipe() -> None:
+    """Delete every generated row (ids with the `lt` prefix), dependents first."""
+    async with engine.begin() as conn:
+        for name in reversed(WRITE_ORDER):
+            table = TABLES[name]
+            res = await conn.execute(delete(table).where(table.c.id.like(f"{ID_PREFIX}%")))
+            print(f"Deleted {name}: {res.rowcount}")
+        for model in (SkillModel, SphereModel):
+            await conn.execute(delete(model).where(model.id.like(f"{ID_PREFIX}%")))
+
+
+async def generate(args: argparse.Namespace) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    is_pg = engine.dialect.name.startswith("postgres")
+    # SQLite has a single writer: parallel writes only queue on the file lock
+    parallel = args.parallel if is_pg else 1
+
+    shape = Shape(
+        seed=args.seed,
+        users=args.users,
+        companies=args.companies,
+        communities=args.communities,
+        content=args.content,
+        event_ratio=args.event_ratio,
+        community_zipf=args.community_zipf,
+        follow_alpha=args.follow_alpha,
+        max_follows=min(args.max_follows, 255),
+        membership_ratio=args.membership_ratio,
+        company_follow_alpha=args.company_follow_alpha,
+        max_skills=min(args.max_skills, 15),
+        participants_alpha=args.participants_alpha,
+        max_participants=min(args.max_participants, 4095),
+        days=args.days,
+        skill_ids=await _skill_ids(),
+        now=datetime.utcnow(),
+    )
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.parallel) as pool:
+        stages = [
+            ("users", _gen_users, shape.users),
+            ("companies", _gen_companies, shape.companies),
+            ("communities", _gen_communities, shape.communities),
+            ("relations", _gen_relations, shape.users),
+            ("content", _gen_content, shape.content),
+        ]
+        for label, gen, total in stages:
+            await _run_stage(label, gen, shape, total, args.chunk_size, pool, is_pg, parallel)
+    async with engine.begin() as conn:
+        await content_seq.sync_last_seq(conn)
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+def _positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def _parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Generate a production-shaped dataset for load testing")
+    # other rows pick users/companies/communities by index: none of them can be empty
+    p.add_argument("--users", type=_positive_int, default=100_000)
+    p.add_argument("--companies", type=_positive_int, default=500)
+    p.add_argument("--communities", type=_positive_int, default=5_000)
+    p.add_argument("--content", type=int, default=500_000, help="posts + events")
+    p.add_argument("--event-ratio", type=float, default=0.2, help="share of content rows that are events")
+    p.add_argument("--community-zipf", type=float, default=1.1, help="Zipf exponent of community popularity")
+    p.add_argument("--follow-alpha", type=float, default=1.3, help="Pareto alpha of follows per user")
+    p.add_argument("--max-follows", type=int, default=200)
+    p.add_argument("--membership-ratio", type=float, default=0.4, help="share of follows that are also memberships")
+    p.add_argument("--company-follow-alpha", type=float, default=1.8)
+    p.add_argument("--max-skills", type=int, default=5, help="max skills per profile/content row")
+    p.add_argument("--participants-alpha", type=float, default=1.2)
+    p.add_argument("--max-participants", type=int, default=2_000)
+    p.add_argument("--days", type=int, default=365, help="spread created_at over this many days")
+    p.add_argument("--chunk-size", type=int, default=10_000)
+    p.add_argument("--parallel", type=int, default=4, help="generator processes and concurrent writers")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--wipe", action="store_true", help="delete previously generated rows and exit")
+    return p
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parser().parse_args(argv)
+    if args.wipe:
+        asyncio.run(wipe())
+    else:
+        asyncio.run(generate(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Scenario-driven load test for the API.
+
+Virtual users replay a weighted mix of realistic flows at a fixed concurrency:
+- login: OTP request + verify for a fresh phone
+- feed: scroll the unified feed (`/content/posts`, a few pages) and followed posts
+- community: list communities, open a community detail and its posts
+- event_join: list upcoming events and join/unjoin one
+- company_post: a company creates a post in its community
+
+Reports throughput and p50/p95/p99 latency per endpoint, plus DB statements per request
+read from the `X-DB-Queries` response header (see `app/adapters/db_stats.py`; the header
+is off when the target runs with ENV=prod unless DB_STATS_HEADERS=1).
+
+Every virtual user logs in from the same client IP: start a remote target with
+OTP_REQUEST_PER_IP=0 OTP_VERIFY_PER_IP=0 (--in-process sets them) or logins get 429s.
+
+Usage:
+  # against the ASGI app in-process (uses DATABASE_URL of this environment)
+  python -m app.scripts.load_test --in-process --concurrency 50 --duration 30
+
+  # against a running instance
+  python -m app.scripts.load_test --base-url http://localhost:8000 --mix feed=6,community=3,event_join=1
+
+Optional args:
+  --max-p95-ms 250       Exit with code 1 if any endpoint's p95 exceeds the budget
+  --max-error-rate 0.01  Exit with code 1 if the share of failed requests is higher
+  --json report.json     Dump the report for comparison between runs
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import string
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+
+DEFAULT_MIX = "login=1,feed=5,community=3,event_join=1,company_post=1"
+
+
+@dataclass
+class EndpointStats:
+    # every request tried, including ones that never got a response (transport errors)
+    attempts: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    queries: list[int] = field(default_factory=list)
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        xs = sorted(self.latencies_ms)
+        # nearest-rank percentile
+        k = max(0, min(len(xs) - 1, math.ceil(p / 100.0 * len(xs)) - 1))
+        return xs[k]
+
+
+@dataclass
+class Ctx:
+    client: httpx.AsyncClient
+    stats: dict[str, EndpointStats]
+    company_token: str | None = None
+    company_community_id: str | None = None
+    community_ids: list[str] = field(default_factory=list)
+    event_ids: list[str] = field(default_factory=list)
+
+
+def _rand_phone() -> str:
+    return "+7" + "".join(random.choice(string.digits) for _ in range(10))
+
+
+def _auth(token: str | None) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+async def call(ctx: Ctx, name: str, method: str, url: str, *, token: str | None = None, **kwargs) -> httpx.Response | None:
+    """Issue one request and record latency/status/queries under the endpoint `name`."""
+    st = ctx.stats.setdefault(name, EndpointStats())
+    st.attempts += 1
+    t0 = time.perf_counter()
+    try:
+        resp = await ctx.client.request(method, url, headers=_auth(token), **kwargs)
+    except httpx.HTTPError:
+        st.errors += 1
+        return None
+    st.latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+    header = resp.headers.get("X-DB-Queries")
+    if header is not None and header.isdigit():
+        st.queries.append(int(header))
+    if resp.status_code >= 400:
+        st.errors += 1
+    return resp
+
+
+async def login(ctx: Ctx, phone: str | None = None) -> str | None:
+    phone = phone or _rand_phone()
+    await call(ctx, "POST /auth/otp/request", "POST", "/auth/otp/request", json={"phone": phone})
+    r = await call(ctx, "POST /auth/otp/verify", "POST", "/auth/otp/verify", json={"phone": phone, "code": "11111"})
+    if r is None or r.status_code != 200:
+        return None
+    return r.json().get("access_token")
+
+
+# --- scenarios ---
+
+async def scenario_login(ctx: Ctx, token: str | None) -> None:
+    await login(ctx)
+
+
+async def scenario_feed(ctx: Ctx, token: str | None) -> None:
+    for page in range(3):
+        await call(ctx, "GET /content/posts", "GET", "/content/posts", params={"offset": page * 20, "limit": 20})
+    await call(ctx, "GET /content/me/posts/from-followed-communities", "GET",
+               "/content/me/posts/from-followed-communities", token=token)
+
+
+async def scenario_community(ctx: Ctx, token: str | None) -> None:
+    await call(ctx, "GET /communities/", "GET", "/communities/")
+    if not ctx.community_ids:
+        return
+    cid = random.choice(ctx.community_ids)
+    await call(ctx, "GET /communities/{id}", "GET", f"/communities/{cid}")
+    await call(ctx, "GET /communities/{id}/posts", "GET", f"/communities/{cid}/posts")
+    if random.random() < 0.2:
+        await call(ctx, "POST /communities/{id}/follow", "POST", f"/communities/{cid}/follow", token=token)
+
+
+async def scenario_event_join(ctx: Ctx, token: str | None) -> None:
+    await call(ctx, "GET /events/upcoming", "GET", "/events/upcoming")
+    if not ctx.event_ids:
+        return
+    eid = random.choice(ctx.event_ids)
+    await call(ctx, "POST /events/{id}/join", "POST", f"/events/{eid}/join", token=token)
+    await call(ctx, "GET /events/my/upcoming", "GET", "/events/my/upcoming", token=token)
+    await call(ctx, "DELETE /events/{id}/join", "DELETE", f"/events/{eid}/join", token=token)
+
+
+async def scenario_company_post(ctx: Ctx, token: str | None) -> None:
+    if not ctx.company_token or not ctx.company_community_id:
+        return
+    await call(ctx, "POST /content/posts", "POST", "/content/posts", token=ctx.company_token, json={
+        "community_id": ctx.company_community_id,
+        "title": "Load test post",
+        "body": "Posted by the load test harness",
+    })
+
+
+SCENARIOS: dict[str, Callable[[Ctx, str | None], Awaitable[None]]] = {
+    "login": scenario_login,
+    "feed": scenario_feed,
+    "community": scenario_community,
+    "event_join": scenario_event_join,
+    "company_post": scenario_company_post,
+}
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario '{name}', choose from: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def setup(ctx: Ctx) -> None:
+    """Company account + community for posting, ids to pick from in read scenarios."""
+    phone = _rand_phone()
+    await ctx.client.post("/auth/company/otp/request", json={"phone": phone})
+    r = await ctx.client.post("/auth/company/otp/verify", json={"phone": phone, "code": "11111"})
+    if r.status_code == 200:
+        ctx.company_token = r.json()["access_token"]
+        r = await ctx.client.post("/communities/", json={"name": "Load test community"}, headers=_auth(ctx.company_token))
+        if r.status_code == 200:
+            ctx.company_community_id = r.json()["id"]
+    r = await ctx.client.get("/communities/")
+    if r.status_code == 200:
+        ctx.community_ids = [c["id"] for c in r.json()]
+    r = await ctx.client.get("/events/upcoming", params={"limit": 100})
+    if r.status_code == 200:
+        ctx.event_ids = [e["id"] for e in r.json()]
+
+
+async def virtual_user(ctx: Ctx, mix: dict[str, float], deadline: float, think_ms: int) -> int:
+    token = await login(ctx)
+    names, weights = list(mix), list(mix.values())
+    done = 0
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        await SCENARIOS[name](ctx, token)
+        done += 1
+        if think_ms:
+            await asyncio.sleep(random.uniform(0, think_ms) / 1000.0)
+    return done
+
+
+def build_report(stats: dict[str, EndpointStats], elapsed: float) -> dict[str, Any]:
+    endpoints = {}
+    attempts = total = errors = 0
+    for name in sorted(stats):
+        st = stats[name]
+        n = len(st.latencies_ms)
+        attempts += st.attempts
+        total += n
+        errors += st.errors
+        endpoints[name] = {
+            "attempts": st.attempts,
+            "requests": n,
+            "errors": st.errors,
+            "rps": round(n / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(st.percentile(50), 2),
+            "p95_ms": round(st.percentile(95), 2),
+            "p99_ms": round(st.percentile(99), 2),
+            "db_queries_avg": round(sum(st.queries) / len(st.queries), 2) if st.queries else None,
+            "db_queries_max": max(st.queries) if st.queries else None,
+        }
+    return {
+        "elapsed_s": round(elapsed, 2),
+        # requests counts responses (the latency sample); the error rate is taken over attempts
+        "attempts": attempts,
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"\n{report['requests']} requests ({report['attempts']} attempted) in {report['elapsed_s']}s "
+          f"({report['throughput_rps']} req/s), errors: {report['errors']}")
+    header = f"{'endpoint':<52}{'n':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'db q':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, e in report["endpoints"].items():
+        q = "-" if e["db_queries_avg"] is None else f"{e['db_queries_avg']:.1f}"
+        print(f"{name:<52}{e['requests']:>8}{e['errors']:>6}{e['rps']:>9.1f}"
+              f"{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}{q:>7}")
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    mix = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    lifespan = None
+    if args.in_process:
+        # every virtual user shares one client address; per-IP OTP limits would reject the logins
+        os.environ.setdefault("OTP_REQUEST_PER_IP", "0")
+        os.environ.setdefault("OTP_VERIFY_PER_IP", "0")
+        from app.main import app
+
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url.rstrip("/"), limits=limits, timeout=args.timeout)
+    try:
+        ctx = Ctx(client=client, stats={})
+        await setup(ctx)
+        t0 = time.perf_counter()
+        deadline = t0 + args.duration
+        done = await asyncio.gather(*(
+            virtual_user(ctx, mix, deadline, args.think_ms) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - t0
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    report = build_report(ctx.stats, elapsed)
+    report["scenarios_completed"] = sum(done)
+    report["concurrency"] = args.concurrency
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Scenario-driven API load test")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="Service base URL, e.g. http://localhost:8000")
+    target.add_argument("--in-process", action="store_true", help="Drive the ASGI app in-process")
+    parser.add_argument("--concurrency", type=int, default=20, help="Number of virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--think-ms", type=int, default=0, help="Random pause between scenarios, up to N ms")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout, seconds")
+    parser.add_argument("--json", default=None, help="Write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Fail if any endpoint p95 exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Fail if errors/attempted requests exceeds this")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    failed = False
+    if args.max_p95_ms is not None:
+        for name, e in report["endpoints"].items():
+            if e["p95_ms"] > args.max_p95_ms:
+                print(f"FAIL: {name} p95 {e['p95_ms']}ms > {args.max_p95_ms}ms")
+                failed = True
+    if report["attempts"] and not report["requests"]:
+        print(f"FAIL: none of {report['attempts']} requests got a response")
+        failed = True
+    if args.max_error_rate is not None and report["attempts"]:
+        rate = report["errors"] / report["attempts"]
+        if rate > args.max_error_rate:
+            print(f"FAIL: error rate {rate:.3%} > {args.max_error_rate:.3%}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,65 @@
+"""
+Delete media nothing references: `media` rows not used by any post/event, company media,
+avatar, logo or story, their files, and files in the media root that have no `media` row
+(left behind by `delete_post_media`, re-seeding, crashed uploads).
+
+Works in chunks with bounded memory (see `app/usecases/media_gc.py`), so it finishes on
+millions of rows/files. Rows and files younger than `--min-age-hours` are kept. An
+interrupted run continues from its checkpoint with `--resume`.
+
+Usage (Docker):
+  docker compose exec api python -m app.scripts.media_gc --dry-run
+  docker compose exec api python -m app.scripts.media_gc --workers 16 --rate 500
+  docker compose exec api python -m app.scripts.media_gc --resume
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import timedelta
+
+from app.adapters.db import async_session
+from app.core.config import settings
+from app.infrastructure.services.storage import LocalFileStorage
+from app.usecases.media_gc import MediaGC
+
+
+async def run(args: argparse.Namespace) -> None:
+    storage = LocalFileStorage(root=args.root, public_prefix="/media")
+    gc = MediaGC(
+        async_session,
+        storage,
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        rate=args.rate,
+        min_age=timedelta(hours=args.min_age_hours),
+        checkpoint_path=args.checkpoint or os.path.join(args.root, ".media-gc.json"),
+        resume=args.resume,
+    )
+    stats = await gc.run(rows=not args.files_only, files=not args.rows_only)
+    prefix = "Would delete" if args.dry_run else "Deleted"
+    print(f"{prefix} {stats.rows_orphaned if args.dry_run else stats.rows_deleted} media row(s) and "
+          f"{stats.files_orphaned if args.dry_run else stats.files_deleted} file(s) without a row")
+    if not args.dry_run:
+        print(f"Freed {stats.bytes_freed / 2**20:.1f} MiB; {stats.errors} error(s)")
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Garbage-collect unreferenced media rows and files")
+    ap.add_argument("--dry-run", action="store_true", help="Only count what would be deleted")
+    ap.add_argument("--root", default=settings.MEDIA_ROOT, help="media directory")
+    ap.add_argument("--batch-size", type=int, default=1000, help="rows/files per chunk")
+    ap.add_argument("--workers", type=int, default=8, help="parallel file deletes")
+    ap.add_argument("--rate", type=float, default=0, help="max file deletes per second (0 = unlimited)")
+    ap.add_argument("--min-age-hours", type=float, default=24, help="keep rows/files younger than this")
+    ap.add_argument("--checkpoint", help="checkpoint file (default: <root>/.media-gc.json)")
+    ap.add_argument("--resume", action="store_true", help="continue an interrupted run from its checkpoint")
+    only = ap.add_mutually_exclusive_group()
+    only.add_argument("--rows-only", action="store_true", help="skip the file scan")
+    only.add_argument("--files-only", action="store_true", help="skip unreferenced rows")
+    asyncio.run(run(ap.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
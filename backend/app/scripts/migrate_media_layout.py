@@ -0,0 +1,61 @@
+"""
+Move uploads from the former flat layout (`/data/media/<uid>.<ext>`) to the sharded one
+(`/data/media/ab/cd/<uid>.<ext>`, see `LocalFileStorage`).
+
+Online: the API keeps serving while files move, reads fall back to the flat path, and every
+move is a single rename on the same filesystem. Files are moved in batches on a thread pool;
+the directory is re-scanned until a pass finds nothing left, so it is safe to interrupt and
+re-run.
+
+Usage (Docker):
+  docker compose exec api python -m app.scripts.migrate_media_layout --dry-run
+  docker compose exec api python -m app.scripts.migrate_media_layout --workers 16
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from app.core.config import settings
+from app.infrastructure.services.storage import UID_PATTERN, LocalFileStorage
+
+
+def migrate(storage: LocalFileStorage, *, workers: int = 8, batch_size: int = 1000, dry_run: bool = False) -> tuple[int, int]:
+    """Returns (moved, skipped) where skipped are files not named like an upload."""
+    moved = skipped = 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            moved_in_pass = 0
+            entries = storage.iter_legacy()
+            while batch := list(islice(entries, batch_size)):
+                names = [e.name for e in batch if UID_PATTERN.match(e.name.split(".", 1)[0])]
+                skipped += len(batch) - len(names)
+                if dry_run or not names:
+                    moved_in_pass += len(names) if dry_run else 0
+                    continue
+                moved_in_pass += sum(pool.map(storage.move_to_shard, names))
+                print(f"moved {moved + moved_in_pass} file(s), {(moved + moved_in_pass) / (time.perf_counter() - t0):.0f}/s")
+            moved += moved_in_pass
+            # entries renamed away while the directory is read may hide others; re-scan until clean
+            if dry_run or moved_in_pass == 0:
+                return moved, skipped
+            skipped = 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Move media files into the sharded directory layout")
+    ap.add_argument("--root", default=settings.MEDIA_ROOT, help="media directory")
+    ap.add_argument("--workers", type=int, default=8, help="parallel renames")
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.add_argument("--dry-run", action="store_true", help="Only count files to move")
+    args = ap.parse_args(argv)
+    moved, skipped = migrate(
+        LocalFileStorage(root=args.root), workers=args.workers, batch_size=args.batch_size, dry_run=args.dry_run
+    )
+    print(f"{'Would move' if args.dry_run else 'Moved'} {moved} file(s); left {skipped} file(s) not named like uploads")
+
+
+if __name__ == "__main__":
+    main()
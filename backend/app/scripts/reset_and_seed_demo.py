@@ -32,7 +32,6 @@ from sqlalchemy import text, select, update, delete
 
 from app.adapters.db import engine, async_session
 from app.infrastructure.repos.sql_models import (
-    Base,
     UserModel,
     ProfileModel,
     CompanyModel,
@@ -61,28 +60,13 @@ from app.infrastructure.repos.post_repo import PostRepo
 from app.infrastructure.repos.event_repo import EventRepo
 from app.infrastructure.repos.case_repo import CaseRepo
 from app.infrastructure.repos.media_repo import MediaRepo
+from app.migrations.ledger import run_migrations
 
 
 def _log(msg: str) -> None:
     print(msg)
 
 
-async def ensure_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
-async def migrate_add_company_phone_column() -> None:
-    """Ensure companies.phone column exists (safe for old DBs)."""
-    async with engine.begin() as conn:
-        try:
-            await conn.execute(text("ALTER TABLE companies ADD COLUMN IF NOT EXISTS phone varchar"))
-            await conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_companies_phone ON companies(phone)"))
-        except Exception:
-            # Best-effort; ignore if DB variant doesn't support IF NOT EXISTS
-            pass
-
-
 async def clear_db_keep_refs() -> None:
     """Delete rows from content tables, preserving spheres/skills/statuses."""
     async with engine.begin() as conn:
@@ -447,15 +431,8 @@ async def seed_events(session, ids: dict, media_map: Dict[str, str]) -> None:
 
 
 async def run(base_url: str, media_dir: str) -> None:
-    await ensure_tables()
-    # Ensure cases table and columns are compatible with current code
-    # 1) Create table/index if needed; 2) Rename legacy 'points' -> 'solutions_count'
-    from app.scripts.migrate_add_cases_table import _ensure_table_and_index, _migrate_points_to_solutions_count  # type: ignore
-    async with engine.begin() as conn:
-        flavor = await _ensure_table_and_index(conn)
-        await _migrate_points_to_solutions_count(conn, flavor)
-    # Lightweight migration to add companies.phone if missing
-    await migrate_add_company_phone_column()
+    # Bring the schema up to date (tables, cases.solutions_count, companies.phone, ...)
+    await run_migrations(engine)
     _log("Clearing DB (keeping references)...")
     await clear_db_keep_refs()
     _log("Uploading media...")
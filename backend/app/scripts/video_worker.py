@@ -0,0 +1,56 @@
+"""
+Run video jobs outside the API (see `app/usecases/video.py`): on a dedicated machine with
+ffmpeg, or to drain the queue once. `--backfill` first queues the videos uploaded before the
+pipeline existed.
+
+Usage (Docker):
+  docker compose exec api python -m app.scripts.video_worker --backfill --once
+  docker compose exec api python -m app.scripts.video_worker --workers 4
+"""
+
+import argparse
+import asyncio
+
+from app.adapters.db import async_session
+from app.core.config import settings
+from app.infrastructure.repos.video_job_repo import VideoJobRepo
+from app.infrastructure.services.storage import LocalFileStorage
+from app.usecases.jobs import JobRunner
+from app.usecases.video import VIDEO_JOB, VideoPipeline, enqueue_video
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.backfill:
+        async with async_session() as s:
+            async with s.begin():
+                ids = await VideoJobRepo(s).enqueue_unprocessed()
+                for media_id in ids:
+                    await enqueue_video(s, media_id, state=False)
+        print(f"Enqueued {len(ids)} video(s)")
+    pipeline = VideoPipeline(async_session, LocalFileStorage(root=args.root, public_prefix="/media"), args.workers)
+    if not pipeline.available:
+        raise SystemExit(f"Video pipeline unavailable: check VIDEO_PIPELINE_ENABLED and {settings.FFMPEG_BIN}/{settings.FFPROBE_BIN}")
+    runner = JobRunner(async_session, concurrency=args.workers)
+    runner.register(VIDEO_JOB, pipeline.process)
+    try:
+        if args.once:
+            await runner.run_until_idle()
+        else:
+            runner.start()
+            await asyncio.Event().wait()
+    finally:
+        await runner.stop()
+        pipeline.shutdown()
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Transcode uploaded videos (poster, duration, HLS)")
+    ap.add_argument("--root", default=settings.MEDIA_ROOT, help="media directory")
+    ap.add_argument("--workers", type=int, default=settings.VIDEO_WORKERS, help="parallel transcodes")
+    ap.add_argument("--backfill", action="store_true", help="Enqueue videos that have no job yet")
+    ap.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    asyncio.run(run(ap.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
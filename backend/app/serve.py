@@ -0,0 +1,91 @@
+"""
+Production entry point.
+
+Applies pending migrations once in the launcher process, then starts N uvicorn workers
+sharing one listening socket (uvloop/httptools when installed). Each worker runs the app
+startup (pool warm-up) before it accepts connections. On SIGTERM workers stop accepting,
+finish in-flight requests for up to GRACEFUL_TIMEOUT seconds and exit.
+
+Usage:
+  python -m app.serve
+  python -m app.serve --workers 8 --port 8000 --access-log
+
+Env: WEB_CONCURRENCY (0 = one worker per available CPU), HOST, PORT, GRACEFUL_TIMEOUT.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from importlib.util import find_spec
+
+import uvicorn
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.serve")
+
+
+def cpu_count() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 CPU quota (containers)."""
+    try:
+        n = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non-Linux
+        n = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            n = min(n, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, n)
+
+
+async def _migrate() -> None:
+    from app.adapters.db import engine
+    from app.migrations.ledger import run_migrations
+
+    applied = await run_migrations(engine)
+    if applied:
+        logger.info("applied %d migration(s) before starting workers", applied)
+    # workers are spawned processes with their own engines; drop ours before serving
+    await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Run the API with multiple workers")
+    ap.add_argument("--workers", type=int, default=settings.WEB_CONCURRENCY or cpu_count())
+    ap.add_argument("--host", default=settings.HOST)
+    ap.add_argument("--port", type=int, default=settings.PORT)
+    ap.add_argument("--access-log", action="store_true", help="Log every request (off by default for throughput)")
+    ap.add_argument("--skip-migrations", action="store_true")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if not args.skip_migrations:
+        asyncio.run(_migrate())
+    # already applied above (or deliberately skipped); workers must not race for the lock
+    os.environ["MIGRATE_ON_STARTUP"] = "0"
+
+    loop = "uvloop" if sys.platform != "win32" and find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    logger.info("starting %d worker(s) on %s:%d (loop=%s, http=%s)", args.workers, args.host, args.port, loop, http)
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        lifespan="on",
+        access_log=args.access_log,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
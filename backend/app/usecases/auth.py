@@ -1,6 +1,8 @@
 from app.core.config import settings
-from app.core.security import create_access_token, hash_password, verify_password
+from app.core.security import create_access_token, hash_password_async, verify_and_update_password
 from app.domain.repositories import IUserRepo, IOTPRepo, ICompanyRepo
+from app.infrastructure.repos.otp_repo import OTPRepo
+from datetime import datetime, timedelta
 import random
 
 
@@ -56,12 +58,36 @@ class AuthUseCase:
             raise PermissionError("Forbidden")
         if await self.users.get_by_email(email):
             raise ValueError("Email already registered")
-        ph = hash_password(password)
+        ph = await hash_password_async(password)
         user = await self.users.create_admin(email, ph)
         return create_access_token(subject=user.id, role="admin")
 
     async def admin_login(self, email: str, password: str) -> str:
         user = await self.users.get_by_email(email)
-        if not user or user.role != "admin" or not user.password_hash or not verify_password(password, user.password_hash):
+        if not user or user.role != "admin" or not user.password_hash:
             raise ValueError("Invalid credentials")
+        ok, new_hash = await verify_and_update_password(password, user.password_hash)
+        if not ok:
+            raise ValueError("Invalid credentials")
+        if new_hash:
+            # BCRYPT_ROUNDS changed since this hash was made
+            await self.users.set_password_hash(user.id, new_hash)
         return create_access_token(subject=user.id, role="admin")
+
+
+OTP_PURGE_JOB = "otp.purge"
+
+
+async def purge_otps(session_factory, batch_size: int | None = None, grace_seconds: int = 60) -> int:
+    """Delete expired OTP rows (consumed ones included) in batches, one short transaction per batch."""
+    batch_size = batch_size or settings.OTP_PURGE_BATCH_SIZE
+    # a small grace period so a code expiring right now is not deleted under a running verify
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    total = 0
+    while True:
+        async with session_factory() as session:
+            async with session.begin():
+                n = await OTPRepo(session).purge(cutoff, batch_size)
+        total += n
+        if n < batch_size:
+            return total
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.domain.repositories import OnCommit
+from app.infrastructure.repos.content_bulk_repo import ContentBulkRepo
+from app.usecases.events import invalidate_upcoming
+from app.infrastructure.repos.sql_models import uid
+
+
+def _dedupe(ids: list[str] | None) -> list[str]:
+    out: list[str] = []
+    seen: set[str] = set()
+    for i in ids or []:
+        i = (i or "").strip()
+        if i and i not in seen:
+            out.append(i)
+            seen.add(i)
+    return out
+
+
+class BulkContentUseCase:
+    """Create many posts/events in one transaction.
+
+    Items arrive already validated by schema as ``(index, data)`` pairs. Reference
+    errors (unknown community/media/skill) are collected per item; valid items are
+    still inserted.
+    """
+
+    def __init__(self, repo: ContentBulkRepo, on_commit: OnCommit | None = None):
+        self.repo = repo
+        self.on_commit = on_commit
+
+    async def create_posts(self, items: list[tuple[int, dict]]) -> tuple[list[tuple[int, str]], list[tuple[int, Any]]]:
+        return await self._create("post", items)
+
+    async def create_events(self, items: list[tuple[int, dict]]) -> tuple[list[tuple[int, str]], list[tuple[int, Any]]]:
+        invalidate_upcoming(self.on_commit)
+        return await self._create("event", items)
+
+    async def _create(self, kind: str, items: list[tuple[int, dict]]):
+        for _, data in items:
+            data["skill_ids"] = _dedupe(data.get("skill_ids"))
+            if kind == "post":
+                data["media_uids"] = _dedupe(data.get("media_uids"))
+
+        community_ids = {d["community_id"] for _, d in items}
+        media_ids: set[str] = set()
+        skill_ids: set[str] = set()
+        for _, d in items:
+            skill_ids.update(d["skill_ids"])
+            if kind == "post":
+                media_ids.update(d["media_uids"])
+            elif d.get("media_id"):
+                media_ids.add(d["media_id"])
+        known_communities, known_media, known_skills = await self.repo.existing_ids(
+            community_ids=list(community_ids), media_ids=list(media_ids), skill_ids=list(skill_ids)
+        )
+
+        created: list[tuple[int, str]] = []
+        errors: list[tuple[int, Any]] = []
+        content_rows: list[dict] = []
+        media_links: list[dict] = []
+        skill_links: list[dict] = []
+        now = datetime.utcnow()
+        for pos, (index, d) in enumerate(items):
+            problems: list[str] = []
+            if d["community_id"] not in known_communities:
+                problems.append(f"Community not found: {d['community_id']}")
+            item_media = d["media_uids"] if kind == "post" else ([d["media_id"]] if d.get("media_id") else [])
+            missing_media = [m for m in item_media if m not in known_media]
+            if missing_media:
+                problems.append(f"Media not found: {', '.join(missing_media)}")
+            missing_skills = [s for s in d["skill_ids"] if s not in known_skills]
+            if missing_skills:
+                problems.append(f"Invalid skill_ids: {', '.join(missing_skills)}")
+            if problems:
+                errors.append((index, "; ".join(problems)))
+                continue
+
+            content_id = uid()
+            tags = d.get("tags")
+            row = dict(
+                id=content_id,
+                community_id=d["community_id"],
+                type=kind,
+                title=d["title"],
+                # keep batch order stable in created_at-sorted feeds
+                created_at=now + timedelta(microseconds=pos),
+                tags=",".join(tags) if tags else None,
+                cost=d.get("cost"),
+                participant_payout=d.get("participant_payout"),
+                body=None,
+                event_date=None,
+                city=None,
+                location=None,
+                description=None,
+                registration=None,
+                format=None,
+                media_id=None,
+            )
+            if kind == "post":
+                row["body"] = d["body"]
+                media_links.extend(
+                    dict(id=uid(), content_id=content_id, media_id=mid, order_index=i)
+                    for i, mid in enumerate(d["media_uids"])
+                )
+            else:
+                for k in ("event_date", "city", "location", "description", "registration", "format", "media_id"):
+                    row[k] = d.get(k)
+            content_rows.append(row)
+            skill_links.extend(dict(id=uid(), content_id=content_id, skill_id=sid) for sid in d["skill_ids"])
+            created.append((index, content_id))
+
+        await self.repo.insert_many(content_rows, media_links, skill_links)
+        return created, errors
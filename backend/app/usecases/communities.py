@@ -1,14 +1,17 @@
-from app.domain.repositories import ICommunityRepo, IMembershipRepo, IFollowRepo
+from app.domain.repositories import ICommunityRepo, IMembershipRepo, IFollowRepo, OnCommit
+from app.usecases.companies import invalidate_company
 
 
 class CommunityUseCase:
-    def __init__(self, communities: ICommunityRepo, members: IMembershipRepo, follows: IFollowRepo):
+    def __init__(self, communities: ICommunityRepo, members: IMembershipRepo, follows: IFollowRepo,
+                 on_commit: OnCommit | None = None):
         self.communities = communities
         self.members = members
         self.follows = follows
+        self.on_commit = on_commit
 
     async def create(self, *, name: str, company_id: str | None, tags: list[str], description: str | None = None, telegram_url: str | None = None, logo_media_id: str | None = None):
-        return await self.communities.create(
+        community = await self.communities.create(
             name=name,
             company_id=company_id,
             tags=tags,
@@ -17,12 +20,25 @@ class CommunityUseCase:
             logo_media_id=logo_media_id,
             is_archived=False,
         )
+        # company pages list their communities
+        invalidate_company(self.on_commit, company_id)
+        return community
 
     async def update(self, community_id: str, **data):
-        return await self.communities.update(community_id, **data)
+        before = await self.communities.get(community_id) if "company_id" in data else None
+        community = await self.communities.update(community_id, **data)
+        if community:
+            invalidate_company(self.on_commit, community.company_id)
+            # moved to another company: the old page lists it too
+            if before is not None and before.company_id != community.company_id:
+                invalidate_company(self.on_commit, before.company_id)
+        return community
 
     async def archive(self, community_id: str):
-        return await self.communities.archive(community_id)
+        community = await self.communities.archive(community_id)
+        if community:
+            invalidate_company(self.on_commit, community.company_id)
+        return community
 
     async def follow(self, user_id: str, community_id: str):
         return await self.follows.follow(user_id, community_id)
@@ -1,16 +1,49 @@
-from app.domain.repositories import ICompanyRepo, ICompanyFollowRepo
+from typing import Optional, Sequence
+
+from app.adapters.cache import TTLCache
+from app.core.config import settings
+from app.domain.entities import Company, CompanyDetail, Skill
+from app.domain.repositories import ICompanyRepo, ICompanyFollowRepo, IMediaRepo, OnCommit
+from app.infrastructure.repos.community_repo import CommunityRepo
+from app.infrastructure.repos.company_repo import CompanyRepo
+from app.infrastructure.repos.media_repo import MediaRepo
+from app.infrastructure.repos.reference_repo import ReferenceRepo
+
+# company pages by company id; shared read-only between requests
+company_detail_cache = TTLCache("company_detail", ttl=settings.COMPANY_DETAIL_CACHE_TTL, maxsize=1024)
+
+
+def invalidate_company(on_commit: OnCommit | None, company_id: str | None) -> None:
+    """Drop the cached page once the caller's transaction commits; earlier, a concurrent read could
+    cache the old data again. Without a hook it goes at once."""
+    if not company_id:
+        return
+    if on_commit is None:
+        company_detail_cache.invalidate(company_id)
+    else:
+        on_commit(lambda: company_detail_cache.invalidate(company_id))
 
 
 class CompanyUseCase:
-    def __init__(self, companies: ICompanyRepo, company_follows: ICompanyFollowRepo | None = None):
+    def __init__(self, companies: ICompanyRepo, company_follows: ICompanyFollowRepo | None = None, media: IMediaRepo | None = None,
+                 on_commit: OnCommit | None = None):
         self.companies = companies
         self.company_follows = company_follows
+        self.media = media
+        self.on_commit = on_commit
 
     async def create(self, *, name: str, description: str | None = None, tags: list[str] | None = None):
         return await self.companies.create(name=name, description=description, tags=tags)
 
-    async def update(self, company_id: str, **data):
-        return await self.companies.update(company_id, **data)
+    async def update(self, company_id: str, media_uids: list[str] | None = None, **data):
+        # a media-only update has no columns to set
+        company = await (self.companies.update(company_id, **data) if data else self.companies.get(company_id))
+        if media_uids is not None:
+            if not self.media:
+                raise RuntimeError("Media repo is not configured")
+            await self.media.replace_for_company(company_id, media_uids)
+        invalidate_company(self.on_commit, company_id)
+        return company
 
     async def get_companies_for_user(self, user_id: str):
         return await self.companies.get_companies_for_user(user_id)
@@ -29,3 +62,42 @@ class CompanyUseCase:
         if not self.company_follows:
             return []
         return await self.company_follows.list_companies_for_user(user_id)
+
+
+class CompanyReadModel:
+    """Company payloads in a constant number of queries.
+
+    Lists resolve the skills of all companies in one query. A detail page is four queries
+    (company, communities with member counts, media, skills), run one after another on the
+    request's session: loading them on extra pooled connections would let a few concurrent
+    cold requests exhaust the pool while each holds its own. Details are cached per company,
+    see `invalidate_company`.
+    """
+
+    def __init__(self, session):
+        self.s = session
+
+    async def skills_for(self, companies: Sequence[Company]) -> dict[str, list[Skill]]:
+        """company id -> its skills (company tags are skill ids), in tag order."""
+        found = await ReferenceRepo(self.s).skills_by_ids([t for c in companies for t in c.tags])
+        return {c.id: [found[t] for t in c.tags if t in found] for c in companies}
+
+    async def detail(self, company_id: str, version: str | None = None) -> Optional[CompanyDetail]:
+        """With `version` (the page's ETag) a copy cached for another version is reloaded, so the
+        cache never serves a page older than the tag sent with it."""
+        cached = company_detail_cache.get(company_id)
+        if cached is not None and (version is None or cached[0] == version):
+            return cached[1]
+        detail = await self._load_detail(company_id)
+        if detail is not None:
+            company_detail_cache.set(company_id, (version, detail))
+        return detail
+
+    async def _load_detail(self, company_id: str) -> Optional[CompanyDetail]:
+        company = await CompanyRepo(self.s).get(company_id)
+        if company is None:
+            return None
+        communities = await CommunityRepo(self.s).list_for_company_with_counts(company_id)
+        media = await MediaRepo(self.s).list_for_company(company_id)
+        skills = (await self.skills_for([company]))[company.id]
+        return CompanyDetail(company=company, skills=skills, media=list(media), communities=list(communities))
@@ -1,4 +1,8 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
 from app.domain.repositories import IPostRepo, IStoryRepo, IMediaRepo, ICompanyFollowRepo
+from app.infrastructure.repos.story_repo import StoryRepo
 
 
 class ContentUseCase:
@@ -49,8 +53,8 @@ class ContentUseCase:
     async def get_story_full(self, story_id: str):
         story = await self.stories.get(story_id)
         m = None
-        if getattr(story, "media_url", None):
-            m = await self.media.get(story.media_url)
+        if getattr(story, "media_id", None):
+            m = await self.media.get(story.media_id)
         return story, m
 
     async def get_post(self, post_id: str):
@@ -72,11 +76,35 @@ class ContentUseCase:
     async def get_story(self, story_id: str):
         return await self.stories.get(story_id)
 
-    async def posts_from_followed_communities(self, user_id: str, limit: int = 20):
-        return await self.posts.list_for_followed_communities(user_id, limit)
+    async def posts_from_followed_communities(self, user_id: str, limit: int = 20, unseen_only: bool = False):
+        return await self.posts.list_for_followed_communities(user_id, limit, unseen_only=unseen_only)
 
     async def stories_for_followed_companies(self, user_id: str, limit: int = 20):
-        if not self.company_follows:
-            return []
-        company_ids = await self.company_follows.list_company_ids_for_user(user_id)
-        return await self.stories.list_for_companies(company_ids, limit)
+        return await self.stories.list_for_follower(user_id, limit)
+
+    async def story_rings(self, user_id: str, limit: int = 20, per_ring: int = 20):
+        return await self.stories.list_rings(user_id, limit, per_ring)
+
+    async def mark_story_seen(self, user_id: str, story_id: str) -> None:
+        if not await self.stories.mark_seen(user_id, story_id):
+            raise ValueError("Story not found")
+
+
+STORY_PURGE_JOB = "story.purge"
+
+
+async def purge_stories(session_factory, batch_size: int = 1000) -> int:
+    """Delete expired stories, then seen markers no live story can be older than; batch per transaction."""
+    now = datetime.utcnow()
+    # any story created before this has expired, so markers below it cover nothing
+    seen_cutoff = now - timedelta(hours=settings.STORY_TTL_HOURS)
+    total = 0
+    for purge, cutoff in ((StoryRepo.purge_expired, now), (StoryRepo.purge_seen, seen_cutoff)):
+        while True:
+            async with session_factory() as session:
+                async with session.begin():
+                    n = await purge(StoryRepo(session), cutoff, batch_size)
+            total += n
+            if n < batch_size:
+                break
+    return total
@@ -1,9 +1,26 @@
-from app.domain.repositories import IEventRepo
+from app.adapters.cache import TTLCache
+from app.core.config import settings
+from app.domain.repositories import IEventRepo, IReminderRepo, OnCommit
+from app.usecases.reminders import reminder_times
+
+# public upcoming list keyed by limit; dropped once a change commits in this worker, TTL-bound elsewhere
+upcoming_events_cache = TTLCache("upcoming_events", ttl=settings.UPCOMING_EVENTS_CACHE_TTL, maxsize=16)
+
+
+def invalidate_upcoming(on_commit: OnCommit | None) -> None:
+    """Drop the upcoming list once the caller's transaction commits; dropped earlier, a concurrent
+    read could cache the list without the change for the whole TTL. Without a hook it goes at once."""
+    if on_commit is None:
+        upcoming_events_cache.invalidate()
+    else:
+        on_commit(upcoming_events_cache.invalidate)
 
 
 class EventsUseCase:
-    def __init__(self, events: IEventRepo):
+    def __init__(self, events: IEventRepo, reminders: IReminderRepo | None = None, on_commit: OnCommit | None = None):
         self.events = events
+        self.reminders = reminders
+        self.on_commit = on_commit
 
     async def upcoming_for_user(self, user_id: str, limit: int = 20):
         return await self.events.list_for_user(user_id, limit)
@@ -12,13 +29,30 @@ class EventsUseCase:
         return await self.events.list_joined_for_user(user_id, limit)
 
     async def upcoming_all(self, limit: int = 20):
-        return await self.events.list_all_upcoming(limit)
+        return list(await upcoming_events_cache.get_or_load(limit, lambda: self.events.list_all_upcoming(limit)))
 
     async def join(self, user_id: str, event_id: str):
-        return await self.events.join(user_id, event_id)
+        participant = await self.events.join(user_id, event_id)
+        if self.reminders is not None:
+            event = await self.events.get(event_id)
+            if event is not None:
+                await self.reminders.schedule_for_user(user_id, event_id, reminder_times(event.event_date))
+        return participant
 
     async def unjoin(self, user_id: str, event_id: str):
-        return await self.events.unjoin(user_id, event_id)
+        await self.events.unjoin(user_id, event_id)
+        if self.reminders is not None:
+            await self.reminders.cancel_for_user(user_id, event_id)
+
+    async def update(self, event_id: str, **data):
+        before = await self.events.get(event_id)
+        if before is None:
+            return None
+        event = await self.events.update(event_id, **data)
+        invalidate_upcoming(self.on_commit)
+        if self.reminders is not None and event.event_date != before.event_date:
+            await self.reminders.reschedule_event(event_id, reminder_times(event.event_date))
+        return event
 
     async def create(
         self,
@@ -37,6 +71,7 @@ class EventsUseCase:
         cost: int | None = None,
         participant_payout: int | None = None,
     ):
+        invalidate_upcoming(self.on_commit)
         return await self.events.create(
             community_id=community_id,
             title=title,
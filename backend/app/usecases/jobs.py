@@ -0,0 +1,213 @@
+"""Durable background jobs: the `jobs` table plus a runner in every API process.
+
+Request handlers call `enqueue` inside their own transaction and return; the job becomes
+visible once the request commits. A runner claims due jobs of the kinds it has handlers for
+(highest priority first; `FOR UPDATE SKIP LOCKED` on PostgreSQL, so runners never wait on
+each other), runs up to JOB_CONCURRENCY of them at once (a kind may have a lower limit of its
+own) and renews their lease while they run. A failing job is retried with exponential backoff
+until it has used `max_attempts`; a job whose process died is claimed again when its lease runs
+out. Handlers must therefore be idempotent.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.domain.entities import Job
+from app.infrastructure.repos.job_repo import JobRepo
+
+logger = logging.getLogger("app.jobs")
+
+JOB_PURGE_JOB = "jobs.purge"
+
+Handler = Callable[[Job], Awaitable[object]]
+
+
+@dataclass
+class JobKind:
+    handler: Handler
+    # own limit of jobs running at once; None: shares the runner's slots
+    concurrency: int | None = None
+    timeout: float | None = None
+
+
+async def enqueue(session, kind: str, payload: dict | None = None, *, priority: int = 0, delay: float = 0,
+                  run_at: datetime | None = None, key: str | None = None,
+                  max_attempts: int | None = None) -> str | None:
+    """Queue a job in the caller's transaction; None if an unfinished job with `key` exists."""
+    if run_at is None and delay:
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+    return await JobRepo(session).enqueue(
+        kind, payload or {}, priority=priority, run_at=run_at, key=key, max_attempts=max_attempts
+    )
+
+
+async def schedule(session_factory, kind: str, interval: float, payload: dict | None = None,
+                   **kwargs) -> str | None:
+    """Queue a periodic job in its own transaction, at most once per `interval` seconds: every
+    worker may call this. The key names the interval's time bucket, so workers racing in one
+    bucket insert one job; a job of the bucket that has already finished (and released its key)
+    is found by its creation time."""
+    bucket = int(time.time() // interval)
+    kwargs.setdefault("key", f"{kind}:{bucket}")
+    async with session_factory() as session:
+        async with session.begin():
+            if await JobRepo(session).created_since(kind, datetime.utcfromtimestamp(bucket * interval)):
+                return None
+            return await enqueue(session, kind, payload, **kwargs)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before attempt `attempts + 1`: doubling from JOB_RETRY_BASE_SECONDS, capped, +-20% jitter."""
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def purge_jobs(session_factory, batch_size: int = 1000) -> int:
+    """Delete done/cancelled jobs older than JOB_RETENTION_HOURS, one short transaction per batch."""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.JOB_RETENTION_HOURS)
+    total = 0
+    while True:
+        async with session_factory() as session:
+            async with session.begin():
+                n = await JobRepo(session).purge_finished(cutoff, batch_size)
+        total += n
+        if n < batch_size:
+            return total
+
+
+class JobRunner:
+    def __init__(self, session_factory, concurrency: int | None = None, poll_interval: float | None = None):
+        self.session_factory = session_factory
+        self.concurrency = settings.JOB_CONCURRENCY if concurrency is None else concurrency
+        self.poll_interval = settings.JOB_POLL_SECONDS if poll_interval is None else poll_interval
+        self.kinds: dict[str, JobKind] = {}
+        # job id -> (task, kind)
+        self._running: dict[str, tuple[asyncio.Task, str]] = {}
+        self._loop_task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+        self._extended_at = 0.0
+
+    def register(self, kind: str, handler: Handler, *, concurrency: int | None = None,
+                 timeout: float | None = None) -> None:
+        self.kinds[kind] = JobKind(handler, concurrency, timeout)
+
+    def start(self) -> None:
+        if self.kinds and self.concurrency > 0 and self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop(), name="jobs:runner")
+
+    async def stop(self) -> None:
+        """Stop claiming; interrupted jobs go back to the queue for another process."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        tasks = [t for t, _ in self._running.values()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _slots(self) -> list[tuple[list[str], int]]:
+        """(kinds, free slots) groups to claim for, respecting the per-kind limits."""
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return []
+        inflight = Counter(kind for _, kind in self._running.values())
+        shared = [k for k, spec in self.kinds.items() if spec.concurrency is None]
+        groups = [(shared, free)] if shared else []
+        for kind, spec in self.kinds.items():
+            if spec.concurrency is not None and spec.concurrency - inflight[kind] > 0:
+                groups.append(([kind], spec.concurrency - inflight[kind]))
+        return groups
+
+    async def run_once(self) -> int:
+        """Renew the leases of running jobs, claim what fits into the free slots and start it;
+        returns the number of jobs started."""
+        loop = asyncio.get_running_loop()
+        lease_until = datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        claimed: list[Job] = []
+        async with self.session_factory() as s:
+            async with s.begin():
+                repo = JobRepo(s)
+                if self._running and loop.time() - self._extended_at > settings.JOB_LEASE_SECONDS / 3:
+                    await repo.extend(list(self._running), lease_until)
+                    self._extended_at = loop.time()
+                budget = self.concurrency - len(self._running)
+                for kinds, free in self._slots():
+                    if budget <= 0:
+                        break
+                    jobs = await repo.claim(kinds, min(free, budget), lease_until)
+                    budget -= len(jobs)
+                    claimed.extend(jobs)
+        # started once the claim is committed
+        for job in claimed:
+            task = asyncio.create_task(self._execute(job), name=f"jobs:{job.kind}:{job.id}")
+            self._running[job.id] = (task, job.kind)
+        return len(claimed)
+
+    async def run_until_idle(self) -> None:
+        """Work until nothing is due or running (scripts, tests)."""
+        while True:
+            # a job finishing during run_once frees its slot after the claim: look again
+            busy = bool(self._running)
+            if not await self.run_once() and not busy and not self._running:
+                return
+            await self._idle()
+
+    async def _idle(self) -> None:
+        # a finished job frees a slot: look again at once instead of after the poll interval
+        try:
+            await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                started = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("job runner: claim failed")
+                started = 0
+            if not started or len(self._running) >= self.concurrency:
+                await self._idle()
+
+    async def _execute(self, job: Job) -> None:
+        spec = self.kinds[job.kind]
+        try:
+            if spec.timeout:
+                await asyncio.wait_for(spec.handler(job), spec.timeout)
+            else:
+                await spec.handler(job)
+        except asyncio.CancelledError:
+            await self._finish(job, lambda repo: repo.release(job.id))
+            raise
+        except Exception as e:
+            retry_at = None
+            if job.attempts < job.max_attempts:
+                retry_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+            logger.warning("job %s %s failed (attempt %d/%d): %r", job.kind, job.id, job.attempts, job.max_attempts, e)
+            error = str(e) or type(e).__name__
+            await self._finish(job, lambda repo: repo.fail(job.id, error, retry_at=retry_at))
+        else:
+            await self._finish(job, lambda repo: repo.complete(job.id))
+        finally:
+            self._running.pop(job.id, None)
+            self._wake.set()
+
+    async def _finish(self, job: Job, fn: Callable[[JobRepo], Awaitable[None]]) -> None:
+        try:
+            async with self.session_factory() as s:
+                async with s.begin():
+                    await fn(JobRepo(s))
+        except Exception:
+            # left running: claimed again when its lease expires
+            logger.exception("job %s %s: could not record the result", job.kind, job.id)
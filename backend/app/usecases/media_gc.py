@@ -0,0 +1,244 @@
+"""Media garbage collection: unreferenced `media` rows and stored files without a row.
+
+Rows: `media` is walked in id order, `batch_size` ids at a time. For each id range one UNION
+over the (indexed) referencing columns returns the referenced ids of that range, so the
+orphans of a chunk are a set difference — a sorted merge that never holds more than one
+chunk. Orphan rows are deleted (the DELETE re-checks every reference), then their files.
+
+Files: a Bloom filter of all media ids (~1.2 bytes per row) is built by streaming the table,
+then the storage is scanned bucket by bucket (the legacy flat root, then each top-level
+shard directory). A file whose uid is definitely not in the filter is re-checked against the
+table in batches before it is deleted; a false positive only keeps an orphan file.
+
+Rows and files younger than `min_age` are left alone: uploads write the file before the row
+and attach the row to a post afterwards. Deletes run on a thread pool, paced to `rate` per
+second. Progress goes to a JSON checkpoint after every chunk/bucket; `resume` continues an
+interrupted run from it (with the same age cutoff). Dry runs change nothing, checkpoint included.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from app.core.bloom import BloomFilter
+from app.infrastructure.repos.media_repo import MediaRepo
+from app.infrastructure.services.storage import UID_PATTERN, IStorage
+
+@dataclass
+class GCStats:
+    rows_scanned: int = 0
+    rows_orphaned: int = 0
+    rows_deleted: int = 0
+    files_scanned: int = 0
+    files_orphaned: int = 0
+    files_deleted: int = 0
+    bytes_freed: int = 0
+    errors: int = 0
+
+
+class _Pacer:
+    """Spaces out calls to at most `rate` per second (0 = unlimited)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(self._next, now)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def _unlink(path: str) -> int:
+    try:
+        size = os.stat(path).st_size
+        os.unlink(path)
+        return size
+    except FileNotFoundError:
+        return 0
+
+
+class MediaGC:
+    def __init__(
+        self,
+        session_factory,
+        storage: IStorage,
+        *,
+        dry_run: bool = False,
+        batch_size: int = 1000,
+        workers: int = 8,
+        rate: float = 0,
+        min_age: timedelta = timedelta(hours=24),
+        checkpoint_path: str | None = None,
+        resume: bool = False,
+        bloom_error_rate: float = 0.001,
+        log: Callable[[str], None] = print,
+    ):
+        self.session_factory = session_factory
+        self.storage = storage
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.workers = workers
+        self.pacer = _Pacer(rate)
+        self.min_age = min_age
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.bloom_error_rate = bloom_error_rate
+        self.log = log
+        self.state = self._load_checkpoint() if resume else {}
+        self.stats = GCStats(**self.state.get("stats", {}))
+        started = self.state.get("started_at")
+        self.started_at = datetime.fromisoformat(started) if started else datetime.utcnow()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-gc")
+
+    # --- checkpoint ---
+    def _load_checkpoint(self) -> dict:
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            return json.loads(self.checkpoint_path.read_text())
+        return {}
+
+    def _save_checkpoint(self) -> None:
+        if self.dry_run or not self.checkpoint_path:
+            return
+        self.state["started_at"] = self.started_at.isoformat()
+        self.state["stats"] = asdict(self.stats)
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.state))
+        os.replace(tmp, self.checkpoint_path)  # atomic: a crash leaves the previous checkpoint
+
+    # --- driver ---
+    async def run(self, *, rows: bool = True, files: bool = True) -> GCStats:
+        try:
+            if rows and not self.state.get("rows_done"):
+                await self._collect_rows()
+            if files:
+                await self._collect_files()
+        finally:
+            self._executor.shutdown(wait=True)
+        if self.checkpoint_path and not self.dry_run:
+            self.checkpoint_path.unlink(missing_ok=True)
+        return self.stats
+
+    async def _delete_files(self, paths: list[str]) -> int:
+        """Unlink in parallel on the pool, paced; returns how many were removed."""
+        loop = asyncio.get_running_loop()
+
+        async def one(path: str) -> int:
+            await self.pacer.wait()
+            try:
+                freed = await loop.run_in_executor(self._executor, _unlink, path)
+            except OSError as e:
+                self.stats.errors += 1
+                self.log(f"cannot delete {path}: {e}")
+                return 0
+            self.stats.bytes_freed += freed
+            return 1
+
+        sem = asyncio.Semaphore(self.workers)
+
+        async def bounded(path: str) -> int:
+            async with sem:
+                return await one(path)
+
+        return sum(await asyncio.gather(*(bounded(p) for p in paths)))
+
+    # --- phase 1: rows nothing references ---
+    async def _collect_rows(self) -> None:
+        cutoff = self.started_at - self.min_age
+        after = self.state.get("rows_after", "")
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self.session_factory() as s:
+                repo = MediaRepo(s)
+                chunk = await repo.list_ids_after(after, self.batch_size)
+                if not chunk:
+                    break
+                hi = chunk[-1][0]
+                referenced = await repo.referenced_between(after, hi)
+            orphans = [i for i, created_at in chunk if i not in referenced and (created_at is None or created_at < cutoff)]
+            self.stats.rows_scanned += len(chunk)
+            self.stats.rows_orphaned += len(orphans)
+            if orphans and not self.dry_run:
+                async with self.session_factory() as s:
+                    async with s.begin():
+                        deleted = await MediaRepo(s).delete_unreferenced(orphans)
+                self.stats.rows_deleted += len(deleted)
+                # the row is gone first: a file left behind by a crash is caught by phase 2
+                paths = [p for p in (self.storage.path_for(i, ext) for i, ext in deleted) if os.path.exists(p)]
+                self.stats.files_deleted += await self._delete_files(paths)
+                # derived video files (poster, HLS) go with their original
+                for i, _ in deleted:
+                    await loop.run_in_executor(self._executor, self.storage.delete_assets, i)
+            after = self.state["rows_after"] = hi
+            self._save_checkpoint()
+        self.state["rows_done"] = True
+        self._save_checkpoint()
+        self.log(f"rows: scanned {self.stats.rows_scanned}, orphaned {self.stats.rows_orphaned}, deleted {self.stats.rows_deleted}")
+
+    # --- phase 2: files without a row ---
+    async def _known_ids(self) -> BloomFilter:
+        async with self.session_factory() as s:
+            total = await MediaRepo(s).count()
+        # headroom for uploads during the scan; they are younger than min_age anyway
+        known = BloomFilter(int(total * 1.1) + 1000, self.bloom_error_rate)
+        after = ""
+        while True:
+            async with self.session_factory() as s:
+                chunk = await MediaRepo(s).list_ids_after(after, self.batch_size * 10)
+            if not chunk:
+                return known
+            for i, _ in chunk:
+                known.add(i)
+            after = chunk[-1][0]
+
+    async def _collect_files(self) -> None:
+        known = await self._known_ids()
+        cutoff = self._cutoff_ts()
+        done = set(self.state.get("buckets_done", []))
+        loop = asyncio.get_running_loop()
+        for bucket in self.storage.buckets():
+            if bucket in done:
+                continue
+            entries = self.storage.scan(bucket)
+            while True:
+                # directory reads block; keep them off the event loop driving the deletes
+                chunk = await loop.run_in_executor(self._executor, _take, entries, self.batch_size)
+                if not chunk:
+                    break
+                self.stats.files_scanned += len(chunk)
+                candidates = {uid: path for uid, path, mtime in chunk
+                              if UID_PATTERN.match(uid) and uid not in known and mtime < cutoff}
+                if not candidates:
+                    continue
+                async with self.session_factory() as s:
+                    rows = await MediaRepo(s).existing(list(candidates))
+                orphans = [path for uid, path in candidates.items() if uid not in rows]
+                self.stats.files_orphaned += len(orphans)
+                if orphans and not self.dry_run:
+                    self.stats.files_deleted += await self._delete_files(orphans)
+            done.add(bucket)
+            self.state["buckets_done"] = sorted(done)
+            self._save_checkpoint()
+        self.log(f"files: scanned {self.stats.files_scanned}, orphaned {self.stats.files_orphaned}, deleted {self.stats.files_deleted}")
+
+    def _cutoff_ts(self) -> float:
+        # started_at is naive UTC (like media.created_at); file mtimes are epoch seconds
+        return (self.started_at - self.min_age - datetime(1970, 1, 1)).total_seconds()
+
+
+def _take(it, n: int) -> list:
+    out = []
+    for item in it:
+        out.append(item)
+        if len(out) >= n:
+            break
+    return out
@@ -0,0 +1,205 @@
+"""Offline community recommender for `GET /communities/joinable`.
+
+Scores every (user, community) pair from four signals, all as sparse matrices:
+- skills: cosine between the user's profile skills and the skills of the community's posts/events;
+- tags: cosine between the user's profile interests and the community + company tags;
+- co-membership: communities joined together with the user's communities (item-item cosine);
+- popularity: members per community, a small prior that only orders candidates.
+
+Users are scored in blocks sized to keep the dense block below `max_block_cells` floats, the
+top `top_k` per user replace the stored rows block by block. Users without any signal get
+no rows and are served the popularity ranking (cold start). Needs numpy and scipy.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+from app.infrastructure.repos.recommendation_repo import RecommendationRepo
+
+SKILL_WEIGHT = 0.45
+TAG_WEIGHT = 0.25
+CO_MEMBERSHIP_WEIGHT = 0.25
+POPULARITY_WEIGHT = 0.05
+# keeps per-block statements below the bind-parameter limits (asyncpg/SQLite: 32767)
+MAX_BLOCK_USERS = 5_000
+
+
+class _Index(dict):
+    """Stable id -> row/column number."""
+
+    def add(self, key: str) -> int:
+        i = self.get(key)
+        if i is None:
+            i = self[key] = len(self)
+        return i
+
+    def keys_list(self) -> list[str]:
+        out = [""] * len(self)
+        for k, i in self.items():
+            out[i] = k
+        return out
+
+
+class _Pairs:
+    """COO triplets collected while streaming rows."""
+
+    def __init__(self):
+        self.rows: list[int] = []
+        self.cols: list[int] = []
+        self.vals: list[float] = []
+
+    def add(self, r: int, c: int, v: float = 1.0) -> None:
+        self.rows.append(r)
+        self.cols.append(c)
+        self.vals.append(v)
+
+    def csr(self, shape: tuple[int, int], binary: bool = True) -> sparse.csr_matrix:
+        m = sparse.csr_matrix(
+            (np.asarray(self.vals, dtype=np.float32), (np.asarray(self.rows, dtype=np.int64), np.asarray(self.cols, dtype=np.int64))),
+            shape=shape,
+        )
+        m.sum_duplicates()
+        if binary:
+            m.data[:] = 1.0
+        return m
+
+
+def _tags(*raw: str | None) -> set[str]:
+    return {t.strip().lower() for r in raw if r for t in r.split(",") if t.strip()}
+
+
+def _l2_rows(m: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(m).tocsr()
+
+
+def _scale_rows_to_unit_max(a: np.ndarray) -> np.ndarray:
+    peak = a.max(axis=1, keepdims=True)
+    peak[peak <= 0] = 1.0
+    return a / peak
+
+
+def top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per row: column indices and scores of the k best entries, best first (-inf entries included)."""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+    best = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-best, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(best, order, axis=1)
+
+
+@dataclass
+class BuildStats:
+    users: int = 0
+    communities: int = 0
+    recommended_users: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+
+async def build_recommendations(session_factory, top_k_per_user: int = 50, max_block_cells: int = 8_000_000) -> BuildStats:
+    t0 = time.perf_counter()
+    started = datetime.utcnow()
+    users, communities, skills, tags = _Index(), _Index(), _Index(), _Index()
+    member, user_skill, user_tag, comm_skill, comm_tag = _Pairs(), _Pairs(), _Pairs(), _Pairs(), _Pairs()
+
+    async with session_factory() as session:
+        repo = RecommendationRepo(session)
+        async for part in repo.communities():
+            for cid, c_tags, company_tags in part:
+                ci = communities.add(cid)
+                for t in _tags(c_tags, company_tags):
+                    comm_tag.add(ci, tags.add(t))
+        async for part in repo.community_skills():
+            for cid, sid, n in part:
+                ci = communities.get(cid)
+                if ci is not None:
+                    # diminishing returns: the 50th post about a skill adds little
+                    comm_skill.add(ci, skills.add(sid), float(np.log1p(n)))
+        async for part in repo.memberships():
+            for uid, cid in part:
+                ci = communities.get(cid)
+                if ci is not None:
+                    member.add(users.add(uid), ci)
+        async for part in repo.profile_skills():
+            for uid, sid in part:
+                si = skills.get(sid)
+                if si is not None:  # skills no community uses cannot match anything
+                    user_skill.add(users.add(uid), si)
+        async for part in repo.profile_interests():
+            for uid, interests in part:
+                matched = [tags[t] for t in _tags(interests) if t in tags]
+                if matched:
+                    ui = users.add(uid)
+                    for ti in matched:
+                        user_tag.add(ui, ti)
+
+    n_u, n_c = len(users), len(communities)
+    stats = BuildStats(users=n_u, communities=n_c)
+    m = member.csr((n_u, n_c))
+    members = np.asarray(m.sum(axis=0)).ravel()
+
+    async with session_factory() as session:
+        async with session.begin():
+            order = np.argsort(-members, kind="stable")
+            comm_ids = communities.keys_list()
+            await RecommendationRepo(session).replace_popularity([
+                dict(community_id=comm_ids[ci], members=int(members[ci]), rank=rank)
+                for rank, ci in enumerate(order, start=1)
+            ])
+    if n_u == 0 or n_c == 0:
+        stats.seconds = time.perf_counter() - t0
+        return stats
+
+    us = _l2_rows(user_skill.csr((n_u, len(skills))))
+    cs_t = _l2_rows(comm_skill.csr((n_c, len(skills)), binary=False)).T.tocsr()
+    ut = _l2_rows(user_tag.csr((n_u, len(tags))))
+    ct_t = _l2_rows(comm_tag.csr((n_c, len(tags)))).T.tocsr()
+    # item-item cosine over member columns; a community is not its own neighbour
+    col_norm = np.sqrt(members)
+    col_norm[col_norm == 0] = 1.0
+    mn = m.dot(sparse.diags(1.0 / col_norm)).tocsr()
+    co_sim = (mn.T @ mn).tocsr()
+    co_sim.setdiag(0)
+    co_sim.eliminate_zeros()
+    popularity = (np.log1p(members) / max(np.log1p(members.max()), 1.0)).astype(np.float32)
+
+    user_ids = users.keys_list()
+    comm_ids = communities.keys_list()
+    block = max(1, min(MAX_BLOCK_USERS, max_block_cells // n_c))
+    for start in range(0, n_u, block):
+        end = min(n_u, start + block)
+        signal = (
+            SKILL_WEIGHT * (us[start:end] @ cs_t).toarray()
+            + TAG_WEIGHT * (ut[start:end] @ ct_t).toarray()
+            + CO_MEMBERSHIP_WEIGHT * _scale_rows_to_unit_max((m[start:end] @ co_sim).toarray())
+        )
+        signal[m[start:end].toarray() > 0] = 0.0  # already joined
+        scores = np.where(signal > 0, signal + POPULARITY_WEIGHT * popularity, -np.inf)
+        idx, best = top_k(scores, top_k_per_user)
+        rows = []
+        for r in range(end - start):
+            for rank, (ci, score) in enumerate(zip(idx[r], best[r]), start=1):
+                if not np.isfinite(score):
+                    break
+                rows.append(dict(user_id=user_ids[start + r], rank=rank, community_id=comm_ids[ci],
+                                 score=float(score), computed_at=started))
+        async with session_factory() as session:
+            async with session.begin():
+                await RecommendationRepo(session).replace_for_users(user_ids[start:end], rows)
+        stats.rows += len(rows)
+        stats.recommended_users += len({row["user_id"] for row in rows})
+
+    async with session_factory() as session:
+        async with session.begin():
+            await RecommendationRepo(session).delete_computed_before(started)
+    stats.seconds = time.perf_counter() - t0
+    return stats
@@ -1,19 +1,25 @@
 from typing import Optional
 
+from app.adapters.cache import TTLCache
+from app.core.config import settings
 from app.domain.entities import Sphere, Skill, Status
 from app.infrastructure.repos.reference_repo import ReferenceRepo
 
+# reference data only changes through seed scripts; shared read-only between requests
+reference_cache = TTLCache("reference", ttl=settings.REFERENCE_CACHE_TTL)
+
 
 class ReferenceUseCase:
     def __init__(self, refs: ReferenceRepo):
         self.refs = refs
 
     async def list_spheres(self) -> list[Sphere]:
-        return list(await self.refs.list_spheres())
+        return list(await reference_cache.get_or_load("spheres", self.refs.list_spheres))
 
     async def list_skills(self, *, sphere_id: Optional[str] = None) -> list[Skill]:
-        return list(await self.refs.list_skills(sphere_id=sphere_id))
+        return list(await reference_cache.get_or_load(
+            ("skills", sphere_id), lambda: self.refs.list_skills(sphere_id=sphere_id)
+        ))
 
     async def list_statuses(self) -> list[Status]:
-        return list(await self.refs.list_statuses())
-
+        return list(await reference_cache.get_or_load("statuses", self.refs.list_statuses))
@@ -0,0 +1,54 @@
+"""Reminders for joined events.
+
+Precomputed when a user joins: one `event_reminders` row per EVENT_REMINDER_OFFSETS_MINUTES
+offset, with its `fire_at`. Unjoining deletes the user's rows; moving an event rewrites the
+event's rows. The `reminders.dispatch` job (queued once per cluster, see main.py) reads only
+due rows through the `fire_at` index and hands them to the notifier in batches, so its cost
+follows the number of due reminders, not events x participants.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.infrastructure.repos.reminder_repo import ReminderRepo
+from app.infrastructure.services.notifier import INotifier
+
+REMINDER_DISPATCH_JOB = "reminders.dispatch"
+
+
+def reminder_offsets() -> list[int]:
+    return sorted({int(m) for m in settings.EVENT_REMINDER_OFFSETS_MINUTES.split(",") if m.strip()}, reverse=True)
+
+
+def reminder_times(event_date: datetime | None, now: datetime | None = None) -> list[tuple[int, datetime]]:
+    """(offset minutes, fire_at) of the reminders still ahead for an event at `event_date`."""
+    if event_date is None:
+        return []
+    if event_date.tzinfo is not None:
+        # stored and compared as naive UTC
+        event_date = event_date.astimezone(timezone.utc).replace(tzinfo=None)
+    now = now or datetime.utcnow()
+    times = [(m, event_date - timedelta(minutes=m)) for m in reminder_offsets()]
+    return [(m, fire_at) for m, fire_at in times if fire_at > now]
+
+
+async def dispatch_reminders(session_factory, notifier: INotifier, batch_size: int | None = None) -> int:
+    """Deliver every due reminder, one transaction per batch; returns the number sent.
+
+    A batch is deleted only after the notifier accepted it: a failure rolls it back for the next run."""
+    batch_size = batch_size or settings.EVENT_REMINDER_BATCH_SIZE
+    now = datetime.utcnow()
+    sent = 0
+    while True:
+        async with session_factory() as session:
+            async with session.begin():
+                repo = ReminderRepo(session)
+                batch = await repo.due(now, batch_size)
+                # the event has started already (dispatch was down): too late to remind, just drop
+                live = [r for r in batch if r.event_date is None or r.event_date > now]
+                if live:
+                    await notifier.send_reminders(live)
+                await repo.delete(batch)
+        sent += len(live)
+        if len(batch) < batch_size:
+            return sent
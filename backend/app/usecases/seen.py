@@ -0,0 +1,21 @@
+from app.core.config import settings
+from app.domain.repositories import ISeenRepo
+
+
+class SeenUseCase:
+    def __init__(self, seen: ISeenRepo):
+        self.seen = seen
+
+    async def record_impressions(self, user_id: str, content_ids: list[str]) -> int:
+        if len(content_ids) > settings.FEED_SEEN_BATCH_MAX:
+            raise ValueError(f"Too many items: {len(content_ids)} > {settings.FEED_SEEN_BATCH_MAX}")
+        if not content_ids:
+            return 0
+        return await self.seen.record(user_id, content_ids, settings.FEED_SEEN_MAX_BITS)
+
+    async def mark_community_read(self, user_id: str, community_id: str) -> None:
+        if not await self.seen.mark_all_read(user_id, community_id):
+            raise ValueError("Community not found")
+
+    async def unread_counts(self, user_id: str) -> list[tuple[str, int]]:
+        return await self.seen.unread_counts(user_id)
@@ -0,0 +1,91 @@
+"""Delta sync for mobile clients (`GET /sync?since=<token>`).
+
+The token is the change version the client has seen (app/infrastructure/repos/sync_version.py).
+A response holds the rows of every synced type changed after it plus the ids deleted since
+(tombstones, and archived communities, which the catalog lists no longer show), and the token
+to send next time. Large deltas come in pages of at most SYNC_PAGE_SIZE changes (`has_more`).
+An empty token, or one older than the purged tombstones, gets everything with `reset`: the
+client replaces its copy instead of merging.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.domain.repositories import ISyncRepo
+from app.infrastructure.repos.sync_repo import SyncRepo
+
+SYNC_PURGE_JOB = "sync.purge"
+
+CATALOG = ("community", "company", "sphere", "skill", "status")
+PER_USER = ("follow", "company_follow")
+
+
+@dataclass
+class SyncDelta:
+    token: int
+    reset: bool
+    has_more: bool
+    # entity -> changed objects (follows: followed ids)
+    upserted: dict[str, list] = field(default_factory=dict)
+    # entity -> removed ids
+    deleted: dict[str, list[str]] = field(default_factory=dict)
+
+
+class SyncUseCase:
+    def __init__(self, repo: ISyncRepo):
+        self.repo = repo
+
+    async def changes(self, since: int, user_id: str | None = None, limit: int | None = None) -> SyncDelta:
+        limit = limit or settings.SYNC_PAGE_SIZE
+        # read first: everything at or below it is committed (the clock row orders commits)
+        upto, purged = await self.repo.clock()
+        reset = since <= 0 or since < purged or since > upto
+        if reset:
+            since = 0
+        entities = CATALOG + (PER_USER if user_id else ())
+        rows = {e: await self.repo.changed(e, since, upto, limit, user_id=user_id) for e in entities}
+        # a fresh copy has nothing to delete
+        tombstones = await self.repo.tombstones(since, upto, user_id, limit) if since else []
+
+        # page end: no type may be cut short below it, and at most `limit` changes in all
+        token = upto
+        for found in [*rows.values(), [(t.version, t) for t in tombstones]]:
+            if len(found) == limit:
+                token = min(token, found[-1][0])
+        versions = sorted([v for found in rows.values() for v, _ in found] + [t.version for t in tombstones])
+        if len(versions) > limit:
+            token = min(token, versions[limit - 1])
+
+        delta = SyncDelta(token=token, reset=reset, has_more=token < upto)
+        for entity in entities:
+            upserted, deleted = [], []
+            for version, obj in rows[entity]:
+                if version > token:
+                    break
+                if entity == "community" and obj.is_archived:
+                    if since:
+                        deleted.append(obj.id)
+                else:
+                    upserted.append(obj)
+            if entity in PER_USER:
+                # duplicate follow rows collapse to one id
+                upserted = list(dict.fromkeys(upserted))
+            delta.upserted[entity] = upserted
+            delta.deleted[entity] = deleted
+        for t in tombstones:
+            if t.version <= token and t.entity in delta.deleted:
+                delta.deleted[t.entity].append(t.entity_id)
+        for entity in entities:
+            # deleted, then written again (re-follow) within the delta: present
+            alive = set(delta.upserted[entity]) if entity in PER_USER else {o.id for o in delta.upserted[entity]}
+            delta.deleted[entity] = list(dict.fromkeys(i for i in delta.deleted[entity] if i not in alive))
+        return delta
+
+
+async def purge_tombstones(session_factory) -> int:
+    """Forget deletes older than SYNC_TOMBSTONE_RETENTION_DAYS; clients offline longer resync fully."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    async with session_factory() as session:
+        async with session.begin():
+            return await SyncRepo(session).purge_tombstones(cutoff)
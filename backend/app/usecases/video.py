@@ -0,0 +1,110 @@
+"""Background video pipeline: poster frame, duration and HLS renditions for uploaded videos.
+
+`/media/upload` records a `video_jobs` state row for every video and queues a `video.transcode`
+job (app/usecases/jobs.py) in the same transaction (VIDEO_PIPELINE_ENABLED). Workers with
+ffmpeg/ffprobe on PATH run up to VIDEO_WORKERS of these jobs in a process pool; results are
+written next to the original through the storage and published on the media row
+(`poster_url`, `stream_url`, `duration`). A failed job is retried up to VIDEO_JOB_MAX_ATTEMPTS
+times. Without ffmpeg nothing runs: videos stay progressive files and their jobs wait for a
+worker that has it.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from app.core.config import settings
+from app.domain.entities import Job
+from app.infrastructure.repos.media_repo import MediaRepo
+from app.infrastructure.repos.video_job_repo import VideoJobRepo
+from app.infrastructure.services import video
+from app.infrastructure.services.storage import IStorage
+from app.usecases.jobs import enqueue
+
+VIDEO_JOB = "video.transcode"
+
+
+async def enqueue_video(session, media_id: str, *, state: bool = True) -> None:
+    """Transcode job (and, unless it exists, the state row) for a video, in the caller's transaction."""
+    if state:
+        await VideoJobRepo(session).enqueue(media_id)
+    await enqueue(
+        session, VIDEO_JOB, {"media_id": media_id}, key=f"video:{media_id}",
+        max_attempts=settings.VIDEO_JOB_MAX_ATTEMPTS,
+    )
+
+
+class VideoPipeline:
+    def __init__(self, session_factory, storage: IStorage, workers: int | None = None):
+        self.session_factory = session_factory
+        self.storage = storage
+        self.workers = settings.VIDEO_WORKERS if workers is None else workers
+        self.renditions = video.parse_renditions(settings.VIDEO_RENDITIONS)
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def available(self) -> bool:
+        return (
+            settings.VIDEO_PIPELINE_ENABLED
+            and self.workers > 0
+            and video.tools_available(settings.FFMPEG_BIN, settings.FFPROBE_BIN)
+        )
+
+    @property
+    def timeout(self) -> float:
+        """Limit of one whole transcode: VIDEO_JOB_TIMEOUT_SECONDS bounds each ffmpeg/ffprobe run,
+        and a job makes one per rendition plus the probe and the poster."""
+        return settings.VIDEO_JOB_TIMEOUT_SECONDS * (len(self.renditions) + 2)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: children must not inherit the event loop, DB connections and threads
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def process(self, job: Job) -> None:
+        """`video.transcode` handler; raises on failure so the queue retries."""
+        media_id = job.payload["media_id"]
+        async with self.session_factory() as s:
+            async with s.begin():
+                media = await MediaRepo(s).get(media_id)
+                if media is None:
+                    # deleted (media GC) since the upload
+                    return
+                await VideoJobRepo(s).start(media_id)
+        src = self.storage.path_for(media_id, media.ext)
+        loop = asyncio.get_running_loop()
+        try:
+            # the pool process only imports app.infrastructure.services.video
+            result = await asyncio.wait_for(loop.run_in_executor(self._executor(), partial(
+                video.transcode,
+                src,
+                self.storage.asset_dir(media_id),
+                ffmpeg=settings.FFMPEG_BIN,
+                ffprobe=settings.FFPROBE_BIN,
+                renditions=self.renditions,
+                segment_seconds=settings.VIDEO_SEGMENT_SECONDS,
+                timeout=settings.VIDEO_JOB_TIMEOUT_SECONDS,
+            )), self.timeout)
+        except Exception as e:
+            async with self.session_factory() as s:
+                async with s.begin():
+                    await VideoJobRepo(s).fail(
+                        media_id, str(e) or type(e).__name__, retry=job.attempts < job.max_attempts
+                    )
+            raise
+        async with self.session_factory() as s:
+            async with s.begin():
+                await MediaRepo(s).set_video_assets(
+                    media_id,
+                    poster_url=self.storage.asset_url(media_id, result["poster"]),
+                    stream_url=self.storage.asset_url(media_id, result["stream"]),
+                    duration=result["duration"],
+                )
+                await VideoJobRepo(s).complete(media_id)